@@ -30,6 +30,15 @@ of only vertices.
 
     Mesh
 
+The compact mesh is an array-based, read-only half-edge representation of a mesh.
+Vertex coordinates and connectivity are stored in contiguous integer and float arrays.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    CompactMesh
+
 
 Network
 =======
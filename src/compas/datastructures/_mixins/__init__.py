@@ -1,6 +1,7 @@
 """"""
 
 from .attributes import *
+from .columns import *
 from .descriptors import *
 from .filters import *
 from .fromto import *
@@ -10,6 +11,7 @@ from .magic import *
 from .mappings import *
 
 from .attributes import __all__ as a
+from .columns import __all__ as i
 from .descriptors import __all__ as b
 from .filters import __all__ as h
 from .fromto import __all__ as c
@@ -18,4 +20,4 @@ from .helpers import __all__ as e
 from .magic import __all__ as f
 from .mappings import __all__ as g
 
-__all__ = a + b + c + d + e + f + g + h
+__all__ = a + b + c + d + e + f + g + h + i
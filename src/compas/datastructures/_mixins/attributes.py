@@ -1,5 +1,8 @@
 from copy import deepcopy
 
+from compas.datastructures._mixins.columns import ColumnDict
+from compas.datastructures._mixins.columns import NestedColumnDict
+
 
 __author__    = ['Tom Van Mele', ]
 __copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
@@ -14,6 +17,17 @@ __all__ = [
 ]
 
 
+def _keys(keys):
+    # a list of keys, or None for all keys
+    # keys can be any iterable, including an array
+    # an empty sequence stands for all keys as well
+    if keys is None:
+        return None
+    if hasattr(keys, 'tolist'):
+        keys = keys.tolist()
+    return list(keys) or None
+
+
 class VertexAttributesManagement(object):
 
     def update_default_vertex_attributes(self, attr_dict=None, **kwattr):
@@ -62,6 +76,7 @@ class VertexAttributesManagement(object):
 
         """
         self.vertex[key][name] = value
+        self._vertex_attributes_changed([key], [name])
 
     def set_vertex_attributes(self, key, attr_dict=None, **kwattr):
         """Set multiple attributes of one vertex.
@@ -92,6 +107,7 @@ class VertexAttributesManagement(object):
             attr_dict = {}
         attr_dict.update(kwattr)
         self.vertex[key].update(attr_dict)
+        self._vertex_attributes_changed([key], attr_dict)
 
     def set_vertices_attribute(self, name, value, keys=None):
         """Set one attribute of multiple vertices.
@@ -113,9 +129,10 @@ class VertexAttributesManagement(object):
         * :meth:`set_vertices_attributes`
 
         """
-        keys = keys or self.vertices()
+        keys = keys or list(self.vertices())
         for key in keys:
             self.vertex[key][name] = value
+        self._vertex_attributes_changed(keys, [name])
 
     def set_vertices_attributes(self, keys=None, attr_dict=None, **kwattr):
         """Set multiple attributes of multiple vertices.
@@ -146,12 +163,14 @@ class VertexAttributesManagement(object):
         if not attr_dict:
             attr_dict = {}
         attr_dict.update(kwattr)
+        keys = _keys(keys)
         if not keys:
             for key, attr in self.vertices(True):
                 attr.update(attr_dict)
         else:
             for key in keys:
                 self.vertex[key].update(attr_dict)
+        self._vertex_attributes_changed(keys, attr_dict)
 
     def get_vertex_attribute(self, key, name, value=None):
         """Get the value of a named attribute of one vertex.
@@ -275,6 +294,97 @@ class VertexAttributesManagement(object):
             return [[attr.get(name, value) for name, value in temp] for key, attr in self.vertices(True)]
         return [[self.vertex[key].get(name, value) for name, value in temp] for key in keys]
 
+    # --------------------------------------------------------------------------
+    # columns
+    # --------------------------------------------------------------------------
+
+    def use_vertex_columns(self):
+        """Store the vertex attributes in typed columns, instead of one dict per vertex.
+
+        Notes
+        -----
+        Every vertex attribute is stored in a NumPy array with one row per vertex.
+        The attribute dicts of the vertices are replaced by views of the rows of the
+        columns, such that all per-key methods keep working as before.
+        The bulk accessors (:meth:`get_vertices_attributes_numpy` and
+        :meth:`set_vertices_attributes_numpy`) then read and write the columns directly.
+
+        Examples
+        --------
+        >>> mesh.use_vertex_columns()
+        >>> xyz = mesh.get_vertices_attributes_numpy('xyz')
+
+        """
+        if not isinstance(self.vertex, ColumnDict):
+            self.vertex = ColumnDict(self.vertex)
+
+    def get_vertices_attributes_numpy(self, names, values=None, keys=None):
+        """Get the values of multiple named attributes of multiple vertices as an array.
+
+        Parameters
+        ----------
+        names : list
+            The names of the attributes.
+        values : list (None)
+            A list of default values.
+            Defaults to a list of ``None`` s.
+        keys : list (None)
+            A list of vertex identifiers.
+            Defaults to all vertices.
+
+        Returns
+        -------
+        array
+            An array with one row per vertex and one column per attribute.
+
+        See Also
+        --------
+        * :meth:`get_vertices_attributes`
+        * :meth:`use_vertex_columns`
+
+        """
+        if not values:
+            values = [None] * len(names)
+        keys = _keys(keys)
+        if isinstance(self.vertex, ColumnDict):
+            return self.vertex.columns.get_array(names, values, self.vertex.rows(keys))
+        from numpy import array
+        return array(self.get_vertices_attributes(names, values, keys)).reshape((-1, len(names)))
+
+    def set_vertices_attributes_numpy(self, names, values, keys=None):
+        """Set the values of multiple named attributes of multiple vertices from an array.
+
+        Parameters
+        ----------
+        names : list
+            The names of the attributes.
+        values : array
+            An array with one row per vertex and one column per attribute.
+        keys : list (None)
+            A list of vertex identifiers.
+            Defaults to all vertices.
+
+        See Also
+        --------
+        * :meth:`set_vertices_attributes`
+        * :meth:`use_vertex_columns`
+
+        """
+        from numpy import asarray
+        values = asarray(values).reshape((-1, len(names)))
+        keys = _keys(keys)
+        if isinstance(self.vertex, ColumnDict):
+            self.vertex.columns.set_array(names, values, self.vertex.rows(keys))
+        else:
+            for key, row in zip(keys or list(self.vertices()), values.tolist()):
+                self.vertex[key].update(zip(names, row))
+        self._vertex_attributes_changed(keys, names)
+
+    def _vertex_attributes_changed(self, keys, names):
+        # hook for data structures that track changes of vertex attributes
+        # keys is None if the attributes of all vertices were set
+        pass
+
 
 class EdgeAttributesManagement(object):
 
@@ -333,7 +443,8 @@ class EdgeAttributesManagement(object):
                 self.edge[v][u][name] = value
             else:
                 if v in self.halfedge[u] or u in self.halfedge[v]:
-                    self.edge[u] = {}
+                    if u not in self.edge:
+                        self.edge[u] = {}
                     self.edge[u][v] = self.default_edge_attributes.copy()
                     self.edge[u][v][name] = value
 
@@ -563,6 +674,90 @@ class EdgeAttributesManagement(object):
             return [[attr.get(name, value) for name, value in temp] for u, v, attr in self.edges(True)]
         return [[self.edge[u][v].get(name, value) for name, value in temp] for u, v in keys]
 
+    # --------------------------------------------------------------------------
+    # columns
+    # --------------------------------------------------------------------------
+
+    def use_edge_columns(self):
+        """Store the edge attributes in typed columns, instead of one dict per edge.
+
+        Notes
+        -----
+        Every edge attribute is stored in a NumPy array with one row per edge.
+        The attribute dicts of the edges are replaced by views of the rows of the
+        columns, such that all per-key methods keep working as before.
+        The bulk accessors (:meth:`get_edges_attributes_numpy` and
+        :meth:`set_edges_attributes_numpy`) then read and write the columns directly.
+
+        """
+        if not isinstance(self.edge, NestedColumnDict):
+            self.edge = NestedColumnDict(self.edge)
+
+    def get_edges_attributes_numpy(self, names, values=None, keys=None):
+        """Get the values of multiple named attributes of multiple edges as an array.
+
+        Parameters
+        ----------
+        names : list
+            The names of the attributes.
+        values : list (None)
+            A list of default values.
+            Defaults to a list of ``None`` s.
+        keys : iterable (None)
+            A list of edge identifiers.
+            Each edge identifier is a pair of vertex identifiers.
+            Defaults to all edges.
+
+        Returns
+        -------
+        array
+            An array with one row per edge and one column per attribute.
+
+        See Also
+        --------
+        * :meth:`get_edges_attributes`
+        * :meth:`use_edge_columns`
+
+        """
+        if not values:
+            values = [None] * len(names)
+        keys = _keys(keys)
+        if isinstance(self.edge, NestedColumnDict):
+            return self.edge.columns.get_array(names, values, self.edge.rows(keys))
+        from numpy import array
+        return array(self.get_edges_attributes(names, values, keys)).reshape((-1, len(names)))
+
+    def set_edges_attributes_numpy(self, names, values, keys=None):
+        """Set the values of multiple named attributes of multiple edges from an array.
+
+        Parameters
+        ----------
+        names : list
+            The names of the attributes.
+        values : array
+            An array with one row per edge and one column per attribute.
+        keys : iterable (None)
+            A list of edge identifiers.
+            Each edge identifier is a pair of vertex identifiers.
+            Defaults to all edges.
+
+        See Also
+        --------
+        * :meth:`set_edges_attributes`
+        * :meth:`use_edge_columns`
+
+        """
+        from numpy import asarray
+        values = asarray(values).reshape((-1, len(names)))
+        if isinstance(self.edge, NestedColumnDict):
+            self.edge.columns.set_array(names, values, self.edge.rows(_keys(keys)))
+            return
+        keys = _keys(keys) or list(self.edges())
+        for (u, v), row in zip(keys, values.tolist()):
+            if v not in self.edge[u]:
+                u, v = v, u
+            self.edge[u][v].update(zip(names, row))
+
 
 class FaceAttributesManagement(object):
 
@@ -851,6 +1046,92 @@ class FaceAttributesManagement(object):
             return [[value for name, value in temp] for fkey in fkeys]
         return [[self.get_face_attribute(fkey, name, value) for name, value in temp] for fkey in fkeys]
 
+    # --------------------------------------------------------------------------
+    # columns
+    # --------------------------------------------------------------------------
+
+    def use_face_columns(self):
+        """Store the face attributes in typed columns, instead of one dict per face.
+
+        Notes
+        -----
+        Every face attribute is stored in a NumPy array with one row per face.
+        The attribute dicts of the faces are replaced by views of the rows of the
+        columns, such that all per-key methods keep working as before.
+        The bulk accessors (:meth:`get_faces_attributes_numpy` and
+        :meth:`set_faces_attributes_numpy`) then read and write the columns directly.
+
+        """
+        if not isinstance(self.facedata, ColumnDict):
+            self.facedata = ColumnDict(self.facedata)
+
+    def get_faces_attributes_numpy(self, names, values=None, fkeys=None):
+        """Get the values of multiple named attributes of multiple faces as an array.
+
+        Parameters
+        ----------
+        names : list
+            The names of the attributes.
+        values : list (None)
+            A list of default values.
+            Defaults to a list of ``None`` s.
+        fkeys : list (None)
+            A list of face identifiers.
+            Defaults to all faces.
+
+        Returns
+        -------
+        array
+            An array with one row per face and one column per attribute.
+
+        See Also
+        --------
+        * :meth:`get_faces_attributes`
+        * :meth:`use_face_columns`
+
+        """
+        if not values:
+            values = [None] * len(names)
+        fkeys = _keys(fkeys)
+        if isinstance(self.facedata, ColumnDict):
+            fkeys = fkeys or [fkey for fkey, attr in self.faces(True)]
+            return self.facedata.columns.get_array(names, values, self.facedata.rows(fkeys))
+        from numpy import array
+        return array(self.get_faces_attributes(names, values, fkeys)).reshape((-1, len(names)))
+
+    def set_faces_attributes_numpy(self, names, values, fkeys=None):
+        """Set the values of multiple named attributes of multiple faces from an array.
+
+        Parameters
+        ----------
+        names : list
+            The names of the attributes.
+        values : array
+            An array with one row per face and one column per attribute.
+        fkeys : list (None)
+            A list of face identifiers.
+            Defaults to all faces.
+
+        See Also
+        --------
+        * :meth:`set_faces_attributes`
+        * :meth:`use_face_columns`
+
+        """
+        from numpy import asarray
+        values = asarray(values).reshape((-1, len(names)))
+        fkeys = _keys(fkeys) or [fkey for fkey, attr in self.faces(True)]
+        if isinstance(self.facedata, ColumnDict):
+            for fkey in fkeys:
+                if fkey not in self.facedata:
+                    self.facedata[fkey] = self.default_face_attributes.copy()
+            self.facedata.columns.set_array(names, values, self.facedata.rows(fkeys))
+            return
+        for fkey, row in zip(fkeys, values.tolist()):
+            if fkey not in self.facedata:
+                self.facedata[fkey] = self.default_face_attributes.copy()
+            self.facedata[fkey].update(zip(names, row))
+
 
 # ==============================================================================
 # Main
@@ -0,0 +1,710 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+
+__author__    = ['Tom Van Mele', ]
+__copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
+__license__   = 'MIT License'
+__email__     = 'vanmelet@ethz.ch'
+
+
+__all__ = [
+    'AttributeColumns',
+    'AttributeView',
+    'ColumnDict',
+    'NestedColumnDict',
+]
+
+
+def _kind(value):
+    """Classify a value as bool (``'b'``), int (``'i'``), float (``'f'``) or object (``'O'``)."""
+    if isinstance(value, bool):
+        return 'b'
+    try:
+        kind = value.dtype.kind
+    except AttributeError:
+        if isinstance(value, int):
+            return 'i'
+        if isinstance(value, float):
+            return 'f'
+        try:
+            if isinstance(value, long):
+                return 'i'
+        except NameError:
+            pass
+        return 'O'
+    if kind in 'iu':
+        return 'i'
+    if kind in 'bf':
+        return kind
+    return 'O'
+
+
+def _promote(a, b):
+    """The kind of a column that can hold values of both kinds."""
+    if a == b:
+        return a
+    if set((a, b)) == set(('i', 'f')):
+        return 'f'
+    return 'O'
+
+
+DTYPES = {'b': 'bool', 'i': 'int64', 'f': 'float64', 'O': 'object'}
+
+
+class AttributeColumns(object):
+    """Typed storage of the attributes of a set of elements.
+
+    Every attribute is stored in a NumPy array with one row per element.
+    The type of the array is derived from the first value assigned to the
+    attribute, and promoted if values of a different type are assigned later.
+    Booleans, integers and floats are stored in typed arrays;
+    any other value is stored in an array of objects.
+
+    Attributes
+    ----------
+    index : dict
+        A mapping of element identifiers to rows.
+    keys : list
+        The identifier of the element of every row, or ``None`` for deleted rows.
+    columns : dict
+        The array of values per attribute name.
+    present : dict
+        Per attribute name, a boolean array indicating which rows have a value.
+    version : int
+        Incremented whenever rows are added, removed or moved.
+
+    Notes
+    -----
+    Rows are allocated in the order in which elements are added.
+    Rows of deleted elements are reclaimed by compacting the storage,
+    which preserves the relative order of the remaining rows.
+
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.keys = []
+        self.columns = {}
+        self.present = {}
+        self.version = 0
+        self._alive = None
+        self._capacity = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    @classmethod
+    def from_arrays(cls, keys, columns, present=None):
+        """Construct a column storage from existing arrays.
+
+        Parameters
+        ----------
+        keys : sequence
+            The identifiers of the elements, one per row.
+        columns : dict
+            The array of values per attribute name.
+            The arrays are used as-is, without copying.
+        present : dict, optional
+            Per attribute name, a boolean array indicating which rows have a value.
+            Attributes without an entry have a value in every row.
+
+        Returns
+        -------
+        AttributeColumns
+            The column storage.
+
+        """
+        from numpy import ones
+
+        present = present or {}
+        store = cls()
+        store.keys = list(keys)
+        store.index = {key: row for row, key in enumerate(store.keys)}
+        store._capacity = len(store.keys)
+        store._alive = ones(store._capacity, dtype=bool)
+        for name, values in columns.items():
+            store.columns[name] = values
+            if name in present:
+                store.present[name] = present[name]
+            else:
+                store.present[name] = ones(store._capacity, dtype=bool)
+        return store
+
+    # --------------------------------------------------------------------------
+    # rows
+    # --------------------------------------------------------------------------
+
+    def _grow(self, capacity):
+        from numpy import zeros
+        from numpy import concatenate
+
+        n = capacity - self._capacity
+        if self._alive is None:
+            self._alive = zeros(0, dtype=bool)
+        self._alive = concatenate((self._alive, zeros(n, dtype=bool)))
+        for name, values in self.columns.items():
+            self.columns[name] = concatenate((values, zeros(n, dtype=values.dtype)))
+            self.present[name] = concatenate((self.present[name], zeros(n, dtype=bool)))
+        self._capacity = capacity
+
+    def add(self, key):
+        """Allocate a row for an element, if it does not have one yet.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the element.
+
+        Returns
+        -------
+        int
+            The row of the element.
+
+        """
+        if key in self.index:
+            return self.index[key]
+        row = len(self.keys)
+        if row == self._capacity:
+            self._grow(max(16, 2 * self._capacity))
+        self.keys.append(key)
+        self.index[key] = row
+        self._alive[row] = True
+        self.version += 1
+        return row
+
+    def remove(self, key):
+        """Release the row of an element.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the element.
+
+        """
+        row = self.index.pop(key)
+        self.keys[row] = None
+        self._alive[row] = False
+        self.clear_row(row)
+        self.version += 1
+        if len(self.keys) > 32 and len(self.keys) > 2 * len(self.index):
+            self.compact()
+
+    def clear_row(self, row):
+        """Remove all attribute values from a row."""
+        for name, present in self.present.items():
+            if present[row]:
+                present[row] = False
+                if self.columns[name].dtype.kind == 'O':
+                    self.columns[name][row] = None
+
+    def compact(self):
+        """Remove the rows of deleted elements."""
+        from numpy import flatnonzero
+
+        rows = flatnonzero(self._alive[:len(self.keys)])
+        self.keys = [self.keys[row] for row in rows]
+        self.index = {key: row for row, key in enumerate(self.keys)}
+        n = len(rows)
+        for name in self.columns:
+            self.columns[name][:n] = self.columns[name][rows]
+            self.present[name][:n] = self.present[name][rows]
+            self.present[name][n:] = False
+            if self.columns[name].dtype.kind == 'O':
+                self.columns[name][n:] = None
+        self._alive[:n] = True
+        self._alive[n:] = False
+        self.version += 1
+
+    def rows(self, keys=None):
+        """The rows of a sequence of elements.
+
+        Parameters
+        ----------
+        keys : sequence, optional
+            The element identifiers.
+            Defaults to all elements, in the order in which they were added.
+
+        Returns
+        -------
+        array
+            The row indices.
+
+        """
+        from numpy import array
+        from numpy import flatnonzero
+
+        if keys is None:
+            if self._alive is None:
+                return array([], dtype=int)
+            return flatnonzero(self._alive[:len(self.keys)])
+        index = self.index
+        return array([index[key] for key in keys], dtype=int)
+
+    # --------------------------------------------------------------------------
+    # columns
+    # --------------------------------------------------------------------------
+
+    def _column(self, name, kind):
+        from numpy import zeros
+
+        values = self.columns.get(name)
+        if values is None:
+            values = zeros(self._capacity, dtype=DTYPES[kind])
+            if kind == 'O':
+                values[:] = None
+            self.columns[name] = values
+            self.present[name] = zeros(self._capacity, dtype=bool)
+            return values
+        current = values.dtype.kind
+        if current == 'u':
+            current = 'i'
+        target = _promote(current, kind)
+        if target != current:
+            values = values.astype(DTYPES[target])
+            self.columns[name] = values
+        return values
+
+    def get(self, row, name):
+        """Get the value of an attribute in a row.
+
+        Raises
+        ------
+        KeyError
+            If the row has no value for the attribute.
+
+        """
+        present = self.present.get(name)
+        if present is None or not present[row]:
+            raise KeyError(name)
+        value = self.columns[name][row]
+        if self.columns[name].dtype.kind == 'O':
+            return value
+        return value.item()
+
+    def set(self, row, name, value):
+        """Set the value of an attribute in a row."""
+        values = self._column(name, _kind(value))
+        values[row] = value
+        self.present[name][row] = True
+
+    def delete(self, row, name):
+        """Delete the value of an attribute from a row."""
+        present = self.present.get(name)
+        if present is None or not present[row]:
+            raise KeyError(name)
+        present[row] = False
+        if self.columns[name].dtype.kind == 'O':
+            self.columns[name][row] = None
+
+    def names(self, row):
+        """The names of the attributes with a value in a row."""
+        return [name for name, present in self.present.items() if present[row]]
+
+    def get_array(self, names, values, rows):
+        """Get the values of multiple attributes in multiple rows.
+
+        Parameters
+        ----------
+        names : sequence
+            The attribute names.
+        values : sequence
+            The default value per attribute, for rows without a value.
+        rows : array
+            The row indices.
+
+        Returns
+        -------
+        array
+            An array with one row per element and one column per attribute.
+
+        """
+        from numpy import column_stack
+        from numpy import empty
+
+        if not len(names):
+            return empty((len(rows), 0))
+        columns = []
+        for name, value in zip(names, values):
+            if name not in self.columns:
+                column = empty(len(rows), dtype=DTYPES[_kind(value)])
+                column[:] = value
+                columns.append(column)
+                continue
+            column = self.columns[name][rows]
+            present = self.present[name][rows]
+            if not present.all():
+                kind = _promote(column.dtype.kind.replace('u', 'i'), _kind(value))
+                column = column.astype(DTYPES[kind])
+                column[~present] = value
+            columns.append(column)
+        if len(columns) == 1:
+            return columns[0].reshape((-1, 1))
+        return column_stack(columns)
+
+    def set_array(self, names, values, rows):
+        """Set the values of multiple attributes in multiple rows.
+
+        Parameters
+        ----------
+        names : sequence
+            The attribute names.
+        values : array
+            An array with one row per element and one column per attribute.
+        rows : array
+            The row indices.
+
+        """
+        from numpy import asarray
+
+        values = asarray(values)
+        if values.ndim == 1:
+            values = values.reshape((-1, 1))
+        for j, name in enumerate(names):
+            column = values[:, j]
+            kind = column.dtype.kind
+            kind = 'i' if kind == 'u' else kind
+            kind = kind if kind in 'bif' else 'O'
+            target = self._column(name, kind)
+            target[rows] = column
+            self.present[name][rows] = True
+
+
+class AttributeView(MutableMapping):
+    """A dict-like view of the attributes of one element stored in columns.
+
+    Parameters
+    ----------
+    columns : AttributeColumns
+        The column storage.
+    key : hashable
+        The identifier of the element in the storage.
+
+    """
+
+    __slots__ = ('columns', 'key')
+
+    def __init__(self, columns, key):
+        self.columns = columns
+        self.key = key
+
+    def __getitem__(self, name):
+        return self.columns.get(self.columns.index[self.key], name)
+
+    def __setitem__(self, name, value):
+        self.columns.set(self.columns.index[self.key], name, value)
+
+    def __delitem__(self, name):
+        self.columns.delete(self.columns.index[self.key], name)
+
+    def __iter__(self):
+        return iter(self.columns.names(self.columns.index[self.key]))
+
+    def __len__(self):
+        return len(self.columns.names(self.columns.index[self.key]))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __reduce__(self):
+        return dict, (dict(self), )
+
+    def copy(self):
+        return dict(self)
+
+
+class ColumnDict(dict):
+    """A dict of attribute dicts, with the attributes stored in columns.
+
+    The values of the dict are views (:class:`AttributeView`) of the rows of a
+    column storage. Assigning a dict to a key copies its items into the storage.
+
+    Parameters
+    ----------
+    items : dict, optional
+        Initial items.
+
+    Examples
+    --------
+    >>> vertex = ColumnDict({0: {'x': 0.0, 'y': 1.0}})
+    >>> vertex[0]['x'] = 2.0
+    >>> vertex[0]['x']
+    2.0
+    >>> vertex.columns.columns['x'].dtype
+    dtype('float64')
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(ColumnDict, self).__init__()
+        self.columns = AttributeColumns()
+        self.update(*args, **kwargs)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Construct a dict with the elements of an existing column storage.
+
+        Parameters
+        ----------
+        columns : AttributeColumns
+            The column storage.
+
+        Returns
+        -------
+        ColumnDict
+            A dict with a view per element of the storage.
+
+        """
+        self = cls()
+        self.columns = columns
+        dict.update(self, ((key, AttributeView(columns, key)) for key in columns.keys if key is not None))
+        return self
+
+    def _rowkey(self, key):
+        return key
+
+    def __setitem__(self, key, attr):
+        rowkey = self._rowkey(key)
+        if isinstance(attr, AttributeView) and attr.columns is self.columns and attr.key == rowkey:
+            dict.__setitem__(self, key, attr)
+            return
+        attr = dict(attr)
+        columns = self.columns
+        if rowkey in columns.index:
+            row = columns.index[rowkey]
+            columns.clear_row(row)
+        else:
+            row = columns.add(rowkey)
+        for name, value in attr.items():
+            columns.set(row, name, value)
+        dict.__setitem__(self, key, AttributeView(columns, rowkey))
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.columns.remove(self._rowkey(key))
+
+    def __reduce__(self):
+        return self.__class__, (dict((key, dict(attr)) for key, attr in self.items()), )
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        attr = dict(self[key])
+        del self[key]
+        return attr
+
+    def popitem(self):
+        key, attr = dict.popitem(self)
+        attr = dict(attr)
+        self.columns.remove(self._rowkey(key))
+        return key, attr
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default if default is not None else {}
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, attr in dict(*args, **kwargs).items():
+            self[key] = attr
+
+    def clear(self):
+        for key in list(self):
+            del self[key]
+
+    def copy(self):
+        return self.__class__(self)
+
+    def rows(self, keys=None):
+        """The rows of the storage corresponding to a sequence of keys.
+
+        Parameters
+        ----------
+        keys : sequence, optional
+            The keys. Defaults to all keys, in the order of the dict.
+
+        Returns
+        -------
+        array
+            The row indices.
+
+        """
+        if keys is None:
+            return self.columns.rows()
+        return self.columns.rows([self._rowkey(key) for key in keys])
+
+
+class NestedColumnDict(dict):
+    """A dict of dicts of attribute dicts, with the attributes stored in columns.
+
+    This is the column-based equivalent of the edge dictionaries of the data
+    structures. The attributes of the item ``[u][v]`` are stored in a row of
+    the storage identified by ``(u, v)``.
+
+    Parameters
+    ----------
+    items : dict, optional
+        Initial items.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(NestedColumnDict, self).__init__()
+        self.columns = AttributeColumns()
+        self._rows = None
+        self.update(*args, **kwargs)
+
+    @classmethod
+    def from_columns(cls, columns, keys=None):
+        """Construct a nested dict with the elements of an existing column storage.
+
+        Parameters
+        ----------
+        columns : AttributeColumns
+            The column storage, with pairs of keys ``(u, v)`` as element identifiers.
+        keys : sequence, optional
+            Keys ``u`` that should be present, even if they have no items.
+
+        Returns
+        -------
+        NestedColumnDict
+            A nested dict with a view per element of the storage.
+
+        """
+        self = cls()
+        self.columns = columns
+        for u in keys or ():
+            dict.__setitem__(self, u, _InnerColumnDict(columns, u))
+        for rowkey in columns.keys:
+            if rowkey is None:
+                continue
+            u, v = rowkey
+            if u not in self:
+                dict.__setitem__(self, u, _InnerColumnDict(columns, u))
+            dict.__setitem__(dict.__getitem__(self, u), v, AttributeView(columns, rowkey))
+        return self
+
+    def __setitem__(self, u, nbrs):
+        if isinstance(nbrs, _InnerColumnDict) and nbrs.columns is self.columns and nbrs.u == u:
+            dict.__setitem__(self, u, nbrs)
+            return
+        nbrs = dict((v, dict(attr)) for v, attr in nbrs.items())
+        if u in self:
+            del self[u]
+        inner = _InnerColumnDict(self.columns, u)
+        for v, attr in nbrs.items():
+            inner[v] = attr
+        dict.__setitem__(self, u, inner)
+
+    def __delitem__(self, u):
+        dict.__getitem__(self, u).clear()
+        dict.__delitem__(self, u)
+
+    def __reduce__(self):
+        return self.__class__, (dict((u, dict((v, dict(attr)) for v, attr in nbrs.items())) for u, nbrs in self.items()), )
+
+    def pop(self, u, *default):
+        if u not in self:
+            if default:
+                return default[0]
+            raise KeyError(u)
+        nbrs = dict((v, dict(attr)) for v, attr in self[u].items())
+        del self[u]
+        return nbrs
+
+    def popitem(self):
+        u = next(iter(self))
+        return u, self.pop(u)
+
+    def setdefault(self, u, default=None):
+        if u not in self:
+            self[u] = default if default is not None else {}
+        return self[u]
+
+    def update(self, *args, **kwargs):
+        for u, nbrs in dict(*args, **kwargs).items():
+            self[u] = nbrs
+
+    def clear(self):
+        for u in list(self):
+            del self[u]
+
+    def copy(self):
+        return self.__class__(self)
+
+    def rows(self, keys=None):
+        """The rows of the storage corresponding to a sequence of pairs of keys.
+
+        Parameters
+        ----------
+        keys : sequence, optional
+            The pairs of keys.
+            Pairs that are stored in the opposite direction are accepted as well.
+            Defaults to all pairs, in the order of iteration over the nested dicts.
+
+        Returns
+        -------
+        array
+            The row indices.
+
+        """
+        from numpy import array
+
+        index = self.columns.index
+        if keys is None:
+            if self._rows is None or self._rows[0] != self.columns.version:
+                rows = array([index[u, v] for u in self for v in self[u]], dtype=int)
+                self._rows = self.columns.version, rows
+            return self._rows[1]
+        rows = []
+        for u, v in keys:
+            if (u, v) in index:
+                rows.append(index[u, v])
+            else:
+                rows.append(index[v, u])
+        return array(rows, dtype=int)
+
+
+class _InnerColumnDict(ColumnDict):
+
+    def __init__(self, columns, u):
+        dict.__init__(self)
+        self.columns = columns
+        self.u = u
+
+    def _rowkey(self, v):
+        return self.u, v
+
+    def __reduce__(self):
+        return dict, (dict((v, dict(attr)) for v, attr in self.items()), )
+
+    def copy(self):
+        return dict((v, dict(attr)) for v, attr in self.items())
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    vertex = ColumnDict()
+
+    for i in range(10):
+        vertex[i] = {'x': float(i), 'y': 0.0, 'z': 0.0, 'is_fixed': i % 2 == 0}
+
+    vertex[3]['x'] = 10
+    vertex[4]['name'] = 'four'
+
+    del vertex[5]
+
+    print(vertex)
+    print(vertex.columns.get_array('xyz', [None, None, None], vertex.rows()))
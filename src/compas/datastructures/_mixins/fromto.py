@@ -1,5 +1,24 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
 import json
 
+from ast import literal_eval
+from numbers import Integral
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from compas.datastructures._mixins.columns import DTYPES
+from compas.datastructures._mixins.columns import _kind
+from compas.datastructures._mixins.columns import _promote
+from compas.datastructures._mixins.columns import AttributeColumns
+from compas.datastructures._mixins.columns import ColumnDict
+from compas.datastructures._mixins.columns import NestedColumnDict
+
 
 __author__    = ['Tom Van Mele', ]
 __copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
@@ -9,7 +28,8 @@ __email__     = 'vanmelet@ethz.ch'
 
 __all__ = [
     'FromToData',
-    'FromToJson'
+    'FromToJson',
+    'FromToBinary',
 ]
 
 
@@ -121,6 +141,338 @@ class FromToJson(object):
                 json.dump(self.data, fp)
 
 
+# ==============================================================================
+# Binary
+# ==============================================================================
+
+
+_MISSING = object()
+
+
+def _flatten(table, depth):
+    """Flatten a nested dict into columns of keys and a list of leaf values."""
+    paths = [[] for _ in range(depth)]
+    leaves = []
+    if depth == 1:
+        paths[0].extend(table)
+        leaves.extend(table.values())
+        return paths, leaves
+    if depth == 2:
+        for u, nbrs in table.items():
+            paths[0].extend([u] * len(nbrs))
+            paths[1].extend(nbrs)
+            leaves.extend(nbrs.values())
+        return paths, leaves
+
+    def walk(items, level, prefix):
+        for key, value in items.items():
+            if level == depth - 1:
+                for column, k in zip(paths, prefix + (key, )):
+                    column.append(k)
+                leaves.append(value)
+            else:
+                walk(value, level + 1, prefix + (key, ))
+
+    walk(table, 0, ())
+    return paths, leaves
+
+
+def _is_int(cls):
+    return issubclass(cls, Integral) and not issubclass(cls, bool)
+
+
+def _encode_keys(keys, name, arrays):
+    from numpy import array
+    from numpy import iinfo
+
+    types = set(map(type, keys))
+    none = type(None) in types
+    types.discard(type(None))
+    if all(_is_int(cls) for cls in types):
+        try:
+            values = array([0 if key is None else key for key in keys] if none else keys, dtype='int64')
+        except OverflowError:
+            pass
+        else:
+            if len(values) and iinfo('int32').min <= values.min() and values.max() <= iinfo('int32').max:
+                values = values.astype('int32')
+            arrays[name] = values
+            if none:
+                arrays[name + '.none'] = array([key is None for key in keys], dtype=bool)
+                return {'encoding': 'int', 'none': True}
+            return {'encoding': 'int'}
+    return {'encoding': 'repr', 'values': [repr(key) for key in keys]}
+
+
+def _decode_keys(descriptor, name, arrays):
+    if descriptor['encoding'] == 'repr':
+        return [literal_eval(key) for key in descriptor['values']]
+    keys = arrays[name].tolist()
+    if descriptor.get('none'):
+        keys = [None if none else key for key, none in zip(keys, arrays[name + '.none'].tolist())]
+    return keys
+
+
+def _encode_attributes(leaves, name, arrays):
+    from numpy import array
+
+    names = []
+    seen = set()
+    for attr in leaves:
+        for key in attr:
+            if key not in seen:
+                seen.add(key)
+                names.append(key)
+
+    columns = []
+    for index, key in enumerate(names):
+        values = [attr.get(key, _MISSING) for attr in leaves]
+        missing = [value is _MISSING for value in values]
+        kind = None
+        for value in values:
+            if value is _MISSING:
+                continue
+            kind = _kind(value) if kind is None else _promote(kind, _kind(value))
+            if kind == 'O':
+                break
+        if kind != 'O':
+            default = False if kind == 'b' else 0
+            try:
+                arrays['{}.{}'.format(name, index)] = array([default if value is _MISSING else value for value in values], dtype=DTYPES[kind])
+            except OverflowError:
+                kind = 'O'
+            else:
+                column = {'name': key, 'kind': kind}
+                if any(missing):
+                    arrays['{}.{}.present'.format(name, index)] = ~array(missing, dtype=bool)
+                    column['missing'] = True
+                columns.append(column)
+                continue
+        rows = [row for row, value in enumerate(values) if value is not _MISSING]
+        columns.append({'name': key, 'kind': 'O', 'rows': rows, 'values': [values[row] for row in rows]})
+    return {'encoding': 'attributes', 'columns': columns}
+
+
+def _decode_attributes(descriptor, name, arrays, n):
+    leaves = [{} for _ in range(n)]
+    for index, column in enumerate(descriptor['columns']):
+        key = column['name']
+        if column['kind'] == 'O':
+            for row, value in zip(column['rows'], column['values']):
+                leaves[row][key] = value
+            continue
+        values = arrays['{}.{}'.format(name, index)].tolist()
+        if column.get('missing'):
+            present = arrays['{}.{}.present'.format(name, index)].tolist()
+            for attr, value, flag in zip(leaves, values, present):
+                if flag:
+                    attr[key] = value
+        else:
+            for attr, value in zip(leaves, values):
+                attr[key] = value
+    return leaves
+
+
+def _decode_columns(descriptor, name, arrays, keys):
+    from numpy import empty
+    from numpy import zeros
+
+    n = len(keys)
+    columns = {}
+    present = {}
+    for index, column in enumerate(descriptor['columns']):
+        key = column['name']
+        if column['kind'] == 'O':
+            values = empty(n, dtype=object)
+            mask = zeros(n, dtype=bool)
+            for row, value in zip(column['rows'], column['values']):
+                values[row] = value
+                mask[row] = True
+            columns[key] = values
+            present[key] = mask
+            continue
+        columns[key] = arrays['{}.{}'.format(name, index)]
+        if column.get('missing'):
+            present[key] = arrays['{}.{}.present'.format(name, index)].copy()
+    return AttributeColumns.from_arrays(keys, columns, present)
+
+
+class FromToBinary(object):
+    """Mixin for serialising data structures to a binary container file.
+
+    Data structures that use this mixin list their (nested) dicts of elements
+    in ``_binary_tables``, as pairs of a name and a nesting depth,
+    and any other data in ``_binary_scalars``.
+
+    """
+
+    _binary_tables = ()
+    _binary_scalars = ()
+
+    @classmethod
+    def from_binary(cls, filepath, mmap=True, columns=False):
+        """Construct a datastructure from a binary container file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+        mmap : bool, optional
+            Map the arrays of the file into memory instead of reading them.
+            Default is ``True``.
+        columns : bool, optional
+            Store the attributes of vertices, faces and edges in typed columns
+            (see for example :meth:`use_vertex_columns`).
+            Default is ``False``.
+
+        Returns
+        -------
+        object
+            An object of the type of ``cls``.
+
+        Notes
+        -----
+        With ``mmap=True`` and ``columns=True``, the numeric attribute columns
+        of the file are used directly as column storage (copy-on-write).
+        Their values are then only read from disk when they are accessed.
+
+        See Also
+        --------
+        * :meth:`to_binary`
+        * :func:`compas.files.read_binary`
+
+        """
+        from compas.files import read_binary
+
+        header, arrays = read_binary(filepath, mmap=mmap, mode='c')
+        return cls._from_binary_data(header, arrays, columns=columns)
+
+    @classmethod
+    def _from_binary_data(cls, header, arrays, columns=False):
+        # construct a datastructure from a header and arrays made by _to_binary_data
+        graph = cls()
+        scalars = header['scalars']
+        for name in cls._binary_scalars:
+            if name in scalars:
+                setattr(graph, name, scalars[name])
+
+        for name, depth in cls._binary_tables:
+            if name not in header['tables']:
+                continue
+            descriptor = header['tables'][name]
+            prefix = 'tables/' + name
+            outer = _decode_keys(descriptor['keys'], prefix + '/keys', arrays)
+            paths = [_decode_keys(column, '{}/path.{}'.format(prefix, level), arrays) for level, column in enumerate(descriptor['paths'])]
+            values = descriptor['values']
+            current = getattr(graph, name)
+
+            if values['encoding'] == 'attributes' and depth < 3 and (columns or isinstance(current, (ColumnDict, NestedColumnDict))):
+                if depth == 1:
+                    store = _decode_columns(values, prefix + '/values', arrays, paths[0])
+                    setattr(graph, name, ColumnDict.from_columns(store))
+                else:
+                    store = _decode_columns(values, prefix + '/values', arrays, list(zip(*paths)))
+                    setattr(graph, name, NestedColumnDict.from_columns(store, outer))
+                continue
+
+            n = len(paths[0])
+            if values['encoding'] == 'attributes':
+                leaves = _decode_attributes(values, prefix + '/values', arrays, n)
+            elif values['encoding'] == 'lists':
+                items = _decode_keys(values['items'], prefix + '/values.items', arrays)
+                offsets = [0] + arrays[prefix + '/values.sizes'].cumsum().tolist()
+                leaves = [items[offsets[i]:offsets[i + 1]] for i in range(n)]
+            else:
+                leaves = _decode_keys(values, prefix + '/values', arrays)
+
+            table = {key: {} for key in outer} if depth > 1 else {}
+            if depth == 1:
+                table.update(zip(paths[0], leaves))
+            elif depth == 2:
+                for u, v, leaf in zip(paths[0], paths[1], leaves):
+                    table[u][v] = leaf
+            else:
+                for path, leaf in zip(zip(*paths), leaves):
+                    items = table
+                    for key in path[:-1]:
+                        items = items.setdefault(key, {})
+                    items[path[-1]] = leaf
+
+            if type(current) is not dict:
+                table = type(current)(table)
+            setattr(graph, name, table)
+
+        if hasattr(graph, '_invalidate_topology'):
+            graph._invalidate_topology()
+        return graph
+
+    def to_binary(self, filepath):
+        """Write the datastructure to a binary container file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+
+        Notes
+        -----
+        Identifiers of elements are stored as arrays of integers if possible.
+        Numeric attributes are stored per attribute name, as typed arrays,
+        and all other data in a JSON header (see :func:`compas.files.write_binary`).
+        Integer values of attributes that also have float values are restored as floats.
+
+        Other than with :meth:`to_json`, identifiers keep their type and no
+        string conversions are needed, which makes reading and writing of large
+        datastructures much faster.
+
+        See Also
+        --------
+        * :meth:`from_binary`
+
+        """
+        from compas.files import write_binary
+
+        header, arrays = self._to_binary_data()
+        write_binary(filepath, header, arrays)
+
+    def _to_binary_data(self):
+        # encode the datastructure as a JSON-serialisable header and a dict of arrays
+        from numpy import array
+
+        arrays = {}
+        header = {'type': type(self).__name__, 'scalars': {}, 'tables': {}}
+
+        for name in self._binary_scalars:
+            if hasattr(self, name):
+                value = getattr(self, name)
+                header['scalars'][name] = dict(value) if isinstance(value, Mapping) else value
+
+        for name, depth in self._binary_tables:
+            if not hasattr(self, name):
+                continue
+            prefix = 'tables/' + name
+            table = getattr(self, name)
+            paths, leaves = _flatten(table, depth)
+
+            descriptor = {}
+            descriptor['keys'] = _encode_keys(list(table) if depth > 1 else [], prefix + '/keys', arrays)
+            descriptor['paths'] = [_encode_keys(column, '{}/path.{}'.format(prefix, level), arrays) for level, column in enumerate(paths)]
+
+            if leaves and all(isinstance(leaf, Mapping) for leaf in leaves):
+                values = _encode_attributes(leaves, prefix + '/values', arrays)
+            elif leaves and all(isinstance(leaf, (list, tuple)) for leaf in leaves):
+                arrays[prefix + '/values.sizes'] = array([len(leaf) for leaf in leaves], dtype='int64')
+                items = [key for leaf in leaves for key in leaf]
+                values = {'encoding': 'lists', 'items': _encode_keys(items, prefix + '/values.items', arrays)}
+            else:
+                values = _encode_keys(leaves, prefix + '/values', arrays)
+            descriptor['values'] = values
+
+            header['tables'][name] = descriptor
+
+        return header, arrays
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
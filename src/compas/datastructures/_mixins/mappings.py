@@ -1,3 +1,6 @@
+from copy import copy
+from functools import wraps
+
 from compas.utilities import geometric_key
 
 
@@ -14,8 +17,32 @@ __all__ = [
 ]
 
 
+def memoize_topology(method):
+    """Memoize the result of a method against the topology of the data structure.
+
+    The result is stored in the cache of the data structure (``_cache``), if it has one.
+    Data structures clear their cache whenever their topology changes.
+    Every call returns a shallow copy of the cached result, such that callers can
+    modify it without affecting the cache.
+
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self):
+        cache = getattr(self, '_cache', None)
+        if cache is None:
+            return method(self)
+        if name not in cache:
+            cache[name] = method(self)
+        return copy(cache[name])
+
+    return wrapper
+
+
 class VertexMappings(object):
 
+    @memoize_topology
     def key_index(self):
         """Returns a dictionary that maps vertex dictionary keys to the
         corresponding index in a vertex list or array.
@@ -32,6 +59,7 @@ class VertexMappings(object):
         """
         return {key: index for index, key in enumerate(self.vertices())}
 
+    @memoize_topology
     def index_key(self):
         """Returns a dictionary that maps the indices of a vertex list to
         keys in a vertex dictionary.
@@ -99,6 +127,7 @@ class VertexMappings(object):
 
 class EdgeMappings(object):
 
+    @memoize_topology
     def uv_index(self):
         """Returns a dictionary that maps edge keys (i.e. pairs of vertex keys)
         to the corresponding edge index in a list or array of edges.
@@ -115,6 +144,7 @@ class EdgeMappings(object):
         """
         return {(u, v): index for index, (u, v) in enumerate(self.edges())}
 
+    @memoize_topology
     def index_uv(self):
         """Returns a dictionary that maps edges in a list to the corresponding
         vertex key pairs.
@@ -1,3 +1,4 @@
 from .mesh import Mesh
+from .compact import CompactMesh
 
-__all__ = ['Mesh']
+__all__ = ['Mesh', 'CompactMesh']
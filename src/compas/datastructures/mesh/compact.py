@@ -0,0 +1,923 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+
+try:
+    from numpy import arange
+    from numpy import argsort
+    from numpy import array
+    from numpy import bincount
+    from numpy import concatenate
+    from numpy import cumsum
+    from numpy import empty
+    from numpy import full
+    from numpy import int32
+    from numpy import int64
+    from numpy import repeat
+    from numpy import searchsorted
+    from numpy import zeros
+
+except ImportError:
+    if 'ironpython' not in sys.version.lower():
+        raise
+
+from compas.geometry import centroid_points
+from compas.geometry import normal_polygon
+from compas.geometry import area_polygon
+from compas.geometry import cross_vectors
+from compas.geometry import length_vector
+from compas.geometry import normalize_vector
+from compas.geometry import subtract_vectors
+
+from compas.datastructures import Datastructure
+
+from compas.datastructures._mixins import EdgeGeometry
+from compas.datastructures._mixins import VertexMappings
+from compas.datastructures._mixins import EdgeMappings
+from compas.datastructures._mixins import FaceMappings
+
+
+__author__     = ['Tom Van Mele', ]
+__copyright__  = 'Copyright 2014, Block Research Group - ETH Zurich'
+__license__    = 'MIT License'
+__email__      = 'vanmelet@ethz.ch'
+
+
+__all__ = ['CompactMesh']
+
+
+def _index_dtype(n):
+    if n < 2 ** 31 - 1:
+        return int32
+    return int64
+
+
+class CompactMesh(EdgeGeometry,
+                  FaceMappings,
+                  EdgeMappings,
+                  VertexMappings,
+                  Datastructure):
+    """Array-based, read-only half-edge representation of a mesh.
+
+    Attributes
+    ----------
+    xyz : array
+        The vertex coordinates (v, 3).
+    halfedge_vertex : array
+        The start vertex (index) of every half-edge.
+    halfedge_face : array
+        The face (index) of every half-edge, or ``-1`` for half-edges on the boundary.
+    halfedge_next : array
+        The next half-edge in the cycle of the face of every half-edge.
+        For boundary half-edges this is the next half-edge along the boundary.
+    halfedge_twin : array
+        The opposite half-edge of every half-edge.
+    face_offsets : array
+        The half-edges of face ``i`` are ``face_offsets[i]:face_offsets[i + 1]``.
+    vertex_halfedge : array
+        One outgoing half-edge per vertex, or ``-1`` for unconnected vertices.
+        If the vertex is on the boundary, this is a boundary half-edge.
+    attributes : dict
+        General mesh attributes.
+
+    Notes
+    -----
+    The half-edges of the faces are stored in the order of the faces, and in the
+    order of the vertices of every face. The boundary half-edges are stored after
+    the half-edges of the faces.
+
+    Vertex and face keys are mapped to consecutive indices.
+    Vertex attributes other than the coordinates, and face and edge attributes,
+    are stored sparsely in dictionaries.
+
+    A compact mesh cannot be modified.
+    To modify a compact mesh, convert it to a regular mesh with :meth:`to_mesh`,
+    and back with :meth:`compas.datastructures.Mesh.to_compact`.
+
+    The read-only topological and geometric queries of :class:`compas.datastructures.Mesh`
+    are available, such that algorithms that only query their input mesh run unchanged,
+    for example :func:`compas.geometry.mesh_face_normals_numpy` and the other ``mesh_*_numpy``
+    functions. Algorithms that construct a new mesh of the type of their input,
+    such as :func:`compas.topology.mesh_dual`, need a mutable type,
+    for example ``mesh_dual(compact, cls=Mesh)``.
+    Algorithms that modify their input, such as smoothing or subdivision,
+    and the attribute getters and setters are not supported.
+
+    Examples
+    --------
+    >>> import compas
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_obj(compas.get('faces.obj'))
+    >>> compact = mesh.to_compact()
+    >>> compact.number_of_faces() == mesh.number_of_faces()
+    True
+
+    """
+
+    def __init__(self):
+        super(CompactMesh, self).__init__()
+        self._max_int_key = -1
+        self._max_int_fkey = -1
+        self.attributes = {}
+        self.default_vertex_attributes = {'x': 0.0, 'y': 0.0, 'z': 0.0}
+        self.default_edge_attributes = {}
+        self.default_face_attributes = {}
+        self.xyz = zeros((0, 3))
+        self.halfedge_vertex = zeros(0, dtype=int32)
+        self.halfedge_face = zeros(0, dtype=int32)
+        self.halfedge_next = zeros(0, dtype=int32)
+        self.halfedge_twin = zeros(0, dtype=int32)
+        self.face_offsets = zeros(1, dtype=int32)
+        self.vertex_halfedge = zeros(0, dtype=int32)
+        self.vertexdata = {}
+        self.facedata = {}
+        self.edgedata = {}
+        self._index_key = []
+        self._key_index = {}
+        self._index_fkey = []
+        self._fkey_index = {}
+        self._outgoing_offsets = zeros(1, dtype=int32)
+        self._outgoing = zeros(0, dtype=int32)
+
+    def __str__(self):
+        return """
+================================================================================
+CompactMesh summary
+================================================================================
+
+- name: {}
+- vertices: {}
+- edges: {}
+- faces: {}
+- halfedges: {}
+
+================================================================================
+""".format(self.name,
+           self.number_of_vertices(),
+           self.number_of_edges(),
+           self.number_of_faces(),
+           len(self.halfedge_vertex))
+
+    # --------------------------------------------------------------------------
+    # special properties
+    # --------------------------------------------------------------------------
+
+    @property
+    def name(self):
+        """str : The name of the data structure."""
+        return self.attributes.get('name') or self.__class__.__name__
+
+    @name.setter
+    def name(self, value):
+        self.attributes['name'] = value
+
+    # --------------------------------------------------------------------------
+    # constructors
+    # --------------------------------------------------------------------------
+
+    @classmethod
+    def from_mesh(cls, mesh):
+        """Construct a compact mesh from a regular mesh.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            A mesh object.
+
+        Returns
+        -------
+        CompactMesh
+            A compact mesh object.
+
+        """
+        compact = cls()
+        compact.attributes.update(mesh.attributes)
+        compact.default_vertex_attributes.update(mesh.default_vertex_attributes)
+        compact.default_edge_attributes.update(mesh.default_edge_attributes)
+        compact.default_face_attributes.update(mesh.default_face_attributes)
+        compact._max_int_key = mesh._max_int_key
+        compact._max_int_fkey = mesh._max_int_fkey
+
+        # vertices
+
+        dva = compact.default_vertex_attributes
+        index_key = list(mesh.vertices())
+        key_index = {key: index for index, key in enumerate(index_key)}
+        n = len(index_key)
+
+        xyz = empty((n, 3))
+        vertexdata = {}
+        for index, key in enumerate(index_key):
+            attr = mesh.vertex[key]
+            xyz[index] = attr['x'], attr['y'], attr['z']
+            extra = {name: value for name, value in attr.items() if name not in ('x', 'y', 'z') and (name not in dva or dva[name] != value)}
+            if extra:
+                vertexdata[index] = extra
+
+        # faces
+
+        index_fkey = list(mesh.faces())
+        fkey_index = {fkey: index for index, fkey in enumerate(index_fkey)}
+        m = len(index_fkey)
+
+        faces = [mesh.face_vertices(fkey) for fkey in index_fkey]
+        sizes = array([len(face) for face in faces], dtype=int64)
+        h = int(sizes.sum())
+
+        itype = _index_dtype(max(n, 2 * h))
+
+        offsets = zeros(m + 1, dtype=int64)
+        cumsum(sizes, out=offsets[1:])
+
+        hv = array([key_index[key] for face in faces for key in face], dtype=int64)
+        hf = repeat(arange(m, dtype=int64), sizes)
+        hn = arange(1, h + 1, dtype=int64)
+        if m:
+            hn[offsets[1:] - 1] = offsets[:-1]
+        hd = hv[hn]
+
+        # twins
+
+        code = hv * n + hd
+        order = argsort(code, kind='mergesort')
+        sorted_code = code[order]
+        opposite = hd * n + hv
+        pos = searchsorted(sorted_code, opposite)
+        pos[pos == h] = 0
+        found = sorted_code[pos] == opposite if h else zeros(0, dtype=bool)
+
+        ht = full(h, -1, dtype=int64)
+        ht[found] = order[pos[found]]
+
+        # boundary half-edges
+
+        boundary = (ht == -1).nonzero()[0]
+        b = len(boundary)
+        bindex = arange(h, h + b, dtype=int64)
+        ht[boundary] = bindex
+
+        bv = hd[boundary]
+        bt = boundary
+
+        out = full(n, -1, dtype=int64)
+        out[bv] = bindex
+        bn = out[hv[boundary]]
+
+        halfedge_vertex = concatenate((hv, bv))
+        halfedge_face = concatenate((hf, full(b, -1, dtype=int64)))
+        halfedge_next = concatenate((hn, bn))
+        halfedge_twin = concatenate((ht, bt))
+
+        # outgoing half-edges
+
+        vertex_halfedge = full(n, -1, dtype=int64)
+        vertex_halfedge[hv[::-1]] = arange(h, dtype=int64)[::-1]
+        vertex_halfedge[bv] = bindex
+
+        counts = bincount(halfedge_vertex, minlength=n)
+        outgoing_offsets = zeros(n + 1, dtype=int64)
+        cumsum(counts, out=outgoing_offsets[1:])
+        outgoing = argsort(halfedge_vertex, kind='mergesort')
+
+        # edge and face data
+
+        edgedata = {}
+        for u in mesh.edge:
+            for v, attr in mesh.edge[u].items():
+                edgedata[u, v] = dict(attr)
+
+        facedata = {}
+        for fkey, attr in mesh.facedata.items():
+            if fkey in fkey_index:
+                facedata[fkey] = dict(attr)
+
+        compact.xyz = xyz
+        compact.halfedge_vertex = halfedge_vertex.astype(itype)
+        compact.halfedge_face = halfedge_face.astype(itype)
+        compact.halfedge_next = halfedge_next.astype(itype)
+        compact.halfedge_twin = halfedge_twin.astype(itype)
+        compact.face_offsets = offsets.astype(itype)
+        compact.vertex_halfedge = vertex_halfedge.astype(itype)
+        compact.vertexdata = vertexdata
+        compact.facedata = facedata
+        compact.edgedata = edgedata
+        compact._index_key = index_key
+        compact._key_index = key_index
+        compact._index_fkey = index_fkey
+        compact._fkey_index = fkey_index
+        compact._outgoing_offsets = outgoing_offsets.astype(itype)
+        compact._outgoing = outgoing.astype(itype)
+        return compact
+
+    # --------------------------------------------------------------------------
+    # converters
+    # --------------------------------------------------------------------------
+
+    def to_mesh(self, cls=None):
+        """Convert the compact mesh to a regular mesh.
+
+        Parameters
+        ----------
+        cls : Mesh, optional
+            The type of the mesh.
+            Defaults to :class:`compas.datastructures.Mesh`.
+
+        Returns
+        -------
+        Mesh
+            A mesh object.
+
+        """
+        if cls is None:
+            from compas.datastructures import Mesh
+            cls = Mesh
+
+        mesh = cls()
+        mesh.attributes.update(self.attributes)
+        mesh.default_vertex_attributes.update(self.default_vertex_attributes)
+        mesh.default_edge_attributes.update(self.default_edge_attributes)
+        mesh.default_face_attributes.update(self.default_face_attributes)
+
+        for index, key in enumerate(self._index_key):
+            x, y, z = self.xyz[index].tolist()
+            attr = self.vertexdata.get(index) or {}
+            mesh.add_vertex(key, attr_dict=dict(attr), x=x, y=y, z=z)
+
+        for fkey in self._index_fkey:
+            attr = self.facedata.get(fkey) or {}
+            mesh.add_face(self.face_vertices(fkey), fkey=fkey, attr_dict=dict(attr))
+
+        for (u, v), attr in self.edgedata.items():
+            mesh.add_edge(u, v, attr_dict=dict(attr))
+
+        mesh._max_int_key = self._max_int_key
+        mesh._max_int_fkey = self._max_int_fkey
+        return mesh
+
+    def to_vertices_and_faces(self):
+        """Return the vertices and faces of the mesh.
+
+        Returns
+        -------
+        tuple
+            A list of vertex coordinates,
+            and a list of faces referencing the list of vertices.
+
+        """
+        hv = self.halfedge_vertex.tolist()
+        offsets = self.face_offsets.tolist()
+        faces = [hv[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+        return self.xyz.tolist(), faces
+
+    # --------------------------------------------------------------------------
+    # helpers
+    # --------------------------------------------------------------------------
+
+    def _outgoing_halfedges(self, index):
+        return self._outgoing[self._outgoing_offsets[index]:self._outgoing_offsets[index + 1]].tolist()
+
+    def _ordered_outgoing_halfedges(self, index):
+        start = int(self.vertex_halfedge[index])
+        if start == -1:
+            return []
+        twin = self.halfedge_twin
+        nxt = self.halfedge_next
+        face = self.halfedge_face
+        halfedges = [start]
+        h = start
+        for _ in range(len(twin)):
+            t = twin[h]
+            if face[t] == -1:
+                break
+            h = nxt[t]
+            if h == start:
+                break
+            halfedges.append(int(h))
+        return halfedges
+
+    def _face_halfedges(self, index):
+        return range(self.face_offsets[index], self.face_offsets[index + 1])
+
+    def _halfedge_key(self, h):
+        return self._index_key[self.halfedge_vertex[h]]
+
+    def _halfedge_fkey(self, h):
+        f = self.halfedge_face[h]
+        if f == -1:
+            return None
+        return self._index_fkey[f]
+
+    def _find_halfedge(self, u, v):
+        j = self._key_index[v]
+        hv = self.halfedge_vertex
+        for h in self._outgoing_halfedges(self._key_index[u]):
+            if hv[self.halfedge_twin[h]] == j:
+                return h
+        raise KeyError((u, v))
+
+    # --------------------------------------------------------------------------
+    # info
+    # --------------------------------------------------------------------------
+
+    def number_of_vertices(self):
+        """Count the number of vertices in the mesh."""
+        return len(self._index_key)
+
+    def number_of_faces(self):
+        """Count the number of faces in the mesh."""
+        return len(self._index_fkey)
+
+    def number_of_edges(self):
+        """Count the number of edges in the mesh."""
+        return len(self.halfedge_vertex) // 2
+
+    def number_of_halfedges(self):
+        """Count the number of halfedges in the mesh."""
+        return self.number_of_edges()
+
+    # --------------------------------------------------------------------------
+    # mappings
+    # --------------------------------------------------------------------------
+
+    def key_index(self):
+        """Returns a dictionary that maps vertex keys to vertex indices."""
+        return dict(self._key_index)
+
+    def index_key(self):
+        """Returns a dictionary that maps vertex indices to vertex keys."""
+        return dict(enumerate(self._index_key))
+
+    # --------------------------------------------------------------------------
+    # accessors
+    # --------------------------------------------------------------------------
+
+    def vertices(self, data=False):
+        """Iterate over the vertices of the mesh.
+
+        Parameters
+        ----------
+        data : bool, optional
+            Return the vertex data as well as the vertex keys.
+
+        Yields
+        ------
+        hashable
+            The next vertex identifier (*key*), if ``data`` is false.
+        2-tuple
+            The next vertex as a (key, attr) tuple, if ``data`` is true.
+
+        Note
+        ----
+        The attribute dictionaries are compiled on the fly.
+        Modifying them has no effect on the compact mesh.
+
+        """
+        if not data:
+            for key in self._index_key:
+                yield key
+        else:
+            for index, key in enumerate(self._index_key):
+                yield key, self.vertex_attributes(key)
+
+    def faces(self, data=False):
+        """Iterate over the faces of the mesh.
+
+        Parameters
+        ----------
+        data : bool, optional
+            Return the face data as well as the face keys.
+
+        Yields
+        ------
+        hashable
+            The next face identifier (*key*), if ``data`` is false.
+        2-tuple
+            The next face as a (fkey, attr) tuple, if ``data`` is true.
+
+        """
+        for fkey in self._index_fkey:
+            if data:
+                attr = self.default_face_attributes.copy()
+                attr.update(self.facedata.get(fkey) or {})
+                yield fkey, attr
+            else:
+                yield fkey
+
+    def halfedges(self):
+        """Iterate over the halfedges of the mesh.
+
+        Yields
+        ------
+        tuple
+            The next halfedge as a (u, v) tuple.
+
+        Note
+        ----
+        Duplicates (opposite halfedges) are automatically excluded.
+        This method thus yields the undirected edges of the mesh.
+
+        """
+        key = self._index_key
+        hv = self.halfedge_vertex.tolist()
+        ht = self.halfedge_twin.tolist()
+        h = int(self.face_offsets[-1])
+        for i in range(h):
+            j = ht[i]
+            if j > i:
+                yield key[hv[i]], key[hv[j]]
+
+    def edges(self, data=False):
+        """Iterate over the edges of the mesh.
+
+        Parameters
+        ----------
+        data : bool, optional
+            Return the edge data as well as the edge vertex keys.
+
+        Yields
+        ------
+        2-tuple
+            The next edge as a (u, v) tuple, if ``data`` is false.
+        3-tuple
+            The next edge as a (u, v, data) tuple, if ``data`` is true.
+
+        """
+        edgedata = self.edgedata
+        for u, v in self.halfedges():
+            if (v, u) in edgedata:
+                u, v = v, u
+            if data:
+                attr = self.default_edge_attributes.copy()
+                attr.update(edgedata.get((u, v)) or {})
+                yield u, v, attr
+            else:
+                yield u, v
+
+    # --------------------------------------------------------------------------
+    # vertex topology
+    # --------------------------------------------------------------------------
+
+    def has_vertex(self, key):
+        """Verify that a vertex is in the mesh."""
+        return key in self._key_index
+
+    def vertex_attributes(self, key):
+        """Compile the attributes of a vertex.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the vertex.
+
+        Returns
+        -------
+        dict
+            The attributes of the vertex, including its coordinates.
+
+        """
+        index = self._key_index[key]
+        attr = self.default_vertex_attributes.copy()
+        attr.update(self.vertexdata.get(index) or {})
+        attr['x'], attr['y'], attr['z'] = self.xyz[index].tolist()
+        return attr
+
+    def is_vertex_on_boundary(self, key):
+        """Verify that a vertex is on a boundary."""
+        h = self.vertex_halfedge[self._key_index[key]]
+        return h != -1 and self.halfedge_face[h] == -1
+
+    def vertex_neighbours(self, key, ordered=False):
+        """Return the neighbours of a vertex.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the vertex.
+        ordered : bool, optional
+            Return the neighbours in the cycling order of the faces.
+            Default is false.
+
+        Returns
+        -------
+        list
+            The list of neighbouring vertices.
+
+        See Also
+        --------
+        * :meth:`compas.datastructures.Mesh.vertex_neighbours`
+
+        """
+        index = self._key_index[key]
+        if ordered:
+            halfedges = self._ordered_outgoing_halfedges(index)
+        else:
+            halfedges = self._outgoing_halfedges(index)
+        hv = self.halfedge_vertex
+        ht = self.halfedge_twin
+        return [self._index_key[hv[ht[h]]] for h in halfedges]
+
+    def vertex_degree(self, key):
+        """Count the neighbours of a vertex."""
+        index = self._key_index[key]
+        return int(self._outgoing_offsets[index + 1] - self._outgoing_offsets[index])
+
+    def is_vertex_connected(self, key):
+        """Verify that a vertex is connected to at least one other vertex."""
+        return self.vertex_degree(key) > 0
+
+    def vertex_faces(self, key, ordered=False, include_none=False):
+        """The faces connected to a vertex.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the vertex.
+        ordered : bool, optional
+            Return the faces in cycling order.
+            Default is ``False``.
+        include_none : bool, optional
+            Include *outside* faces in the list.
+            Default is ``False``.
+
+        Returns
+        -------
+        list
+            The faces connected to a vertex.
+
+        """
+        index = self._key_index[key]
+        if ordered:
+            halfedges = self._ordered_outgoing_halfedges(index)
+        else:
+            halfedges = self._outgoing_halfedges(index)
+        faces = [self._halfedge_fkey(h) for h in halfedges]
+        if include_none:
+            return faces
+        return [fkey for fkey in faces if fkey is not None]
+
+    # --------------------------------------------------------------------------
+    # edge topology
+    # --------------------------------------------------------------------------
+
+    def edge_faces(self, u, v):
+        """Find the two faces adjacent to an edge.
+
+        Returns
+        -------
+        tuple
+            The identifiers of the adjacent faces.
+            If the edge is on the boundary, one of the identifiers is ``None``.
+
+        """
+        h = self._find_halfedge(u, v)
+        return self._halfedge_fkey(h), self._halfedge_fkey(self.halfedge_twin[h])
+
+    def is_edge_on_boundary(self, u, v):
+        """Verify that an edge is on the boundary."""
+        return None in self.edge_faces(u, v)
+
+    # --------------------------------------------------------------------------
+    # boundary
+    # --------------------------------------------------------------------------
+
+    def vertices_on_boundary(self, ordered=False):
+        """Find the vertices on the boundary.
+
+        Parameters
+        ----------
+        ordered : bool, optional
+            If ``True``, return the vertices in the order in which they are found on the boundary.
+            Default is ``False``.
+
+        Returns
+        -------
+        list
+            The vertices of the boundary.
+
+        Warning
+        -------
+        If the vertices are requested in order, and the mesh has multiple borders,
+        only the vertices of the border of the first boundary half-edge are returned.
+
+        See Also
+        --------
+        * :meth:`compas.datastructures.Mesh.vertices_on_boundary`
+
+        """
+        key = self._index_key
+        start = int(self.face_offsets[-1])
+        if not ordered:
+            return [key[i] for i in sorted(set(self.halfedge_vertex[start:].tolist()))]
+        if start == len(self.halfedge_vertex):
+            return []
+        vertices = []
+        h = start
+        while True:
+            vertices.append(key[self.halfedge_vertex[h]])
+            h = int(self.halfedge_next[h])
+            if h == start:
+                break
+        return vertices
+
+    def faces_on_boundary(self):
+        """Find the faces on the boundary.
+
+        Returns
+        -------
+        list
+            The faces on the boundary.
+
+        """
+        start = int(self.face_offsets[-1])
+        faces = self.halfedge_face[self.halfedge_twin[start:]]
+        return [self._index_fkey[f] for f in sorted(set(faces.tolist()))]
+
+    def edges_on_boundary(self):
+        """Find the edges on the boundary.
+
+        Returns
+        -------
+        list
+            The edges on the boundary.
+
+        """
+        start = int(self.face_offsets[-1])
+        twin = self.halfedge_twin
+        vertex = self.halfedge_vertex
+        boundary = set()
+        for h in range(start, len(vertex)):
+            boundary.add(frozenset((int(vertex[h]), int(vertex[twin[h]]))))
+        key_index = self._key_index
+        return [(u, v) for u, v in self.edges() if frozenset((key_index[u], key_index[v])) in boundary]
+
+    # --------------------------------------------------------------------------
+    # face topology
+    # --------------------------------------------------------------------------
+
+    def face_vertices(self, fkey):
+        """The vertices of a face.
+
+        Parameters
+        ----------
+        fkey : hashable
+            Identifier of the face.
+
+        Returns
+        -------
+        list
+            Ordered vertex identifiers.
+
+        """
+        index = self._fkey_index[fkey]
+        key = self._index_key
+        hv = self.halfedge_vertex[self.face_offsets[index]:self.face_offsets[index + 1]]
+        return [key[i] for i in hv.tolist()]
+
+    def face_halfedges(self, fkey):
+        """The halfedges of a face."""
+        vertices = self.face_vertices(fkey)
+        return list(zip(vertices, vertices[1:] + vertices[0:1]))
+
+    def face_degree(self, fkey):
+        """Count the neighbours of a face."""
+        return len(self.face_neighbours(fkey))
+
+    def face_vertex_ancestor(self, fkey, key):
+        """Return the vertex before the specified vertex in a specific face.
+
+        Raises
+        ------
+        ValueError
+            If the vertex is not part of the face.
+
+        """
+        vertices = self.face_vertices(fkey)
+        i = vertices.index(key)
+        return vertices[i - 1]
+
+    def face_vertex_descendant(self, fkey, key):
+        """Return the vertex after the specified vertex in a specific face.
+
+        Raises
+        ------
+        ValueError
+            If the vertex is not part of the face.
+
+        """
+        vertices = self.face_vertices(fkey)
+        i = vertices.index(key)
+        return vertices[(i + 1) % len(vertices)]
+
+    def face_neighbours(self, fkey):
+        """Return the neighbours of a face across its edges."""
+        index = self._fkey_index[fkey]
+        nbrs = []
+        for h in self._face_halfedges(index):
+            nbr = self._halfedge_fkey(self.halfedge_twin[h])
+            if nbr is not None:
+                nbrs.append(nbr)
+        return nbrs
+
+    # --------------------------------------------------------------------------
+    # vertex geometry
+    # --------------------------------------------------------------------------
+
+    def vertex_coordinates(self, key, axes='xyz'):
+        """Return the coordinates of a vertex.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the vertex.
+        axes : str, optional
+            The axes alon which to take the coordinates.
+            Should be a combination of ``'x'``, ``'y'``, ``'z'``.
+            Default is ``'xyz'``.
+
+        Returns
+        -------
+        list
+            Coordinates of the vertex.
+
+        """
+        xyz = self.xyz[self._key_index[key]].tolist()
+        return [xyz['xyz'.index(axis)] for axis in axes]
+
+    def vertex_area(self, key):
+        """Compute the tributary area of a vertex.
+
+        See Also
+        --------
+        * :meth:`compas.datastructures.Mesh.vertex_area`
+
+        """
+        area = 0
+        p0 = self.vertex_coordinates(key)
+        vertex = self.halfedge_vertex
+        twin = self.halfedge_twin
+        for h in self._outgoing_halfedges(self._key_index[key]):
+            p1 = self.xyz[vertex[twin[h]]].tolist()
+            v1 = subtract_vectors(p1, p0)
+            for fkey in (self._halfedge_fkey(h), self._halfedge_fkey(twin[h])):
+                if fkey is not None:
+                    v2 = subtract_vectors(self.face_centroid(fkey), p0)
+                    area += length_vector(cross_vectors(v1, v2))
+        return 0.25 * area
+
+    def vertex_laplacian(self, key):
+        """Compute the vector from a vertex to the centroid of its neighbours."""
+        c = self.vertex_neighbourhood_centroid(key)
+        p = self.vertex_coordinates(key)
+        return subtract_vectors(c, p)
+
+    def vertex_neighbourhood_centroid(self, key):
+        """Compute the centroid of the neighbours of a vertex."""
+        return centroid_points([self.vertex_coordinates(nbr) for nbr in self.vertex_neighbours(key)])
+
+    def vertex_normal(self, key):
+        """Return the normal vector at the vertex as the weighted average of the
+        normals of the neighbouring faces."""
+        vectors = [self.face_normal(fkey) for fkey in self.vertex_faces(key)]
+        return normalize_vector(centroid_points(vectors))
+
+    # --------------------------------------------------------------------------
+    # face geometry
+    # --------------------------------------------------------------------------
+
+    def face_coordinates(self, fkey, axes='xyz'):
+        """Compute the coordinates of the vertices of a face."""
+        return [self.vertex_coordinates(key, axes=axes) for key in self.face_vertices(fkey)]
+
+    def face_normal(self, fkey, unitized=True):
+        """Compute the normal of a face."""
+        return normal_polygon(self.face_coordinates(fkey), unitized=unitized)
+
+    def face_centroid(self, fkey):
+        """Compute the location of the centroid of a face."""
+        return centroid_points(self.face_coordinates(fkey))
+
+    def face_area(self, fkey):
+        """Compute the area of a face."""
+        return area_polygon(self.face_coordinates(fkey))
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import compas
+    from compas.datastructures import Mesh
+
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    compact = mesh.to_compact()
+
+    print(compact)
+
+    print(mesh.vertex_neighbours(17, ordered=True))
+    print(compact.vertex_neighbours(17, ordered=True))
+
+    print(compact.to_mesh())
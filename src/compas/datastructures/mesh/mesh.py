@@ -2,11 +2,22 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import gc
+
 from copy import deepcopy
 from ast import literal_eval
+from itertools import chain
 
+from compas.files import AMF
+from compas.files import AMFWriter
+from compas.files import DXF
 from compas.files import OBJ
+from compas.files import OBJWriter
 from compas.files import PLYreader
+from compas.files import PLYwriter
+from compas.files import STL
+from compas.files import STLWriter
+from compas.files import read_arrays
 
 from compas.utilities import pairwise
 from compas.utilities import window
@@ -40,10 +51,15 @@ from compas.datastructures._mixins import FaceHelpers
 
 from compas.datastructures._mixins import FromToData
 from compas.datastructures._mixins import FromToJson
+from compas.datastructures._mixins import FromToBinary
+
+from compas.datastructures._mixins import ColumnDict
+from compas.datastructures._mixins import NestedColumnDict
 
 from compas.datastructures._mixins import VertexMappings
 from compas.datastructures._mixins import EdgeMappings
 from compas.datastructures._mixins import FaceMappings
+from compas.datastructures._mixins.mappings import memoize_topology
 
 from compas.datastructures.mesh.operations import mesh_collapse_edge
 from compas.datastructures.mesh.operations import trimesh_collapse_edge
@@ -79,6 +95,7 @@ Mesh summary
 
 class Mesh(FromToJson,
            FromToData,
+           FromToBinary,
            EdgeGeometry,
            FaceHelpers,
            EdgeHelpers,
@@ -113,16 +130,40 @@ class Mesh(FromToJson,
         The edge dictionary.
         Every key in the dictionary corresponds to a vertex.
         With every key corresponds a dictionary of neighbours pointing to attribute dictionaries.
+        Every undirected edge of the mesh is stored once, in one of both directions.
+        The edge dictionary is updated automatically when faces are added or removed.
     attributes : dict
         General mesh attributes.
+    version : int
+        The version of the topology of the mesh.
+
+    Notes
+    -----
+    Changes of the vertices, faces and half-edges of the mesh can be recorded
+    in a journal (see :meth:`start_journal`), or reported to subscribers
+    (see :meth:`subscribe`), such that derived data can be updated incrementally.
 
     """
 
+    _binary_tables = (('vertex', 1), ('face', 1), ('facedata', 1), ('edge', 2), ('halfedge', 2))
+    _binary_scalars = ('attributes',
+                       'default_vertex_attributes',
+                       'default_edge_attributes',
+                       'default_face_attributes',
+                       '_max_int_key',
+                       '_max_int_fkey')
+
     def __init__(self):
         super(Mesh, self).__init__()
         self._key_to_str = False
         self._max_int_key = -1
         self._max_int_fkey = -1
+        self._version = 0
+        self._cache = {}
+        self._shared = set()
+        self._journal = None
+        self._listeners = []
+        self._changing = False
 
         self.attributes = {
             'name'         : None,
@@ -168,6 +209,17 @@ class Mesh(FromToJson,
     def adjacency(self):
         return self.halfedge
 
+    @property
+    def version(self):
+        """int : The version of the topology of the mesh.
+
+        The version is incremented by every change of the topology:
+        adding or deleting vertices, faces and edges, and topological operations.
+        Derived data, such as :meth:`key_index` and :meth:`uv_index`,
+        is memoized against the version.
+        """
+        return self._version
+
     @property
     def name(self):
         """str : The name of the data structure.
@@ -225,7 +277,7 @@ class Mesh(FromToJson,
 
         for key in self.vertex:
             rkey = repr(key)
-            data['vertex'][rkey] = self.vertex[key]
+            data['vertex'][rkey] = dict(self.vertex[key])
 
         for fkey in self.face:
             rfkey = repr(fkey)
@@ -233,7 +285,7 @@ class Mesh(FromToJson,
 
         for fkey in self.facedata:
             rfkey = repr(fkey)
-            data['facedata'][rfkey] = self.facedata[fkey]
+            data['facedata'][rfkey] = dict(self.facedata[fkey])
 
         for u in self.edge:
             ru = repr(u)
@@ -241,7 +293,7 @@ class Mesh(FromToJson,
 
             for v in self.edge[u]:
                 rv = repr(v)
-                data['edge'][ru][rv] = self.edge[u][v]
+                data['edge'][ru][rv] = dict(self.edge[u][v])
 
         return data
 
@@ -274,16 +326,14 @@ class Mesh(FromToJson,
         # add the faces
         for fkey, vertices in iter(face.items()):
             attr = facedata.get(fkey) or {}
-            vertices = map(literal_eval, vertices)
+            vertices = list(map(literal_eval, vertices))
             fkey = literal_eval(fkey)
             self.add_face(vertices, fkey=fkey, attr_dict=attr)
 
         # add the edges
-        # todo: replace by method call
         for u, nbrs in iter(edge.items()):
             nbrs = nbrs or {}
             u = literal_eval(u)
-            self.edge[u] = {}
 
             for v, attr in iter(nbrs.items()):
                 attr = attr or {}
@@ -331,15 +381,114 @@ class Mesh(FromToJson,
         >>> mesh = Mesh.from_obj(compas.get('faces.obj'))
 
         """
-        mesh = cls()
         obj = OBJ(filepath)
         vertices = obj.parser.vertices
         faces = obj.parser.faces
-        for x, y, z in vertices:
-            mesh.add_vertex(x=x, y=y, z=z)
-        for face in faces:
-            mesh.add_face(face)
-        return mesh
+        return cls.from_vertices_and_faces(vertices, faces)
+
+    @classmethod
+    def from_file(cls, filepath, format=None, **kwargs):
+        """Construct a mesh object from the faces in a file of any registered format.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+        format : str, optional
+            The name of the format.
+            Default is ``None``, in which case the format is derived from the
+            first bytes of the file or its extension.
+        kwargs : dict, optional
+            Options of the reader of the format.
+
+        Returns
+        -------
+        Mesh :
+            A mesh object.
+
+        Raises
+        ------
+        ValueError
+            If the file does not contain faces.
+
+        See Also
+        --------
+        * :func:`compas.files.read_arrays`
+        * :func:`compas.files.register_format`
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_file('scan.ply')
+        >>> mesh = Mesh.from_file('part.stl', tolerance=0.001)
+
+        """
+        data = read_arrays(filepath, format=format, **kwargs)
+        if not len(data.get('faces', ())):
+            raise ValueError('The file has no faces: {}'.format(filepath))
+        return cls.from_arrays(data['vertices'], data['faces'])
+
+    @classmethod
+    def from_amf(cls, filepath):
+        """Construct a mesh object from the triangles of a plain or zipped AMF file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+
+        Returns
+        -------
+        Mesh :
+            A mesh object.
+
+        Notes
+        -----
+        The triangles of all objects in the file are combined in one mesh.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_amf('part.amf')
+
+        """
+        amf = AMF(filepath)
+        return cls.from_arrays(amf.reader.vertices, amf.reader.faces)
+
+    @classmethod
+    def from_dxf(cls, filepath, precision='3f', tolerance=None):
+        """Construct a mesh object from the 3DFACE entities and polyface meshes of a DXF file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+        precision : str, optional
+            The precision of the geometric keys used to merge the corners of the faces.
+            Default is ``'3f'``.
+        tolerance : float, optional
+            If provided, corners closer than this distance are merged
+            with :func:`compas.geometry.weld_points_numpy` instead.
+
+        Returns
+        -------
+        Mesh :
+            A mesh object.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_dxf('faces.dxf')
+
+        """
+        dxf = DXF(filepath, precision=precision, tolerance=tolerance)
+        vertices = dxf.parser.vertices
+        faces = dxf.parser.faces
+        used = sorted(set(index for face in faces for index in face))
+        index = {old: new for new, old in enumerate(used)}
+        vertices = [vertices[old] for old in used]
+        faces = [[index[old] for old in face] for face in faces]
+        return cls.from_vertices_and_faces(vertices, faces)
 
     @classmethod
     def from_ply(cls, filepath):
@@ -369,6 +518,18 @@ class Mesh(FromToJson,
 
         """
         reader = PLYreader(filepath)
+        try:
+            reader.read_arrays()
+        except ImportError:
+            pass
+        else:
+            from numpy import column_stack
+            from numpy import empty
+            xyz = column_stack([reader.vertex_array[name] for name in 'xyz'])
+            faces = reader.face_array
+            if faces is None:
+                faces = empty((0, 3), dtype=int)
+            return cls.from_arrays(xyz, faces)
         reader.read()
         vertices = [(vertex['x'], vertex['y'], vertex['z']) for vertex in reader.vertices]
         faces = [face['vertex_indices'] for face in reader.faces]
@@ -376,7 +537,34 @@ class Mesh(FromToJson,
         return mesh
 
     @classmethod
-    def from_lines(cls, lines, delete_boundary_face=False, precision='3f'):
+    def from_stl(cls, filepath, tolerance=0.0):
+        """Construct a mesh object from the triangles of a binary or ASCII STL file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+        tolerance : float, optional
+            The distance under which the corners of the triangles are merged
+            into shared vertices.
+            Default is ``0.0``, i.e. only identical corners are merged.
+
+        Returns
+        -------
+        Mesh :
+            A mesh object.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_stl('part.stl')
+
+        """
+        stl = STL(filepath, tolerance=tolerance)
+        return cls.from_arrays(stl.parser.vertices, stl.parser.faces)
+
+    @classmethod
+    def from_lines(cls, lines, delete_boundary_face=False, precision='3f', tolerance=None):
         """Construct a mesh object from a list of lines described by start and end point coordinates.
 
         Parameters
@@ -389,6 +577,9 @@ class Mesh(FromToJson,
             to be there. Therefore, there is the option to have it automatically deleted.
         precision: str, optional
             The precision of the geometric map that is used to connect the lines.
+        tolerance : float, optional
+            If provided, line end points closer to each other than this distance are connected,
+            using :func:`compas.geometry.weld_points_numpy` instead of a geometric map.
 
         Returns
         -------
@@ -411,7 +602,7 @@ class Mesh(FromToJson,
         from compas.topology import network_find_faces
         from compas.datastructures import FaceNetwork
 
-        network = FaceNetwork.from_lines(lines, precision=precision)
+        network = FaceNetwork.from_lines(lines, precision=precision, tolerance=tolerance)
 
         network_find_faces(network, breakpoints=network.leaves())
 
@@ -451,7 +642,15 @@ class Mesh(FromToJson,
         >>> faces = [[0, 1, 2]]
         >>> mesh = Mesh.from_vertices_and_faces(vertices, faces)
 
+        Notes
+        -----
+        If NumPy is available, the mesh is constructed in bulk with :meth:`from_arrays`.
+
         """
+        try:
+            return cls.from_arrays(vertices, faces)
+        except ImportError:
+            pass
         mesh = cls()
         for x, y, z in iter(vertices):
             mesh.add_vertex(x=x, y=y, z=z)
@@ -459,6 +658,215 @@ class Mesh(FromToJson,
             mesh.add_face(face)
         return mesh
 
+    @classmethod
+    def from_arrays(cls, vertices, faces, validate=False):
+        """Construct a mesh object from arrays of vertex coordinates and face vertex indices.
+
+        Parameters
+        ----------
+        vertices : array-like
+            The XYZ coordinates of the vertices (n x 3).
+        faces : array-like
+            The vertex indices of the faces.
+            This is either a two-dimensional array (m x k), or a sequence of
+            sequences of indices of varying length.
+            In a two-dimensional array, negative indices are treated as padding
+            at the end of the rows of faces with fewer than ``k`` vertices.
+        validate : bool, optional
+            Check that the faces form a valid, consistently oriented manifold.
+            Default is ``False``.
+
+        Returns
+        -------
+        Mesh
+            A mesh object.
+
+        Raises
+        ------
+        ValueError
+            If a face references a vertex that does not exist.
+        ValueError
+            If ``validate`` is ``True`` and a face is degenerate, a face is used twice,
+            or an edge is traversed more than once in the same direction.
+            The latter happens if an edge has more than two faces,
+            or if the cycle directions of neighbouring faces are not compatible.
+
+        Notes
+        -----
+        The vertices get the keys ``0`` to ``n - 1`` and the faces the keys ``0`` to ``m - 1``,
+        in the order in which they are provided.
+        The faces are cleaned in the same way as by :meth:`add_face`,
+        and faces with less than three vertices are ignored.
+
+        The resulting mesh is identical to one constructed with :meth:`add_vertex` and
+        :meth:`add_face`, but all indexing and validation is done in bulk.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from compas.datastructures import Mesh
+        >>> vertices = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]])
+        >>> faces = np.array([[0, 1, 2, 3], [0, 2, 3, -1]])
+        >>> mesh = Mesh.from_arrays(vertices, faces)
+        >>> mesh.face_vertices(1)
+        [0, 2, 3]
+
+        """
+        from numpy import arange
+        from numpy import asarray
+        from numpy import cumsum
+        from numpy import fromiter
+        from numpy import int64
+        from numpy import ones
+        from numpy import repeat
+        from numpy import unique
+        from numpy import zeros
+
+        if not hasattr(vertices, 'shape'):
+            vertices = list(vertices)
+        xyz = asarray(vertices, dtype=float).reshape((-1, 3))
+        n = len(xyz)
+
+        if hasattr(faces, 'ndim') and faces.ndim == 2:
+            faces = asarray(faces, dtype=int64)
+            mask = faces >= 0
+            sizes = mask.sum(axis=1)
+            indices = faces[mask]
+        else:
+            faces = list(faces)
+            sizes = fromiter((len(face) for face in faces), dtype=int64, count=len(faces))
+            indices = fromiter(chain.from_iterable(faces), dtype=int64, count=int(sizes.sum()))
+
+        if len(indices) and (indices.min() < 0 or indices.max() >= n):
+            raise ValueError('The faces reference vertices that do not exist.')
+
+        # clean the faces as in add_face
+        # i.e. remove a closing vertex and a repeated last vertex
+
+        keep = ones(len(indices), dtype=bool)
+        offsets = zeros(len(sizes) + 1, dtype=int64)
+        cumsum(sizes, out=offsets[1:])
+        first = offsets[:-1]
+
+        for step in range(2):
+            last = first + sizes - 1
+            other = first if step == 0 else last - 1
+            closed = sizes > 1
+            closed[closed] = indices[other[closed]] == indices[last[closed]]
+            keep[last[closed]] = False
+            sizes[closed] -= 1
+
+        # ignore faces with less than three vertices
+
+        valid = sizes > 2
+        keep &= repeat(valid, offsets[1:] - offsets[:-1])
+        indices = indices[keep]
+        sizes = sizes[valid]
+        m = len(sizes)
+
+        offsets = zeros(m + 1, dtype=int64)
+        cumsum(sizes, out=offsets[1:])
+        corner_face = repeat(arange(m), sizes)
+        following = arange(len(indices)) + 1
+        following[offsets[1:] - 1] = offsets[:-1]
+        u = indices
+        v = indices[following]
+
+        if validate:
+            cls._validate_arrays(n, indices, sizes, offsets, corner_face, u, v)
+
+        # the first half-edge of every edge determines its orientation
+
+        lo = u.copy()
+        hi = v.copy()
+        swap = lo > hi
+        lo[swap], hi[swap] = hi[swap], lo[swap]
+        _, edges = unique(lo * n + hi, return_index=True)
+        edges.sort()
+
+        # build the dicts
+        # the garbage collector is paused, since it would otherwise repeatedly
+        # traverse the large number of containers that are created here
+
+        mesh = cls()
+        mesh._invalidate_topology()
+
+        collect = gc.isenabled()
+        gc.disable()
+        try:
+            dva = mesh.default_vertex_attributes
+            dea = mesh.default_edge_attributes
+            dfa = mesh.default_face_attributes
+
+            if set(dva) <= set('xyz'):
+                vertex = {key: {'x': x, 'y': y, 'z': z} for key, (x, y, z) in enumerate(xyz.tolist())}
+            else:
+                vertex = {key: dict(dva, x=x, y=y, z=z) for key, (x, y, z) in enumerate(xyz.tolist())}
+            mesh.vertex.update(vertex)
+
+            halfedge = mesh.halfedge = {key: {} for key in range(n)}
+            mesh.edge.update({key: {} for key in range(n)})
+
+            indices = indices.tolist()
+            offsets = offsets.tolist()
+            mesh.face.update({fkey: indices[offsets[fkey]:offsets[fkey + 1]] for fkey in range(m)})
+            mesh.facedata.update({fkey: dict(dfa) if dfa else {} for fkey in range(m)})
+
+            for a, b, fkey in zip(indices, v.tolist(), corner_face.tolist()):
+                halfedge[a][b] = fkey
+                if a not in halfedge[b]:
+                    halfedge[b][a] = None
+
+            edge = mesh.edge
+            for a, b in zip(u[edges].tolist(), v[edges].tolist()):
+                edge[a][b] = dict(dea) if dea else {}
+        finally:
+            if collect:
+                gc.enable()
+
+        mesh._max_int_key = n - 1
+        mesh._max_int_fkey = m - 1
+        return mesh
+
+    @staticmethod
+    def _validate_arrays(n, indices, sizes, offsets, corner_face, u, v):
+        from numpy import diff
+        from numpy import flatnonzero
+        from numpy import lexsort
+        from numpy import sort
+        from numpy import unique
+
+        degenerate = flatnonzero(u == v)
+        if len(degenerate):
+            raise ValueError('Face {} is degenerate.'.format(corner_face[degenerate[0]]))
+
+        # a vertex should appear only once per face
+
+        codes = sort(corner_face * n + indices)
+        repeated = flatnonzero(diff(codes) == 0)
+        if len(repeated):
+            raise ValueError('Face {} is degenerate.'.format(codes[repeated[0]] // n))
+
+        # every half-edge should belong to at most one face
+
+        order = lexsort((v, u))
+        codes = (u * n + v)[order]
+        repeated = flatnonzero(diff(codes) == 0)
+        if len(repeated):
+            i = order[repeated[0]]
+            raise ValueError('Edge ({}, {}) is not manifold or the orientation of its faces is inconsistent.'.format(u[i], v[i]))
+
+        # every face should be unique
+
+        for size in unique(sizes):
+            fkeys = flatnonzero(sizes == size)
+            rows = offsets[fkeys][:, None] + range(size)
+            rows = sort(indices[rows], axis=1)
+            _, index, counts = unique(rows, axis=0, return_index=True, return_counts=True)
+            if (counts > 1).any():
+                first = fkeys[index[counts > 1][0]]
+                raise ValueError('Face {} is used more than once.'.format(first))
+
     @classmethod
     def from_polyhedron(cls, f):
         """Construct a mesh from a platonic solid.
@@ -496,19 +904,22 @@ class Mesh(FromToJson,
         """
         from compas.topology import delaunay_from_points
         faces = delaunay_from_points(points, boundary=boundary, holes=holes)
-        return Mesh.from_vertices_and_faces(points, faces)
+        return cls.from_vertices_and_faces(points, faces)
 
     # --------------------------------------------------------------------------
     # converters
     # --------------------------------------------------------------------------
 
-    def to_obj(self, filepath):
+    def to_obj(self, filepath, precision='3f'):
         """Write the mesh to an OBJ file.
 
         Parameters
         ----------
         filepath : str
             Full path of the file.
+        precision : str, optional
+            The format specification of the coordinates.
+            Default is ``'3f'``.
 
         Warning
         -------
@@ -517,18 +928,80 @@ class Mesh(FromToJson,
 
         Examples
         --------
-        >>>
+        >>> mesh.to_obj('mesh.obj')
 
         """
         key_index = self.key_index()
+        faces = [[key_index[key] for key in self.face_vertices(fkey)] for fkey in self.faces()]
+        OBJWriter(filepath, self.xyz, faces=faces, precision=precision).write()
 
-        with open(filepath, 'w+') as fh:
-            for key, attr in self.vertices(True):
-                fh.write('v {0[x]:.3f} {0[y]:.3f} {0[z]:.3f}\n'.format(attr))
-            for fkey in self.faces():
-                vertices = self.face_vertices(fkey)
-                vertices = [key_index[key] + 1 for key in vertices]
-                fh.write(' '.join(['f'] + [str(index) for index in vertices]) + '\n')
+    def to_ply(self, filepath, binary=True):
+        """Write the mesh to a PLY file.
+
+        Parameters
+        ----------
+        filepath : str
+            Full path of the file.
+        binary : bool, optional
+            Write a binary little-endian file instead of an ASCII file.
+            Default is ``True``.
+
+        Examples
+        --------
+        >>> mesh.to_ply('mesh.ply')
+
+        """
+        key_index = self.key_index()
+        faces = [[key_index[key] for key in self.face_vertices(fkey)] for fkey in self.faces()]
+        PLYwriter(filepath, self.xyz, faces=faces, binary=binary).write()
+
+    def to_amf(self, filepath, compress=False):
+        """Write the mesh to an AMF file.
+
+        Parameters
+        ----------
+        filepath : str
+            Full path of the file.
+        compress : bool, optional
+            Write a zip archive containing the file.
+            Default is ``False``.
+
+        Notes
+        -----
+        Faces with more than three vertices are triangulated as fans.
+
+        Examples
+        --------
+        >>> mesh.to_amf('mesh.amf')
+
+        """
+        key_index = self.key_index()
+        faces = [[key_index[key] for key in self.face_vertices(fkey)] for fkey in self.faces()]
+        AMFWriter(filepath, self.xyz, faces, compress=compress).write()
+
+    def to_stl(self, filepath, binary=True):
+        """Write the mesh to an STL file.
+
+        Parameters
+        ----------
+        filepath : str
+            Full path of the file.
+        binary : bool, optional
+            Write a binary file instead of an ASCII file.
+            Default is ``True``.
+
+        Notes
+        -----
+        Faces with more than three vertices are triangulated as fans.
+
+        Examples
+        --------
+        >>> mesh.to_stl('mesh.stl')
+
+        """
+        key_index = self.key_index()
+        faces = [[key_index[key] for key in self.face_vertices(fkey)] for fkey in self.faces()]
+        STLWriter(filepath, self.xyz, faces, binary=binary).write()
 
     def to_vertices_and_faces(self):
         """Return the vertices and faces of a mesh.
@@ -552,6 +1025,28 @@ class Mesh(FromToJson,
         faces = [self.face_vertices(fkey) for fkey in self.faces()]
         return vertices, faces
 
+    def to_compact(self):
+        """Convert the mesh to an array-based, compact representation.
+
+        Returns
+        -------
+        CompactMesh
+            The compact representation of the mesh.
+
+        Note
+        ----
+        The conversion is lossless.
+        The original mesh can be recovered with :meth:`CompactMesh.to_mesh`.
+
+        Example
+        -------
+        >>> compact = mesh.to_compact()
+        >>> other = compact.to_mesh()
+
+        """
+        from compas.datastructures.mesh.compact import CompactMesh
+        return CompactMesh.from_mesh(self)
+
     # --------------------------------------------------------------------------
     # helpers
     # --------------------------------------------------------------------------
@@ -617,57 +1112,381 @@ class Mesh(FromToJson,
     def _cycle_keys(self, keys):
         return pairwise(keys + keys[0:1])
 
-    def copy(self):
+    def _invalidate_topology(self):
+        self._version += 1
+        self._cache.clear()
+        if self._shared:
+            self._unshare()
+
+    def _is_observed(self):
+        return self._journal is not None or bool(self._listeners)
+
+    def _emit(self, events):
+        if not events:
+            return
+        if self._journal is not None:
+            self._journal.extend(events)
+        for callback in list(self._listeners):
+            callback(self, events)
+
+    def _record(self, action, element, key):
+        # record a single change made outside of a change scope
+        if self._changing or not self._is_observed():
+            return
+        self._emit([(action, element, key)])
+
+    def _neighbourhood(self, keys):
+        # snapshot of the vertices, half-edges and faces around the given vertices
+        vertices = {}
+        halfedges = {}
+        faces = {}
+        for u in keys:
+            if u not in self.vertex:
+                continue
+            attr = self.vertex[u]
+            vertices[u] = attr.get('x'), attr.get('y'), attr.get('z')
+            for v, fkey in self.halfedge.get(u, {}).items():
+                halfedges[u, v] = fkey
+                if u in self.halfedge.get(v, {}):
+                    halfedges[v, u] = self.halfedge[v][u]
+        for fkey in set(halfedges.values()):
+            if fkey is not None and fkey in self.face:
+                faces[fkey] = tuple(self.face[fkey])
+        return vertices, halfedges, faces
+
+    def _begin_change(self, keys):
+        # open a change scope around a modification of the neighbourhood of the given vertices
+        # changes made inside the scope are reported by _end_change as a single batch
+        # nested scopes are absorbed by the outer one
+        if self._changing or not self._is_observed():
+            return None
+        self._changing = True
+        keys = set(keys)
+        return keys, self._neighbourhood(keys)
+
+    def _end_change(self, scope, added=None):
+        # close a change scope and report the differences with the initial state
+        # added are the keys of the vertices created inside the scope
+        if scope is None:
+            return
+        self._changing = False
+        keys, (vertices, halfedges, faces) = scope
+        if added:
+            keys.update(added)
+        after_vertices, after_halfedges, after_faces = self._neighbourhood(keys)
+
+        events = []
+        for fkey, cycle in faces.items():
+            if fkey not in self.face or tuple(self.face[fkey]) != cycle:
+                events.append(('remove', 'face', fkey))
+        for uv, fkey in halfedges.items():
+            if uv not in after_halfedges or after_halfedges[uv] != fkey:
+                events.append(('remove', 'halfedge', uv))
+        for key in vertices:
+            if key not in self.vertex:
+                events.append(('remove', 'vertex', key))
+        for key in after_vertices:
+            if key not in vertices:
+                events.append(('add', 'vertex', key))
+        for uv, fkey in after_halfedges.items():
+            if uv not in halfedges or halfedges[uv] != fkey:
+                events.append(('add', 'halfedge', uv))
+        for fkey, cycle in after_faces.items():
+            if faces.get(fkey) != cycle:
+                events.append(('add', 'face', fkey))
+        for key, xyz in after_vertices.items():
+            if key in vertices and vertices[key] != xyz:
+                events.append(('move', 'vertex', key))
+        self._emit(events)
+
+    def _vertex_attributes_changed(self, keys, names):
+        if self._changing or not self._is_observed():
+            return
+        if not set(names) & set('xyz'):
+            return
+        if keys is None:
+            keys = self.vertices()
+        self._emit([('move', 'vertex', key) for key in keys])
+
+    def _unshare(self):
+        # replace the dicts shared with other meshes by private copies
+        # see copy(shared=True) and copy_geometry()
+        for name in self._shared:
+            setattr(self, name, self._copy_dict(name))
+        self._shared = set()
+
+    def _copy_dict(self, name):
+        items = getattr(self, name)
+        if isinstance(items, (ColumnDict, NestedColumnDict)):
+            return items.copy()
+        if name == 'face':
+            return {fkey: list(vertices) for fkey, vertices in items.items()}
+        if name == 'edge':
+            return {u: {v: dict(attr) for v, attr in nbrs.items()} for u, nbrs in items.items()}
+        return {key: dict(value) for key, value in items.items()}
+
+    def _update_edges(self, keys):
+        # synchronise the edges of the given vertices with the half-edges
+        # an edge exists if at least one of its half-edges points to a face
+        halfedge = self.halfedge
+        for u in keys:
+            if u not in halfedge:
+                if u in self.edge:
+                    del self.edge[u]
+                continue
+            if u not in self.edge:
+                self.edge[u] = {}
+            edges = self.edge[u]
+            for v in list(edges):
+                if v not in halfedge[u] or (halfedge[u][v] is None and halfedge.get(v, {}).get(u) is None):
+                    del edges[v]
+            for v, fkey in halfedge[u].items():
+                if v in edges or (v in self.edge and u in self.edge[v]):
+                    continue
+                if fkey is None and halfedge.get(v, {}).get(u) is None:
+                    continue
+                edges[v] = self.default_edge_attributes.copy()
+
+    def _remove_edge(self, u, v):
+        if u in self.edge and v in self.edge[u]:
+            del self.edge[u][v]
+        elif v in self.edge and u in self.edge[v]:
+            del self.edge[v][u]
+
+    def copy(self, shared=False):
         """Make an independent copy of the mesh object.
 
+        Parameters
+        ----------
+        shared : bool, optional
+            Share the topology of the mesh with the copy until either one of
+            them is modified (copy-on-write).
+            Default is ``False``.
+
         Returns
         -------
         Mesh
             A separate, but identical mesh object.
 
+        Notes
+        -----
+        A shared copy copies the attribute dicts of the vertices, faces and edges,
+        but reuses the face and half-edge dicts of the original.
+        Private copies of the latter are made as soon as the topology of either
+        mesh is modified through the methods of the mesh or one of the topological
+        operations. Never modify the face or half-edge dicts of a shared copy directly.
+
+        The attribute values themselves are not copied, as they would be with a normal copy.
+
+        See Also
+        --------
+        * :meth:`copy_geometry`
+
+        Examples
+        --------
+        >>> mesh = Mesh.from_obj(compas.get('faces.obj'))
+        >>> other = mesh.copy(shared=True)
+        >>> other.face is mesh.face
+        True
+        >>> other.delete_face(0)
+        >>> other.face is mesh.face
+        False
+
         """
+        if shared:
+            return self._copy_shared(('face', 'halfedge'))
         cls = type(self)
         return cls.from_data(deepcopy(self.data))
 
+    def copy_geometry(self):
+        """Make a copy of the mesh object that only has its own vertex attributes.
+
+        Returns
+        -------
+        Mesh
+            A mesh object with the same topology and attributes.
+
+        Notes
+        -----
+        The copy shares the face, half-edge, edge and face attribute dicts of the
+        original, until the topology of either mesh is modified (see :meth:`copy`).
+        The vertex attributes, and therefore the coordinates of the vertices,
+        can be modified independently.
+        Modifications of the attributes of the faces or edges of either mesh,
+        however, are visible in both as long as the dicts are shared.
+
+        This makes it very cheap to create variations of the geometry of a mesh,
+        for example in optimisation loops.
+
+        Examples
+        --------
+        >>> mesh = Mesh.from_obj(compas.get('faces.obj'))
+        >>> other = mesh.copy_geometry()
+        >>> other.set_vertex_attribute(0, 'z', 1.0)
+        >>> mesh.get_vertex_attribute(0, 'z')
+        0.0
+
+        """
+        return self._copy_shared(('face', 'halfedge', 'edge', 'facedata'))
+
+    def _copy_shared(self, names):
+        cls = type(self)
+        other = cls()
+        other.attributes.update(self.attributes)
+        other.default_vertex_attributes = dict(self.default_vertex_attributes)
+        other.default_edge_attributes = dict(self.default_edge_attributes)
+        other.default_face_attributes = dict(self.default_face_attributes)
+        other._key_to_str = self._key_to_str
+        other._max_int_key = self._max_int_key
+        other._max_int_fkey = self._max_int_fkey
+
+        for name in ('vertex', 'face', 'facedata', 'edge', 'halfedge'):
+            if name in names:
+                setattr(other, name, getattr(self, name))
+            else:
+                setattr(other, name, self._copy_dict(name))
+
+        self._shared.update(names)
+        other._shared = set(names)
+        other._cache = dict(self._cache)
+        return other
+
     def clear(self):
         """Clear all the mesh data."""
-        del self.vertex
-        del self.edge
-        del self.halfedge
-        del self.face
-        del self.facedata
-        self.vertex   = {}
-        self.edge     = {}
+        self._invalidate_topology()
+        self._record('clear', None, None)
+        self.vertex   = type(self.vertex)()
+        self.edge     = type(self.edge)()
         self.halfedge = {}
         self.face     = {}
-        self.facedata = {}
+        self.facedata = type(self.facedata)()
         self._max_int_key = -1
         self._max_int_fkey = -1
 
     def clear_vertexdict(self):
         """Clear only the vertices."""
-        del self.vertex
-        self.vertex = {}
+        self._invalidate_topology()
+        self._record('clear', 'vertex', None)
+        self.vertex = type(self.vertex)()
         self._max_int_key = -1
 
     def clear_facedict(self):
         """Clear only the faces."""
-        del self.face
-        del self.facedata
+        self._invalidate_topology()
+        self._record('clear', 'face', None)
         self.face = {}
-        self.facedata = {}
+        self.facedata = type(self.facedata)()
         self._max_int_fkey = -1
 
     def clear_edgedict(self):
         """Clear only the edges."""
-        del self.edge
-        self.edge = {}
+        self._invalidate_topology()
+        self._record('clear', 'edge', None)
+        self.edge = type(self.edge)()
 
     def clear_halfedgedict(self):
         """Clear only the half edges."""
+        self._invalidate_topology()
+        self._record('clear', 'halfedge', None)
         del self.halfedge
         self.halfedge = {}
 
+    # --------------------------------------------------------------------------
+    # journal
+    # --------------------------------------------------------------------------
+
+    def start_journal(self):
+        """Start recording the changes of the mesh in a journal.
+
+        Notes
+        -----
+        Every entry of the journal is a tuple ``(action, element, key)``.
+
+        * ``('add', 'vertex', key)``, ``('remove', 'vertex', key)``
+        * ``('move', 'vertex', key)``, if the coordinates of a vertex were changed
+        * ``('add', 'face', fkey)``, ``('remove', 'face', fkey)``
+        * ``('add', 'halfedge', (u, v))``, ``('remove', 'halfedge', (u, v))``
+        * ``('clear', element, None)``, if all elements of a kind were removed,
+          or ``('clear', None, None)`` if the entire mesh was cleared.
+
+        A face of which the vertex cycle was modified is reported as removed and
+        added again. The same is true for a half-edge that was assigned to another face.
+        Topological operations report their net effect: intermediate states are not recorded.
+
+        Coordinates are tracked through the builders, the topological operations
+        and the attribute setters (for example :meth:`set_vertex_attributes`).
+        Direct assignments to the vertex dictionary (``mesh.vertex[key]['x'] = x``)
+        are not recorded.
+
+        See Also
+        --------
+        * :meth:`stop_journal`
+        * :meth:`drain_journal`
+        * :meth:`subscribe`
+
+        Examples
+        --------
+        >>> mesh = Mesh.from_obj(compas.get('faces.obj'))
+        >>> mesh.start_journal()
+        >>> mesh.delete_face(0)
+        >>> mesh.drain_journal()
+        [('remove', 'face', 0), ...]
+
+        """
+        if self._journal is None:
+            self._journal = []
+
+    def stop_journal(self):
+        """Stop recording the changes of the mesh.
+
+        Returns
+        -------
+        list
+            The entries recorded since the last drain.
+
+        """
+        entries = self._journal or []
+        self._journal = None
+        return entries
+
+    def drain_journal(self):
+        """Remove and return the recorded changes, and continue recording.
+
+        Returns
+        -------
+        list
+            The entries recorded since the journal was started or last drained.
+
+        """
+        if self._journal is None:
+            return []
+        entries = self._journal
+        self._journal = []
+        return entries
+
+    def subscribe(self, callback):
+        """Register a function to be called with every change of the mesh.
+
+        Parameters
+        ----------
+        callback : callable
+            A function with signature ``callback(mesh, events)``.
+            The events are a list of entries as described in :meth:`start_journal`,
+            with the net effect of one modification of the mesh.
+
+        Notes
+        -----
+        Callbacks should not modify the mesh.
+
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """Remove a function registered with :meth:`subscribe`."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
     # --------------------------------------------------------------------------
     # builders
     # --------------------------------------------------------------------------
@@ -734,9 +1553,13 @@ class Mesh(FromToJson,
         key = self._get_vertex_key(key)
 
         if key not in self.vertex:
+            self._invalidate_topology()
             self.vertex[key] = {}
             self.halfedge[key] = {}
             self.edge[key] = {}
+            self._record('add', 'vertex', key)
+        elif set(attr) & set('xyz'):
+            self._record('move', 'vertex', key)
 
         self.vertex[key].update(attr)
 
@@ -798,22 +1621,33 @@ class Mesh(FromToJson,
         if len(vertices) < 3:
             return
 
+        self._invalidate_topology()
         keys = []
-        for key in vertices:
-            if key not in self.vertex:
-                key = self.add_vertex(key)
-            keys.append(key)
-
-        fkey = self._get_face_key(fkey)
-
-        self.face[fkey] = keys
-        self.facedata[fkey] = attr
-
-        for u, v in self._cycle_keys(keys):
-            self.halfedge[u][v] = fkey
-            if u not in self.halfedge[v]:
-                self.halfedge[v][u] = None
-
+        scope = self._begin_change(vertices)
+        try:
+            for key in vertices:
+                if key not in self.vertex:
+                    key = self.add_vertex(key)
+                keys.append(key)
+
+            fkey = self._get_face_key(fkey)
+
+            self.face[fkey] = keys
+            self.facedata[fkey] = attr
+
+            for u, v in self._cycle_keys(keys):
+                self.halfedge[u][v] = fkey
+                if u not in self.halfedge[v]:
+                    self.halfedge[v][u] = None
+                if u in self.edge and v in self.edge[u]:
+                    continue
+                if v in self.edge and u in self.edge[v]:
+                    continue
+                if u not in self.edge:
+                    self.edge[u] = {}
+                self.edge[u][v] = self.default_edge_attributes.copy()
+        finally:
+            self._end_change(scope, keys)
         return fkey
 
     def add_edge(self, u, v, attr_dict=None, **kwattr):
@@ -836,11 +1670,7 @@ class Mesh(FromToJson,
         -------
         None
             If adding the edge was unsuccessful.
-            This is the case when
-
-            * there is no corresponding half-edge present in the mesh, or
-            * the opposite edge already exists.
-
+            This is the case when there is no corresponding half-edge present in the mesh.
         tuple
             The identifiers of start and end vertex.
 
@@ -853,6 +1683,10 @@ class Mesh(FromToJson,
         The purpose of adding edges is to store information about the edges explicitly.
         For example, for form-finding algorithms.
 
+        Since the edges of the faces are created automatically, the edge will
+        usually exist already, in one of both directions. If the opposite edge
+        exists, it is reversed, and its attributes are updated.
+
         Examples
         --------
         >>>
@@ -866,15 +1700,15 @@ class Mesh(FromToJson,
         else:
             return
 
-        # check if the opposite edge already exists
-        if v in self.edge and u in self.edge[v]:
-            return
-
-        # add or update edge
-        if u not in self.edge:
-            self.edge[u] = {}
-        if v not in self.edge[u]:
-            self.edge[u][v] = {}
+        # add, reverse or update edge
+        if u not in self.edge or v not in self.edge[u]:
+            self._invalidate_topology()
+            if u not in self.edge:
+                self.edge[u] = {}
+            if v in self.edge and u in self.edge[v]:
+                self.edge[u][v] = self.edge[v].pop(u)
+            else:
+                self.edge[u][v] = {}
         attr = self._compile_eattr(attr_dict, kwattr)
         self.edge[u][v].update(attr)
 
@@ -938,23 +1772,32 @@ class Mesh(FromToJson,
             plotter.show()
 
         """
+        self._invalidate_topology()
         nbrs = self.vertex_neighbours(key)
-        for nbr in nbrs:
-            fkey = self.halfedge[key][nbr]
-            if fkey is None:
-                continue
-            for u, v in self.face_halfedges(fkey):
-                self.halfedge[u][v] = None
-            del self.face[fkey]
-        for nbr in nbrs:
-            del self.halfedge[nbr][key]
-        for nbr in nbrs:
-            for n in self.vertex_neighbours(nbr):
-                if self.halfedge[nbr][n] is None and self.halfedge[n][nbr] is None:
-                    del self.halfedge[nbr][n]
-                    del self.halfedge[n][nbr]
-        del self.halfedge[key]
-        del self.vertex[key]
+        scope = self._begin_change(nbrs + [key])
+        try:
+            for nbr in nbrs:
+                fkey = self.halfedge[key][nbr]
+                if fkey is None:
+                    continue
+                for u, v in self.face_halfedges(fkey):
+                    self.halfedge[u][v] = None
+                del self.face[fkey]
+            for nbr in nbrs:
+                del self.halfedge[nbr][key]
+                self._remove_edge(nbr, key)
+            for nbr in nbrs:
+                for n in self.vertex_neighbours(nbr):
+                    if self.halfedge[nbr][n] is None and self.halfedge[n][nbr] is None:
+                        del self.halfedge[nbr][n]
+                        del self.halfedge[n][nbr]
+                        self._remove_edge(nbr, n)
+            del self.halfedge[key]
+            del self.vertex[key]
+            if key in self.edge:
+                del self.edge[key]
+        finally:
+            self._end_change(scope)
 
     def insert_vertex(self, fkey, key=None, xyz=None, return_fkeys=False):
         """Insert a vertex in the specified face.
@@ -1005,11 +1848,17 @@ class Mesh(FromToJson,
             x, y, z = self.face_center(fkey)
         else:
             x, y, z = xyz
-        w = self.add_vertex(key=key, x=x, y=y, z=z)
+        w = None
+        scope = self._begin_change(self.face[fkey])
+        try:
+            w = self.add_vertex(key=key, x=x, y=y, z=z)
 
-        for u, v in self.face_halfedges(fkey):
-            fkeys.append(self.add_face([u, v, w]))
-        del self.face[fkey]
+            for u, v in self.face_halfedges(fkey):
+                fkeys.append(self.add_face([u, v, w]))
+            self._invalidate_topology()
+            del self.face[fkey]
+        finally:
+            self._end_change(scope, [w])
 
         if return_fkeys:
             return w, fkeys
@@ -1042,33 +1891,47 @@ class Mesh(FromToJson,
             plotter.show()
 
         """
-        for u, v in self.face_halfedges(fkey):
-            self.halfedge[u][v] = None
-            if self.halfedge[v][u] is None:
-                del self.halfedge[u][v]
-                del self.halfedge[v][u]
-        del self.face[fkey]
+        self._invalidate_topology()
+        scope = self._begin_change(self.face[fkey])
+        try:
+            for u, v in self.face_halfedges(fkey):
+                self.halfedge[u][v] = None
+                if self.halfedge[v][u] is None:
+                    del self.halfedge[u][v]
+                    del self.halfedge[v][u]
+                    self._remove_edge(u, v)
+            del self.face[fkey]
+        finally:
+            self._end_change(scope)
 
     def cull_vertices(self):
         """Remove all unused vertices from the mesh object.
         """
+        self._invalidate_topology()
         for u in list(self.vertices()):
             if u not in self.halfedge:
                 del self.vertex[u]
+                self._record('remove', 'vertex', u)
             else:
                 if not self.halfedge[u]:
                     del self.vertex[u]
                     del self.halfedge[u]
+                    self._record('remove', 'vertex', u)
+            if u not in self.halfedge and u in self.edge:
+                del self.edge[u]
 
     def cull_edges(self):
-        """Remove all unused edges from the mesh object."""
-        for u, v in list(self.edges()):
-            if u not in self.halfedge:
-                del self.edge[u][v]
-            if v not in self.halfedge[u]:
-                del self.edge[u][v]
-            if len(self.edge[u]) == 0:
-                del self.edge[u]
+        """Remove all unused edges from the mesh object.
+
+        Note
+        ----
+        The edges are normally kept in sync with the faces automatically.
+        This method is only needed after modifying the half-edges directly.
+        It also adds the edges that are missing.
+
+        """
+        self._invalidate_topology()
+        self._update_edges(list(self.edge) + [key for key in self.halfedge if key not in self.edge])
 
     # --------------------------------------------------------------------------
     # info
@@ -1080,7 +1943,7 @@ class Mesh(FromToJson,
 
     def number_of_edges(self):
         """Count the number of edges in the mesh."""
-        return len(list(self.edges()))
+        return sum(len(nbrs) for nbrs in self.edge.values())
 
     def number_of_faces(self):
         """Count the number of faces in the mesh."""
@@ -1344,14 +2207,15 @@ class Mesh(FromToJson,
         Note
         ----
         Mesh edges have no topological meaning. They are only used to store data.
-        Edges are not automatically created when vertices and faces are added to
-        the mesh. Instead, they are created when data is stored on them, or when
-        they are accessed using this method.
+        Edges are created automatically when faces are added to the mesh,
+        and removed when they are no longer part of any face.
 
         This method yields the directed edges of the mesh.
-        Unless edges were added explicitly using :meth:`add_edge` the order of
-        edges is *as they come out*. However, as long as the toplogy remains
-        unchanged, the order is consistent.
+        Every edge is yielded once, in the direction in which it is stored in the
+        edge dictionary. The edges are yielded in the order in which they were
+        created, and the order is consistent as long as the topology remains unchanged.
+
+        The list of edges is memoized against the topology :attr:`version` of the mesh.
 
         Example
         -------
@@ -1379,41 +2243,15 @@ class Mesh(FromToJson,
             plotter.show()
 
         """
-        edges = set()
-        for fkey in self.faces():
-            for u, v in self.face_halfedges(fkey):
-                if (u, v) in edges or (v, u) in edges:
-                    continue
-
-                edges.add((u, v))
-                edges.add((v, u))
+        for u, v in self._edges():
+            if data:
+                yield u, v, self.edge[u][v]
+            else:
+                yield u, v
 
-                if u in self.edge and v in self.edge[u]:
-                    # the edge (u, v) already exists in the edge dict
-                    if data:
-                        yield u, v, self.edge[u][v]
-                    else:
-                        yield u, v
-
-                elif v in self.edge and u in self.edge[v]:
-                    # the edge (v, u) already exists in the edge dict
-                    if data:
-                        yield v, u, self.edge[v][u]
-                    else:
-                        yield v, u
-
-                else:
-                    # the edge does not exist yet.
-                    # therefore create the edge and yield the result.
-                    if u not in self.edge:
-                        self.edge[u] = {}
-
-                    self.edge[u][v] = self.default_edge_attributes.copy()
-
-                    if data:
-                        yield u, v, self.edge[u][v]
-                    else:
-                        yield u, v
+    @memoize_topology
+    def _edges(self):
+        return [(u, v) for u in self.edge for v in self.edge[u]]
 
     def wireframe(self):
         """Iterate over the halfedges of the mesh.
@@ -1551,47 +2389,81 @@ class Mesh(FromToJson,
             plotter.show()
 
         """
-
-        temp = list(self.halfedge[key])
-
         if not ordered:
-            return temp
+            return list(self.halfedge[key])
 
-        if not temp:
-            return temp
+        index, offsets, nbrs, _ = self._vertex_rings()
+        i = index[key]
+        return nbrs[offsets[i]:offsets[i + 1]]
 
-        if len(temp) == 1:
-            return temp
+    @memoize_topology
+    def _vertex_rings(self):
+        """Compute the ordered neighbours and faces of all vertices.
 
-        # if one of the neighbours points to the *outside* face
-        # start there
-        # otherwise the starting point can be random
-        start = temp[0]
-        for nbr in temp:
-            if self.halfedge[key][nbr] is None:
-                start = nbr
-                break
-
-        # start in the opposite direction
-        # to avoid pointing at an *outside* face again
-        fkey = self.halfedge[start][key]
-        nbrs = [start]
-        count = 1000
+        Returns
+        -------
+        tuple
+            * A dict mapping vertex keys to indices.
+            * The offsets of the rings of the vertices, per index.
+            * The ordered neighbours of all vertices, one ring after the other.
+            * The faces (or ``None``) between each vertex and its neighbours,
+              aligned with the neighbours.
 
-        while count:
-            count -= 1
-            nbr = self.face_vertex_descendant(fkey, key)
-            fkey = self.halfedge[nbr][key]
+        Notes
+        -----
+        The rings are computed for all vertices at once, in O(H), with H the number
+        of half-edges, and cached until the topology of the mesh changes.
 
-            if nbr == start:
-                break
+        """
+        halfedge = self.halfedge
 
-            nbrs.append(nbr)
+        # the vertex after every vertex in the face of every incoming half-edge
+        # this is face_vertex_descendant for all faces at once
+        descendant = {key: {} for key in halfedge}
+        for vertices in self.face.values():
+            a, b = vertices[-2], vertices[-1]
+            for c in vertices:
+                descendant[b][a] = c
+                a, b = b, c
 
-            if fkey is None:
-                break
+        index = {}
+        offsets = [0]
+        nbrs = []
+        faces = []
 
-        return nbrs
+        for key in self.vertices():
+            index[key] = len(offsets) - 1
+            ring = list(halfedge[key])
+
+            if len(ring) > 1:
+                # if one of the neighbours points to the *outside* face
+                # start there
+                # otherwise the starting point can be random
+                start = ring[0]
+                for nbr in ring:
+                    if halfedge[key][nbr] is None:
+                        start = nbr
+                        break
+
+                # start in the opposite direction
+                # to avoid pointing at an *outside* face again
+                # a ring can not be longer than the number of neighbours
+                ring = [start]
+                nbr = start
+                following = descendant[key]
+                for _ in range(len(halfedge[key])):
+                    nbr = following.get(nbr)
+                    if nbr is None or nbr == start:
+                        break
+                    ring.append(nbr)
+                    if halfedge[nbr][key] is None:
+                        break
+
+            nbrs.extend(ring)
+            faces.extend(halfedge[key][nbr] for nbr in ring)
+            offsets.append(len(nbrs))
+
+        return index, offsets, nbrs, faces
 
     def vertex_neighbourhood(self, key, ring=1):
         """Return the vertices in the neighbourhood of a vertex.
@@ -1772,8 +2644,9 @@ class Mesh(FromToJson,
             faces = list(self.halfedge[key].values())
 
         else:
-            nbrs = self.vertex_neighbours(key, ordered=True)
-            faces = [self.halfedge[key][n] for n in nbrs]
+            index, offsets, _, faces = self._vertex_rings()
+            i = index[key]
+            faces = faces[offsets[i]:offsets[i + 1]]
 
         if include_none:
             return faces
@@ -2500,7 +3373,8 @@ class Mesh(FromToJson,
             The edges on the boundary.
 
         """
-        return [(u, v) for u, v in self.edges() if self.is_edge_on_boundary(u, v)]
+        halfedge = self.halfedge
+        return [(u, v) for u, v in self.edges() if halfedge[u][v] is None or halfedge[v][u] is None]
 
 
 # Mesh.collapse_edge = MethodType(mesh_collapse_edge, None, Mesh)
@@ -128,84 +128,92 @@ def mesh_collapse_edge(self, u, v, t=0.5, allow_boundary=False, fixed=None):
     if v in fixed or u in fixed:
         return False
 
-    # move U
-    x, y, z = self.edge_point(u, v, t)
-    self.vertex[u]['x'] = x
-    self.vertex[u]['y'] = y
-    self.vertex[u]['z'] = z
-
-    # UV face
-    fkey = self.halfedge[u][v]
-    face = self.face_vertices(fkey)
-    f = len(face)
-
-    # switch between UV face sizes
-    # note: in a triself this is not necessary!
-    if f < 3:
-        raise Exception("Invalid self face: {}".format(fkey))
-    if f == 3:
-        # delete UV
-        o = face[face.index(u) - 1]
-        del self.halfedge[u][v]
-        del self.halfedge[v][o]
-        del self.halfedge[o][u]
-        del self.face[fkey]
-    else:
-        # u > v > d => u > d
-        d = self.face_vertex_decendant(fkey, v)
-        face.remove(v)
-        del self.halfedge[u][v]
-        del self.halfedge[v][d]
-        self.halfedge[u][d] = fkey
-
-    # VU face
-    fkey = self.halfedge[v][u]
-    face = self.face[fkey]
-    f = len(face)
-
-    # switch between VU face sizes
-    # note: in a triself this is not necessary!
-    if f < 3:
-        raise Exception("Invalid mesh face: {}".format(fkey))
-    if f == 3:
-        # delete UV
-        o = face[face.index(v) - 1]
-        del self.halfedge[v][u]  # the collapsing halfedge
-        del self.halfedge[u][o]
-        del self.halfedge[o][v]
-        del self.face[fkey]
-    else:
-        # a > v > u => a > u
-        a = self.face_vertex_ancestor(fkey, v)
-        face.remove(v)
-        del self.halfedge[a][v]
-        del self.halfedge[v][u]
-        self.halfedge[a][u] = fkey
-
-    # V neighbours and halfedges coming into V
-    for nbr, fkey in list(self.halfedge[v].items()):
-        # a > v > nbr => a > u > nbr
+    self._invalidate_topology()
+
+    keys = set(self.halfedge[u]) | set(self.halfedge[v]) | set([u, v])
+    scope = self._begin_change(keys)
+    try:
+        # move U
+        x, y, z = self.edge_point(u, v, t)
+        self.vertex[u]['x'] = x
+        self.vertex[u]['y'] = y
+        self.vertex[u]['z'] = z
+
+        # UV face
+        fkey = self.halfedge[u][v]
+        face = self.face_vertices(fkey)
+        f = len(face)
+
+        # switch between UV face sizes
+        # note: in a triself this is not necessary!
+        if f < 3:
+            raise Exception("Invalid self face: {}".format(fkey))
+        if f == 3:
+            # delete UV
+            o = face[face.index(u) - 1]
+            del self.halfedge[u][v]
+            del self.halfedge[v][o]
+            del self.halfedge[o][u]
+            del self.face[fkey]
+        else:
+            # u > v > d => u > d
+            d = self.face_vertex_decendant(fkey, v)
+            face.remove(v)
+            del self.halfedge[u][v]
+            del self.halfedge[v][d]
+            self.halfedge[u][d] = fkey
+
+        # VU face
+        fkey = self.halfedge[v][u]
         face = self.face[fkey]
-        a = self.face_vertex_ancestor(fkey, v)
-        face[face.index(v)] = u
-
-        if v in self.halfedge[a]:
+        f = len(face)
+
+        # switch between VU face sizes
+        # note: in a triself this is not necessary!
+        if f < 3:
+            raise Exception("Invalid mesh face: {}".format(fkey))
+        if f == 3:
+            # delete UV
+            o = face[face.index(v) - 1]
+            del self.halfedge[v][u]  # the collapsing halfedge
+            del self.halfedge[u][o]
+            del self.halfedge[o][v]
+            del self.face[fkey]
+        else:
+            # a > v > u => a > u
+            a = self.face_vertex_ancestor(fkey, v)
+            face.remove(v)
             del self.halfedge[a][v]
-        del self.halfedge[v][nbr]
-        self.halfedge[a][u] = fkey
-        self.halfedge[u][nbr] = fkey
+            del self.halfedge[v][u]
+            self.halfedge[a][u] = fkey
+
+        # V neighbours and halfedges coming into V
+        for nbr, fkey in list(self.halfedge[v].items()):
+            # a > v > nbr => a > u > nbr
+            face = self.face[fkey]
+            a = self.face_vertex_ancestor(fkey, v)
+            face[face.index(v)] = u
 
-        # only update what will not be updated in the previous part
-        # verify what this is exactly
-        # nbr > v > d => nbr > u > d
-        if v in self.halfedge[nbr]:
-            fkey = self.halfedge[nbr][v]
-            del self.halfedge[nbr][v]
-            self.halfedge[nbr][u] = fkey
+            if v in self.halfedge[a]:
+                del self.halfedge[a][v]
+            del self.halfedge[v][nbr]
+            self.halfedge[a][u] = fkey
+            self.halfedge[u][nbr] = fkey
 
-    # delete V
-    del self.halfedge[v]
-    del self.vertex[v]
+            # only update what will not be updated in the previous part
+            # verify what this is exactly
+            # nbr > v > d => nbr > u > d
+            if v in self.halfedge[nbr]:
+                fkey = self.halfedge[nbr][v]
+                del self.halfedge[nbr][v]
+                self.halfedge[nbr][u] = fkey
+
+        # delete V
+        del self.halfedge[v]
+        del self.vertex[v]
+    finally:
+        self._end_change(scope)
+    self._update_edges(keys)
 
 
 # split this up into more efficient cases
@@ -322,88 +330,96 @@ def trimesh_collapse_edge(self, u, v, t=0.5, allow_boundary=False, fixed=None):
     if v in fixed or u in fixed:
         return False
 
-    # move U
-    x, y, z = self.edge_point(u, v, t)
-
-    self.vertex[u]['x'] = x
-    self.vertex[u]['y'] = y
-    self.vertex[u]['z'] = z
+    self._invalidate_topology()
 
-    # UV face
-    fkey = self.halfedge[u][v]
-
-    if fkey is None:
-        del self.halfedge[u][v]
-    else:
-        face = self.face[fkey]
+    keys = set(self.halfedge[u]) | set(self.halfedge[v]) | set([u, v])
+    scope = self._begin_change(keys)
+    try:
+        # move U
+        x, y, z = self.edge_point(u, v, t)
 
-        o = face[face.index(u) - 1]
+        self.vertex[u]['x'] = x
+        self.vertex[u]['y'] = y
+        self.vertex[u]['z'] = z
 
-        del self.halfedge[u][v]
-        del self.halfedge[v][o]
-        del self.halfedge[o][u]
-        del self.face[fkey]
+        # UV face
+        fkey = self.halfedge[u][v]
 
-        if len(self.halfedge[o]) < 2:
-            del self.halfedge[o]
-            del self.vertex[o]
-            del self.halfedge[u][o]
-
-    # VU face
-    fkey = self.halfedge[v][u]
-
-    if fkey is None:
-        del self.halfedge[v][u]
-    else:
-        face = self.face[fkey]
-
-        o = face[face.index(v) - 1]
+        if fkey is None:
+            del self.halfedge[u][v]
+        else:
+            face = self.face[fkey]
 
-        del self.halfedge[v][u]
-        del self.halfedge[u][o]
-        del self.halfedge[o][v]
-        del self.face[fkey]
+            o = face[face.index(u) - 1]
 
-        if len(self.halfedge[o]) < 2:
-            del self.halfedge[o]
-            del self.vertex[o]
+            del self.halfedge[u][v]
             del self.halfedge[v][o]
+            del self.halfedge[o][u]
+            del self.face[fkey]
+
+            if len(self.halfedge[o]) < 2:
+                del self.halfedge[o]
+                del self.vertex[o]
+                del self.halfedge[u][o]
 
-    # neighbourhood of V
-    for nbr, fkey in list(self.halfedge[v].items()):
+        # VU face
+        fkey = self.halfedge[v][u]
 
         if fkey is None:
-            self.halfedge[u][nbr] = None
-            del self.halfedge[v][nbr]
+            del self.halfedge[v][u]
         else:
-            # a > v > nbr => a > u > nbr
             face = self.face[fkey]
-            a = face[face.index(v) - 1]
-            self.face[fkey] = [a, u, nbr]
 
-            if v in self.halfedge[a]:
-                del self.halfedge[a][v]
-            del self.halfedge[v][nbr]
+            o = face[face.index(v) - 1]
 
-            self.halfedge[a][u] = fkey
-            self.halfedge[u][nbr] = fkey
-            self.halfedge[nbr][a] = fkey
-
-        # nbr > v > d => nbr > u > d
-        if v in self.halfedge[nbr]:
-            self.halfedge[nbr][u] = self.halfedge[nbr][v]
-            del self.halfedge[nbr][v]
-
-    # delete V
-    del self.halfedge[v]
-    del self.vertex[v]
-
-    # clean up
-    for nu in self.halfedge[u]:
-        for nbr in self.halfedge[nu]:
-            if nbr == v:
-                self.halfedge[nu][u] = self.halfedge[nu][v]
-                del self.halfedge[nu][v]
+            del self.halfedge[v][u]
+            del self.halfedge[u][o]
+            del self.halfedge[o][v]
+            del self.face[fkey]
+
+            if len(self.halfedge[o]) < 2:
+                del self.halfedge[o]
+                del self.vertex[o]
+                del self.halfedge[v][o]
+
+        # neighbourhood of V
+        for nbr, fkey in list(self.halfedge[v].items()):
+
+            if fkey is None:
+                self.halfedge[u][nbr] = None
+                del self.halfedge[v][nbr]
+            else:
+                # a > v > nbr => a > u > nbr
+                face = self.face[fkey]
+                a = face[face.index(v) - 1]
+                self.face[fkey] = [a, u, nbr]
+
+                if v in self.halfedge[a]:
+                    del self.halfedge[a][v]
+                del self.halfedge[v][nbr]
+
+                self.halfedge[a][u] = fkey
+                self.halfedge[u][nbr] = fkey
+                self.halfedge[nbr][a] = fkey
+
+            # nbr > v > d => nbr > u > d
+            if v in self.halfedge[nbr]:
+                self.halfedge[nbr][u] = self.halfedge[nbr][v]
+                del self.halfedge[nbr][v]
+
+        # delete V
+        del self.halfedge[v]
+        del self.vertex[v]
+
+        # clean up
+        for nu in self.halfedge[u]:
+            for nbr in self.halfedge[nu]:
+                if nbr == v:
+                    self.halfedge[nu][u] = self.halfedge[nu][v]
+                    del self.halfedge[nu][v]
+    finally:
+        self._end_change(scope)
+    self._update_edges(keys)
 
     return True
 
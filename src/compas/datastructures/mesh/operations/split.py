@@ -55,31 +55,40 @@ def mesh_split_edge(self, u, v, t=0.5, allow_boundary=False):
         if fkey_uv is None or fkey_vu is None:
             return
 
-    # coordinates
-    x, y, z = self.edge_point(u, v, t)
+    self._invalidate_topology()
 
-    # the split vertex
-    w = self.add_vertex(x=x, y=y, z=z)
+    w = None
+    scope = self._begin_change([u, v])
+    try:
+        # coordinates
+        x, y, z = self.edge_point(u, v, t)
 
-    # split half-edge UV
-    self.halfedge[u][w] = fkey_uv
-    self.halfedge[w][v] = fkey_uv
-    del self.halfedge[u][v]
+        # the split vertex
+        w = self.add_vertex(x=x, y=y, z=z)
 
-    # update the UV face if it is not the `None` face
-    if fkey_uv is not None:
-        j = self.face[fkey_uv].index(v)
-        self.face[fkey_uv].insert(j, w)
+        # split half-edge UV
+        self.halfedge[u][w] = fkey_uv
+        self.halfedge[w][v] = fkey_uv
+        del self.halfedge[u][v]
+
+        # update the UV face if it is not the `None` face
+        if fkey_uv is not None:
+            j = self.face[fkey_uv].index(v)
+            self.face[fkey_uv].insert(j, w)
+
+        # split half-edge VU
+        self.halfedge[v][w] = fkey_vu
+        self.halfedge[w][u] = fkey_vu
+        del self.halfedge[v][u]
 
-    # split half-edge VU
-    self.halfedge[v][w] = fkey_vu
-    self.halfedge[w][u] = fkey_vu
-    del self.halfedge[v][u]
+        # update the VU face if it is not the `None` face
+        if fkey_vu is not None:
+            i = self.face[fkey_vu].index(u)
+            self.face[fkey_vu].insert(i, w)
 
-    # update the VU face if it is not the `None` face
-    if fkey_vu is not None:
-        i = self.face[fkey_vu].index(u)
-        self.face[fkey_vu].insert(i, w)
+        self._update_edges([u, v, w])
+    finally:
+        self._end_change(scope, [w])
 
     return w
 
@@ -143,37 +152,46 @@ def trimesh_split_edge(self, u, v, t=0.5, allow_boundary=False):
         if fkey_uv is None or fkey_vu is None:
             return
 
-    # coordinates
-    x, y, z = self.edge_point(u, v, t)
-
-    # the split vertex
-    w = self.add_vertex(x=x, y=y, z=z)
-
-    # the UV face
-    if fkey_uv is None:
-        self.halfedge[u][w] = None
-        self.halfedge[w][v] = None
-        del self.halfedge[u][v]
-    else:
-        face = self.face[fkey_uv]
-        o = face[face.index(u) - 1]
-        self.add_face([u, w, o])
-        self.add_face([w, v, o])
-        del self.halfedge[u][v]
-        del self.face[fkey_uv]
-
-    # the VU face
-    if fkey_vu is None:
-        self.halfedge[v][w] = None
-        self.halfedge[w][u] = None
-        del self.halfedge[v][u]
-    else:
-        face = self.face[fkey_vu]
-        o = face[face.index(v) - 1]
-        self.add_face([v, w, o])
-        self.add_face([w, u, o])
-        del self.halfedge[v][u]
-        del self.face[fkey_vu]
+    self._invalidate_topology()
+
+    w = None
+    scope = self._begin_change([u, v])
+    try:
+        # coordinates
+        x, y, z = self.edge_point(u, v, t)
+
+        # the split vertex
+        w = self.add_vertex(x=x, y=y, z=z)
+
+        # the UV face
+        if fkey_uv is None:
+            self.halfedge[u][w] = None
+            self.halfedge[w][v] = None
+            del self.halfedge[u][v]
+        else:
+            face = self.face[fkey_uv]
+            o = face[face.index(u) - 1]
+            self.add_face([u, w, o])
+            self.add_face([w, v, o])
+            del self.halfedge[u][v]
+            del self.face[fkey_uv]
+
+        # the VU face
+        if fkey_vu is None:
+            self.halfedge[v][w] = None
+            self.halfedge[w][u] = None
+            del self.halfedge[v][u]
+        else:
+            face = self.face[fkey_vu]
+            o = face[face.index(v) - 1]
+            self.add_face([v, w, o])
+            self.add_face([w, u, o])
+            del self.halfedge[v][u]
+            del self.face[fkey_vu]
+
+        self._update_edges([u, v, w])
+    finally:
+        self._end_change(scope, [w])
 
     # return the key of the split vertex
     return w
@@ -206,10 +224,15 @@ def mesh_split_face(self, fkey, u, v):
         f = face[i:] + face[:j + 1]
         g = face[j:i + 1]
 
-    f = self.add_face(f)
-    g = self.add_face(g)
+    self._invalidate_topology()
+    scope = self._begin_change(face)
+    try:
+        f = self.add_face(f)
+        g = self.add_face(g)
 
-    del self.face[fkey]
+        del self.face[fkey]
+    finally:
+        self._end_change(scope)
 
     return f, g
 
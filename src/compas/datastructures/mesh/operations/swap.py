@@ -50,18 +50,25 @@ def trimesh_swap_edge(self, u, v, allow_boundary=True):
     if o_uv in self.halfedge[o_vu] and o_vu in self.halfedge[o_uv]:
         return
 
-    # swap
-    # delete the current half-edge
-    del self.halfedge[u][v]
-    del self.halfedge[v][u]
-
-    # delete the adjacent faces
-    del self.face[fkey_uv]
-    del self.face[fkey_vu]
-
-    # add the faces created by the swap
-    a = self.add_face([o_uv, o_vu, v])
-    b = self.add_face([o_vu, o_uv, u])
+    self._invalidate_topology()
+    scope = self._begin_change([u, v, o_uv, o_vu])
+    try:
+        # swap
+        # delete the current half-edge
+        del self.halfedge[u][v]
+        del self.halfedge[v][u]
+
+        # delete the adjacent faces
+        del self.face[fkey_uv]
+        del self.face[fkey_vu]
+
+        # add the faces created by the swap
+        a = self.add_face([o_uv, o_vu, v])
+        b = self.add_face([o_vu, o_uv, u])
+
+        self._update_edges([u, v])
+    finally:
+        self._end_change(scope)
 
     return a, b
 
@@ -57,26 +57,33 @@ def mesh_unweld_vertices(self, fkey, where=None):
         plotter.show()
 
     """
+    self._invalidate_topology()
+
     face = []
     vertices = self.face_vertices(fkey)
-
-    if not where:
-        where = vertices
-
-    for key in vertices:
-        if key in where:
-            x, y, z = self.vertex_coordinates(key)
-            key = self.add_vertex(x=x, y=y, z=z)
-        face.append(key)
-
-    self.add_face(face)
-
-    for key in where:
-        d = self.face_vertex_descendant(fkey, key)
-        a = self.face_vertex_ancestor(fkey, key)
-        self.halfedge[a][key] = None
-        self.halfedge[key][d] = None
-    del self.face[fkey]
+    scope = self._begin_change(vertices)
+    try:
+        if not where:
+            where = vertices
+
+        for key in vertices:
+            if key in where:
+                x, y, z = self.vertex_coordinates(key)
+                key = self.add_vertex(x=x, y=y, z=z)
+            face.append(key)
+
+        self.add_face(face)
+
+        for key in where:
+            d = self.face_vertex_descendant(fkey, key)
+            a = self.face_vertex_ancestor(fkey, key)
+            self.halfedge[a][key] = None
+            self.halfedge[key][d] = None
+        del self.face[fkey]
+
+        self._update_edges(vertices)
+    finally:
+        self._end_change(scope, face)
 
 
 # ==============================================================================
@@ -71,6 +71,9 @@ class FaceNetwork(FaceHelpers,
 
     """
 
+    _binary_tables = Network._binary_tables + (('face', 1), ('facedata', 1))
+    _binary_scalars = Network._binary_scalars + ('default_face_attributes', '_max_int_fkey')
+
     def __init__(self):
         super(FaceNetwork, self).__init__()
         self._max_int_fkey = -1
@@ -7,7 +7,11 @@ from ast import literal_eval
 
 import compas
 
+from compas.files import DXF
 from compas.files import OBJ
+from compas.files import OBJWriter
+from compas.files import PLYwriter
+from compas.files import read_arrays
 
 from compas.utilities import geometric_key
 
@@ -30,6 +34,7 @@ from compas.datastructures._mixins import EdgeFilter
 
 from compas.datastructures._mixins import FromToData
 from compas.datastructures._mixins import FromToJson
+from compas.datastructures._mixins import FromToBinary
 
 from compas.datastructures.network.operations import network_split_edge
 
@@ -45,6 +50,7 @@ __all__ = ['Network', ]
 
 class Network(FromToJson,
               FromToData,
+              FromToBinary,
               EdgeGeometry,
               EdgeHelpers,
               VertexHelpers,
@@ -105,6 +111,12 @@ class Network(FromToJson,
 
     split_edge = network_split_edge
 
+    _binary_tables = (('vertex', 1), ('edge', 2), ('halfedge', 2))
+    _binary_scalars = ('attributes',
+                       'default_vertex_attributes',
+                       'default_edge_attributes',
+                       '_max_int_key')
+
     def __init__(self):
         super(Network, self).__init__()
         self._key_to_str = False
@@ -297,8 +309,95 @@ network: {0}
         return network
 
     @classmethod
-    def from_lines(cls, lines, precision='3f'):
+    def from_file(cls, filepath, format=None, **kwargs):
+        """Construct a network from the edges in a file of any registered format.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+        format : str, optional
+            The name of the format.
+            Default is ``None``, in which case the format is derived from the
+            first bytes of the file or its extension.
+        kwargs : dict, optional
+            Options of the reader of the format.
+
+        Raises
+        ------
+        ValueError
+            If the file does not contain edges.
+
+        See Also
+        --------
+        * :func:`compas.files.read_arrays`
+        * :func:`compas.files.register_format`
+
+        """
+        data = read_arrays(filepath, format=format, **kwargs)
+        if not len(data.get('edges', ())):
+            raise ValueError('The file has no edges: {}'.format(filepath))
+        vertices = data['vertices']
+        edges = data['edges']
+        if hasattr(vertices, 'tolist'):
+            vertices = vertices.tolist()
+        if hasattr(edges, 'tolist'):
+            edges = edges.tolist()
+        network = cls()
+        for u, v in edges:
+            for key in (u, v):
+                if key not in network.vertex:
+                    x, y, z = vertices[key]
+                    network.add_vertex(key, x=x, y=y, z=z)
+            network.add_edge(u, v)
+        return network
+
+    @classmethod
+    def from_dxf(cls, filepath, precision='3f', tolerance=None):
+        """Construct a network from the lines and polylines of a DXF file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file.
+        precision : str, optional
+            The precision of the geometric keys used to merge the end points.
+            Default is ``'3f'``.
+        tolerance : float, optional
+            If provided, end points closer than this distance are merged
+            with :func:`compas.geometry.weld_points_numpy` instead.
+
+        Notes
+        -----
+        The entities are streamed from the file with a :class:`compas.files.DXFReader`.
+        Polylines are split into their segments.
+        Faces are ignored.
+
+        """
+        network  = cls()
+        dxf      = DXF(filepath, precision=precision, tolerance=tolerance)
+        vertices = dxf.parser.vertices
+        edges    = dxf.parser.lines
+        for u, v in edges:
+            for key in (u, v):
+                if key not in network.vertex:
+                    x, y, z = vertices[key]
+                    network.add_vertex(key, x=x, y=y, z=z)
+            network.add_edge(u, v)
+        return network
+
+    @classmethod
+    def from_lines(cls, lines, precision='3f', tolerance=None):
         network = cls()
+        if tolerance is not None:
+            from compas.geometry import weld_points_numpy
+            points = [point for line in lines for point in line[:2]]
+            vertices, index = weld_points_numpy(points, tolerance)
+            for i, (x, y, z) in enumerate(vertices.tolist()):
+                network.add_vertex(i, x=x, y=y, z=z)
+            for i, j in index.reshape((-1, 2)).tolist():
+                network.add_edge(i, j)
+            return network
         edges   = []
         vertex  = {}
         for line in lines:
@@ -332,8 +431,35 @@ network: {0}
     # converters
     # --------------------------------------------------------------------------
 
-    def to_obj(self):
-        raise NotImplementedError
+    def to_obj(self, filepath, precision='3f'):
+        """Write the network to an OBJ file, with the edges as lines.
+
+        Parameters
+        ----------
+        filepath : str
+            Full path of the file.
+        precision : str, optional
+            The format specification of the coordinates.
+            Default is ``'3f'``.
+
+        """
+        vertices, edges = self.to_vertices_and_edges()
+        OBJWriter(filepath, vertices, lines=edges, precision=precision).write()
+
+    def to_ply(self, filepath, binary=True):
+        """Write the network to a PLY file, with an edge element.
+
+        Parameters
+        ----------
+        filepath : str
+            Full path of the file.
+        binary : bool, optional
+            Write a binary little-endian file instead of an ASCII file.
+            Default is ``True``.
+
+        """
+        vertices, edges = self.to_vertices_and_edges()
+        PLYwriter(filepath, vertices, edges=edges, binary=binary).write()
 
     def to_points(self, axes='xyz'):
         return [self.vertex_coordinates(key, axes) for key in self.vertices()]
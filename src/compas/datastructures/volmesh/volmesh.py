@@ -26,6 +26,7 @@ from compas.datastructures._mixins import FaceHelpers
 
 from compas.datastructures._mixins import FromToData
 from compas.datastructures._mixins import FromToJson
+from compas.datastructures._mixins import FromToBinary
 
 
 __author__     = ['Tom Van Mele', ]
@@ -53,6 +54,7 @@ def center_of_mass(edges, sqrt=sqrt):
 
 class VolMesh(FromToData,
               FromToJson,
+              FromToBinary,
               FaceHelpers,
               EdgeHelpers,
               VertexHelpers,
@@ -113,6 +115,14 @@ class VolMesh(FromToData,
 
     """
 
+    _binary_tables = (('vertex', 1), ('edge', 2), ('halfface', 2), ('plane', 3), ('cell', 3))
+    _binary_scalars = ('attributes',
+                       'default_vertex_attributes',
+                       'default_edge_attributes',
+                       '_max_int_key',
+                       '_max_int_fkey',
+                       '_max_int_ckey')
+
     def __init__(self):
         self._max_int_key  = -1
         self._max_int_fkey = -1
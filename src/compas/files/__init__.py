@@ -14,7 +14,27 @@ manufacturing processes, CAD interoperability, ...
 amf
 ===
 
-*Under construction...*
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    AMF
+    AMFReader
+    AMFWriter
+
+
+binary
+======
+
+A container format for arrays, with a JSON header.
+It is used for the binary serialisation of data structures.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    read_binary
+    write_binary
 
 
 dxf
@@ -34,7 +54,12 @@ dxf
 las
 ===
 
-*Under construction...*
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    LAS
+    LASReader
 
 
 obj
@@ -46,6 +71,7 @@ obj
 
     OBJ
     OBJReader
+    OBJStreamReader
     OBJParser
     OBJComposer
     OBJWriter
@@ -59,28 +85,60 @@ ply
     :nosignatures:
 
     PLYreader
+    PLYcomposer
+    PLYwriter
+
+
+registry
+========
+
+File formats are registered with their extensions and magic bytes,
+and with a function that reads a file into arrays.
+The reader modules are only imported when a file of their format is read.
+This is how :meth:`compas.datastructures.Mesh.from_file` and
+:meth:`compas.datastructures.Network.from_file` find the reader of a file.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    register_format
+    get_format
+    find_format
+    read_arrays
 
 
 stl
 ===
 
-*Under construction...*
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    STL
+    STLReader
+    STLParser
+    STLWriter
 
 
 """
 
 from .amf import *
+from .binary import *
 from .dxf import *
 from .las import *
 from .obj import *
 from .ply import *
+from .registry import *
 from .stl import *
 
 from .amf import __all__ as a
+from .binary import __all__ as g
 from .dxf import __all__ as b
 from .las import __all__ as c
 from .obj import __all__ as d
 from .ply import __all__ as e
+from .registry import __all__ as h
 from .stl import __all__ as f
 
-__all__ = a + b + c + d + e + f
+__all__ = a + b + c + d + e + f + g + h
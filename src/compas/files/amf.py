@@ -2,6 +2,13 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import os
+import tempfile
+import zipfile
+
+from array import array
+from xml.etree import ElementTree
+
 
 __author__    = ['Tom Van Mele', ]
 __copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
@@ -9,26 +16,203 @@ __license__   = 'MIT License'
 __email__     = 'vanmelet@ethz.ch'
 
 
-__all__ = []
+__all__ = [
+    'AMF',
+    'AMFReader',
+    'AMFWriter',
+]
+
+
+def _tag(element):
+    # the tag of an element without its namespace
+    return element.tag.rsplit('}', 1)[-1]
 
 
 class AMF(object):
     """File format for additive manufacturing processes.
 
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
     See Also
     --------
     * https://en.wikipedia.org/wiki/Additive_Manufacturing_File_Format
 
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, filepath):
+        self.reader = AMFReader(filepath)
+
+
+class AMFReader(object):
+    """Read the vertices and triangles of a plain or zipped *amf* file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
+    Attributes
+    ----------
+    unit : str
+        The unit of the coordinates.
+    vertices : array
+        The coordinates of the vertices of all objects (n x 3).
+    faces : array
+        The vertex indices of the triangles of all objects (m x 3).
+    objects : list
+        Per object, its id and the index of its first vertex and first triangle.
+
+    Notes
+    -----
+    The XML is parsed incrementally with :func:`xml.etree.ElementTree.iterparse`.
+    Every ``vertex`` and ``triangle`` element is cleared as soon as it is read,
+    and its values are appended to flat typed arrays, such that the document
+    tree is never held in memory.
+    The vertex indices of the triangles are local to their object in the file,
+    and are offset to index into the vertices of all objects.
+
+    A zipped file is decompressed while it is parsed.
+
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.unit = None
+        self.vertices = None
+        self.faces = None
+        self.objects = []
+        self.read()
 
     def read(self):
-        pass
+        if zipfile.is_zipfile(self.filepath):
+            with zipfile.ZipFile(self.filepath) as archive:
+                with archive.open(archive.namelist()[0]) as fh:
+                    self.parse(fh)
+        else:
+            with open(self.filepath, 'rb') as fh:
+                self.parse(fh)
+
+    def parse(self, fh):
+        from numpy import array as asarray
+
+        coordinates = array('d')
+        indices = array('l')
+        self.objects = []
+        offset = 0
+        stack = []
+        for event, element in ElementTree.iterparse(fh, events=('start', 'end')):
+            tag = _tag(element)
+            if event == 'start':
+                stack.append(element)
+                if tag == 'amf':
+                    self.unit = element.get('unit', 'millimeter')
+                elif tag == 'object':
+                    offset = len(coordinates) // 3
+                    self.objects.append((element.get('id'), offset, len(indices) // 3))
+                continue
+            stack.pop()
+            if tag == 'vertex':
+                values = dict((_tag(child), child.text) for child in element.iter())
+                coordinates.extend([float(values.get(name) or 0.0) for name in 'xyz'])
+            elif tag == 'triangle':
+                values = dict((_tag(child), child.text) for child in element)
+                indices.extend([offset + int(values[name]) for name in ('v1', 'v2', 'v3')])
+            else:
+                continue
+            # drop the element and its processed siblings
+            stack[-1].clear()
+        self.vertices = asarray(coordinates, dtype=float).reshape((-1, 3))
+        self.faces = asarray(indices, dtype=int).reshape((-1, 3))
+
+
+class AMFWriter(object):
+    """Write vertices and faces to a plain or zipped *amf* file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    vertices : sequence
+        The XYZ coordinates of the vertices.
+    faces : sequence
+        The faces, as lists of indices into the vertices.
+        Faces with more than three vertices are triangulated as fans.
+    unit : str, optional
+        The unit of the coordinates. Default is ``'millimeter'``.
+    compress : bool, optional
+        Write a zip archive containing the file. Default is ``False``.
+
+    Notes
+    -----
+    The elements are formatted in blocks and written to the file block by block,
+    such that the complete document is never held in memory.
+    A compressed file is written to a temporary file first, which is then added to the archive.
+
+    Examples
+    --------
+    >>> AMFWriter('part.amf', vertices, faces, compress=True).write()
+
+    """
+
+    def __init__(self, filepath, vertices, faces, unit='millimeter', compress=False):
+        self.filepath = filepath
+        self.vertices = vertices
+        self.faces = faces
+        self.unit = unit
+        self.compress = compress
+        self.blocksize = 2 ** 16
+
+    def _blocks(self, rows):
+        for i in range(0, len(rows), self.blocksize):
+            block = rows[i:i + self.blocksize]
+            if hasattr(block, 'tolist'):
+                block = block.tolist()
+            yield block
+
+    def compose(self):
+        """Generate the contents of the file.
+
+        Yields
+        ------
+        bytes
+            The next block of the document.
+
+        """
+        vertex = '<vertex><coordinates><x>{!r}</x><y>{!r}</y><z>{!r}</z></coordinates></vertex>\n'
+        triangle = '<triangle><v1>{}</v1><v2>{}</v2><v3>{}</v3></triangle>\n'
+        yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<amf unit="{}">\n<object id="0">\n<mesh>\n<vertices>\n').format(self.unit).encode('utf-8')
+        for block in self._blocks(self.vertices):
+            yield (vertex * len(block)).format(*[float(c) for xyz in block for c in xyz[:3]]).encode('utf-8')
+        yield b'</vertices>\n<volume>\n'
+        for block in self._blocks(self.faces):
+            corners = [int(face[i]) for face in block for j in range(1, len(face) - 1) if face[j + 1] >= 0 for i in (0, j, j + 1)]
+            yield (triangle * (len(corners) // 3)).format(*corners).encode('utf-8')
+        yield b'</volume>\n</mesh>\n</object>\n</amf>\n'
+
+    def _write(self, filepath):
+        with open(filepath, 'wb') as fh:
+            for block in self.compose():
+                fh.write(block)
 
     def write(self):
-        pass
+        if not self.compress:
+            self._write(self.filepath)
+            return
+        # the document is written to a temporary file first
+        # because ZipFile.open can only write from Python 3.6
+        name = os.path.splitext(os.path.basename(self.filepath))[0] + '.amf'
+        handle, temp = tempfile.mkstemp(suffix='.amf')
+        os.close(handle)
+        try:
+            self._write(temp)
+            with zipfile.ZipFile(self.filepath, 'w', zipfile.ZIP_DEFLATED) as archive:
+                archive.write(temp, name)
+        finally:
+            os.remove(temp)
 
 
 # ==============================================================================
@@ -36,4 +220,16 @@ class AMF(object):
 # ==============================================================================
 
 if __name__ == "__main__":
-    pass
+
+    vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]]
+    faces = [[0, 1, 2, 3]]
+
+    filepath = os.path.join(tempfile.gettempdir(), 'quad.amf')
+
+    AMFWriter(filepath, vertices, faces, compress=True).write()
+
+    amf = AMF(filepath)
+
+    print(amf.reader.unit)
+    print(amf.reader.vertices)
+    print(amf.reader.faces)
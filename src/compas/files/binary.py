@@ -0,0 +1,184 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import json
+import struct
+
+
+__author__    = ['Tom Van Mele', ]
+__copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
+__license__   = 'MIT License'
+__email__     = 'vanmelet@ethz.ch'
+
+
+__all__ = [
+    'read_binary',
+    'write_binary',
+]
+
+
+MAGIC = b'COMPASB1'
+
+ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_binary(filepath, header, arrays):
+    """Write a JSON header and a collection of arrays to a binary container file.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the file.
+    header : dict
+        JSON-serialisable data.
+    arrays : dict
+        A dict of NumPy arrays with string keys.
+        Arrays of objects are not supported.
+
+    Raises
+    ------
+    ValueError
+        If one of the arrays is an array of objects.
+
+    Notes
+    -----
+    The file starts with the 8 bytes ``COMPASB1``, followed by the length of the
+    header as an unsigned little-endian 64-bit integer, and the header itself,
+    encoded as UTF-8 JSON. The header contains the provided data and the dtype,
+    shape and offset of every array.
+
+    The arrays follow the header, as raw little-endian data in C order.
+    Every array starts at a multiple of 64 bytes, such that it can be mapped
+    into memory without copying (see :func:`read_binary`).
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> write_binary('points.bin', {'name': 'points'}, {'xyz': np.random.rand(10, 3)})
+    >>> header, arrays = read_binary('points.bin')
+    >>> arrays['xyz'].shape
+    (10, 3)
+
+    """
+    from numpy import ascontiguousarray
+
+    prepared = []
+    descriptors = {}
+    offset = 0
+    for name, array in arrays.items():
+        if array.dtype.kind == 'O':
+            raise ValueError('Arrays of objects can not be stored: {}'.format(name))
+        dtype = array.dtype.newbyteorder('<')
+        array = ascontiguousarray(array, dtype=dtype)
+        offset = _aligned(offset)
+        descriptors[name] = {'dtype': dtype.str, 'shape': list(array.shape), 'offset': offset}
+        prepared.append((offset, array))
+        offset += array.nbytes
+
+    data = json.dumps({'header': header, 'arrays': descriptors}).encode('utf-8')
+    start = _aligned(len(MAGIC) + 8 + len(data))
+
+    with open(filepath, 'wb') as fh:
+        fh.write(MAGIC)
+        fh.write(struct.pack('<Q', len(data)))
+        fh.write(data)
+        position = len(MAGIC) + 8 + len(data)
+        for offset, array in prepared:
+            fh.write(b'\x00' * (start + offset - position))
+            fh.write(array.data if array.nbytes else b'')
+            position = start + offset + array.nbytes
+
+
+def read_binary(filepath, mmap=True, mode='r'):
+    """Read the header and arrays of a binary container file.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the file.
+    mmap : bool, optional
+        Map the arrays into memory instead of reading them.
+        Default is ``True``.
+    mode : {'r', 'c', 'r+'}, optional
+        The access mode of memory-mapped arrays.
+        With ``'c'`` (copy-on-write), the arrays can be modified without
+        affecting the file.
+        Default is ``'r'``.
+
+    Returns
+    -------
+    tuple
+        The header data and a dict of arrays.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a binary container file.
+
+    Notes
+    -----
+    Memory-mapped arrays are read from disk only when (and as far as) their
+    data is accessed. Opening a file with ``mmap=True`` is therefore cheap,
+    regardless of its size.
+
+    See Also
+    --------
+    * :func:`write_binary`
+
+    """
+    from numpy import dtype as _dtype
+    from numpy import empty
+    from numpy import fromfile
+    from numpy import memmap
+
+    with open(filepath, 'rb') as fh:
+        magic = fh.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError('Not a binary container file: {}'.format(filepath))
+        size, = struct.unpack('<Q', fh.read(8))
+        data = json.loads(fh.read(size).decode('utf-8'))
+        start = _aligned(len(MAGIC) + 8 + size)
+
+        arrays = {}
+        for name, descriptor in data['arrays'].items():
+            dtype = _dtype(descriptor['dtype'])
+            shape = tuple(descriptor['shape'])
+            count = 1
+            for dim in shape:
+                count *= dim
+            if not count:
+                arrays[name] = empty(shape, dtype=dtype)
+            elif mmap:
+                arrays[name] = memmap(filepath, dtype=dtype, mode=mode, offset=start + descriptor['offset'], shape=shape)
+            else:
+                fh.seek(start + descriptor['offset'])
+                arrays[name] = fromfile(fh, dtype=dtype, count=count).reshape(shape)
+
+    return data['header'], arrays
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import os
+    import tempfile
+
+    import numpy as np
+
+    filepath = os.path.join(tempfile.gettempdir(), 'points.bin')
+
+    write_binary(filepath, {'name': 'points'}, {'xyz': np.random.rand(10, 3), 'ids': np.arange(10)})
+
+    header, arrays = read_binary(filepath)
+
+    print(header)
+    print(arrays['xyz'])
+    print(arrays['ids'])
@@ -3,6 +3,10 @@ from __future__ import absolute_import
 from __future__ import division
 
 
+from compas.utilities import geometric_key
+from compas.utilities import pairwise
+
+
 __author__    = ['Tom Van Mele', ]
 __copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
 __license__   = 'MIT License'
@@ -21,6 +25,18 @@ __all__ = [
 class DXF(object):
     """Drawing Exchange Format.
 
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    precision : str, optional
+        The precision of the geometric keys used to identify duplicate vertices.
+        Default is ``'3f'``.
+    tolerance : float, optional
+        If provided, duplicate vertices are identified with
+        :func:`compas.geometry.weld_points_numpy` instead.
+        Default is ``None``.
+
     See Also
     --------
     * https://en.wikipedia.org/wiki/AutoCAD_DXF
@@ -29,30 +45,270 @@ class DXF(object):
 
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, filepath, precision=None, tolerance=None):
+        self.reader = DXFReader(filepath)
+        self.parser = DXFParser(self.reader, precision=precision, tolerance=tolerance)
 
-    def read(self):
-        pass
 
-    def write(self):
-        pass
+def _point(values, i):
+    # the coordinates of the point with group codes 1i, 2i, 3i
+    return [values.get(10 + i, 0.0), values.get(20 + i, 0.0), values.get(30 + i, 0.0)]
 
 
 class DXFReader(object):
-    """"""
+    """Read the geometric entities of a *dxf* file, one at a time.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
+    Notes
+    -----
+    The file is read as a stream of pairs of group codes and values.
+    Only the entity that is being read is kept in memory,
+    and every entity is yielded as soon as it is complete.
+
+    The following entities of the ``ENTITIES`` section are supported.
+
+    * ``LINE``: the start and end point.
+    * ``LWPOLYLINE``: the points, at the elevation of the polyline.
+    * ``POLYLINE``: the points of the ``VERTEX`` entities that follow it.
+      Polyface meshes are yielded as ``POLYFACE``, with the points and the faces.
+    * ``3DFACE``: the three or four corners.
+
+    Other entities are skipped.
+
+    Examples
+    --------
+    >>> reader = DXFReader('network.dxf')
+    >>> for entity in reader.iter_entities():
+    ...     print(entity['type'], entity['points'])
+
+    """
 
     def __init__(self, filepath):
         self.filepath = filepath
 
-    def read(self):
-        with open(self.filepath, 'rb') as fp:
-            for line in fp:
-                print(line.strip())
+    def iter_pairs(self):
+        """Iterate over the group codes and values of the file.
+
+        Yields
+        ------
+        tuple
+            The group code (int) and the value (str).
+
+        """
+        with open(self.filepath, 'rb') as fh:
+            for line in fh:
+                code = int(line)
+                value = next(fh, b'').strip().decode('utf-8', 'replace')
+                yield code, value
+
+    def iter_raw(self):
+        """Iterate over the entities of the ``ENTITIES`` section.
+
+        Yields
+        ------
+        tuple
+            The type of the entity and a list of its group codes and values.
+
+        """
+        section = None
+        name = None
+        data = []
+        for code, value in self.iter_pairs():
+            if code == 0:
+                if section == 'ENTITIES' and name is not None:
+                    yield name, data
+                name = None
+                data = []
+                if value == 'ENDSEC':
+                    section = None
+                elif value == 'EOF':
+                    break
+                elif value != 'SECTION' and section == 'ENTITIES':
+                    name = value
+            elif code == 2 and section is None and name is None:
+                section = value
+            elif name is not None:
+                data.append((code, value))
+
+    def iter_entities(self):
+        """Iterate over the supported entities of the file.
+
+        Yields
+        ------
+        dict
+            An entity, with its ``type``, ``layer`` and ``points``,
+            whether it is ``closed``, and, for polyface meshes, its ``faces``.
+
+        """
+        polyline = None
+        for name, data in self.iter_raw():
+            if polyline is not None:
+                if name == 'VERTEX':
+                    self._read_vertex(polyline, data)
+                    continue
+                yield polyline
+                polyline = None
+                if name == 'SEQEND':
+                    continue
+            if name == 'LINE':
+                yield self._read_line(data)
+            elif name == 'LWPOLYLINE':
+                yield self._read_lwpolyline(data)
+            elif name == 'POLYLINE':
+                polyline = self._read_polyline(data)
+            elif name == '3DFACE':
+                yield self._read_3dface(data)
+        if polyline is not None:
+            yield polyline
+
+    @staticmethod
+    def _values(data):
+        values = {}
+        for code, value in data:
+            if 10 <= code < 60:
+                value = float(value)
+            elif 60 <= code < 100:
+                value = int(value)
+            values[code] = value
+        return values
+
+    def _read_line(self, data):
+        values = self._values(data)
+        return {'type': 'LINE', 'layer': values.get(8), 'points': [_point(values, 0), _point(values, 1)], 'closed': False}
+
+    def _read_lwpolyline(self, data):
+        layer = None
+        flags = 0
+        elevation = 0.0
+        points = []
+        for code, value in data:
+            if code == 10:
+                points.append([float(value), 0.0])
+            elif code == 20:
+                points[-1][1] = float(value)
+            elif code == 38:
+                elevation = float(value)
+            elif code == 70:
+                flags = int(value)
+            elif code == 8:
+                layer = value
+        points = [[x, y, elevation] for x, y in points]
+        return {'type': 'LWPOLYLINE', 'layer': layer, 'points': points, 'closed': bool(flags & 1)}
+
+    def _read_polyline(self, data):
+        values = self._values(data)
+        flags = values.get(70, 0)
+        if flags & 64:
+            return {'type': 'POLYFACE', 'layer': values.get(8), 'points': [], 'faces': [], 'closed': False}
+        return {'type': 'POLYLINE', 'layer': values.get(8), 'points': [], 'closed': bool(flags & 1)}
+
+    def _read_vertex(self, polyline, data):
+        values = self._values(data)
+        flags = values.get(70, 0)
+        if polyline['type'] == 'POLYFACE' and flags & 128 and not flags & 64:
+            # a face record, with 1-based (and possibly negative) vertex indices
+            face = [abs(values.get(code, 0)) - 1 for code in (71, 72, 73, 74)]
+            polyline['faces'].append([index for index in face if index >= 0])
+        else:
+            polyline['points'].append(_point(values, 0))
+
+    def _read_3dface(self, data):
+        values = self._values(data)
+        points = [_point(values, i) for i in range(4)]
+        if points[3] == points[2]:
+            del points[3]
+        return {'type': '3DFACE', 'layer': values.get(8), 'points': points, 'closed': True}
 
 
 class DXFParser(object):
-    pass
+    """Parse the entities read by a :class:`DXFReader` into lists of unique vertices and
+    of lines, polylines and faces referencing them.
+
+    Parameters
+    ----------
+    reader : DXFReader
+        The reader.
+    precision : str, optional
+        The precision of the geometric keys used to identify duplicate vertices.
+        Default is ``'3f'``.
+    tolerance : float, optional
+        If provided, duplicate vertices are identified with
+        :func:`compas.geometry.weld_points_numpy` instead,
+        i.e. vertices closer to each other than this distance are merged.
+        Default is ``None``.
+
+    Attributes
+    ----------
+    vertices : list
+        The XYZ coordinates of the unique vertices.
+    lines : list
+        The lines, as pairs of vertex indices.
+        These include the segments of all polylines.
+    polylines : list
+        The polylines, as lists of vertex indices.
+        Closed polylines end with their first vertex.
+    faces : list
+        The faces of ``3DFACE`` entities and polyface meshes, as lists of vertex indices.
+
+    Notes
+    -----
+    The entities are consumed one by one from the reader, and only their points
+    are collected. Duplicate points are merged once all entities have been read.
+
+    """
+
+    def __init__(self, reader, precision=None, tolerance=None):
+        self.precision = precision if precision is not None else '3f'
+        self.tolerance = tolerance
+        self.reader    = reader
+        self.vertices  = None
+        self.lines     = None
+        self.polylines = None
+        self.faces     = None
+        self.parse()
+
+    def parse(self):
+        points = []
+        polylines = []
+        faces = []
+        for entity in self.reader.iter_entities():
+            start = len(points)
+            points += entity['points']
+            if entity['type'] == '3DFACE':
+                faces.append(list(range(start, len(points))))
+            elif entity['type'] == 'POLYFACE':
+                count = len(entity['points'])
+                faces += [[start + index for index in face] for face in entity['faces'] if all(index < count for index in face)]
+            else:
+                polyline = list(range(start, len(points)))
+                if entity['closed'] and len(polyline) > 2:
+                    polyline.append(start)
+                polylines.append(polyline)
+
+        if self.tolerance is not None:
+            from compas.geometry import weld_points_numpy
+
+            vertices, index = weld_points_numpy(points, self.tolerance)
+            self.vertices = vertices.tolist()
+            index = index.tolist()
+        else:
+            key_index = {}
+            self.vertices = []
+            index = []
+            for xyz in points:
+                key = geometric_key(xyz, self.precision)
+                if key not in key_index:
+                    key_index[key] = len(self.vertices)
+                    self.vertices.append(xyz)
+                index.append(key_index[key])
+
+        self.polylines = [[index[i] for i in polyline] for polyline in polylines]
+        self.lines = [[u, v] for polyline in self.polylines for u, v in pairwise(polyline) if u != v]
+        self.faces = [[index[i] for i in face] for face in faces]
 
 
 class DXFComposer(object):
@@ -68,4 +324,20 @@ class DXFWriter(object):
 # ==============================================================================
 
 if __name__ == "__main__":
-    pass
+
+    import os
+    import tempfile
+
+    filepath = os.path.join(tempfile.gettempdir(), 'lines.dxf')
+
+    with open(filepath, 'w') as fh:
+        fh.write('0\nSECTION\n2\nENTITIES\n')
+        fh.write('0\nLINE\n8\n0\n10\n0.0\n20\n0.0\n30\n0.0\n11\n1.0\n21\n0.0\n31\n0.0\n')
+        fh.write('0\nLWPOLYLINE\n8\n0\n90\n3\n70\n1\n10\n1.0\n20\n0.0\n10\n1.0\n20\n1.0\n10\n0.0\n20\n1.0\n')
+        fh.write('0\nENDSEC\n0\nEOF\n')
+
+    dxf = DXF(filepath)
+
+    print(dxf.parser.vertices)
+    print(dxf.parser.lines)
+    print(dxf.parser.polylines)
@@ -2,6 +2,8 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import struct
+
 
 __author__    = ['Tom Van Mele', ]
 __copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
@@ -9,19 +11,394 @@ __license__   = 'MIT License'
 __email__     = 'vanmelet@ethz.ch'
 
 
-__all__ = []
+__all__ = [
+    'LAS',
+    'LASReader',
+]
+
+
+# the public header block up to version 1.2,
+# and the fields added in versions 1.3 and 1.4
+
+HEADER = '<4sHH16sBB32s32sHHHIIBHI5I3d3d6d'
+HEADER_13 = '<Q'
+HEADER_14 = '<QIQ15Q'
+
+VLR = '<H16sHH32s'
+
+# the fields of the point data record formats 0 to 10
+# coordinates are stored as scaled integers (X, Y, Z)
+
+LEGACY = [
+    ('X', '<i4'), ('Y', '<i4'), ('Z', '<i4'),
+    ('intensity', '<u2'),
+    ('returns', 'u1'),
+    ('classification', 'u1'),
+    ('scan_angle_rank', 'i1'),
+    ('user_data', 'u1'),
+    ('point_source_id', '<u2'),
+]
+
+EXTENDED = [
+    ('X', '<i4'), ('Y', '<i4'), ('Z', '<i4'),
+    ('intensity', '<u2'),
+    ('returns', 'u1'),
+    ('flags', 'u1'),
+    ('classification', 'u1'),
+    ('user_data', 'u1'),
+    ('scan_angle', '<i2'),
+    ('point_source_id', '<u2'),
+    ('gps_time', '<f8'),
+]
+
+GPS = [('gps_time', '<f8')]
+
+RGB = [('red', '<u2'), ('green', '<u2'), ('blue', '<u2')]
+
+NIR = [('nir', '<u2')]
+
+WAVE = [
+    ('wave_packet_descriptor_index', 'u1'),
+    ('wave_packet_offset', '<u8'),
+    ('wave_packet_size', '<u4'),
+    ('return_point_location', '<f4'),
+    ('x_t', '<f4'), ('y_t', '<f4'), ('z_t', '<f4'),
+]
+
+POINT_FIELDS = {
+    0: LEGACY,
+    1: LEGACY + GPS,
+    2: LEGACY + RGB,
+    3: LEGACY + GPS + RGB,
+    4: LEGACY + GPS + WAVE,
+    5: LEGACY + GPS + RGB + WAVE,
+    6: EXTENDED,
+    7: EXTENDED + RGB,
+    8: EXTENDED + RGB + NIR,
+    9: EXTENDED + WAVE,
+    10: EXTENDED + RGB + NIR + WAVE,
+}
+
+
+def _point_dtype(point_format, record_length):
+    """Construct the structured dtype of the point data records of a file."""
+    from numpy import dtype
+
+    if point_format not in POINT_FIELDS:
+        raise ValueError('Unsupported point data record format: {}'.format(point_format))
+    fields = list(POINT_FIELDS[point_format])
+    size = dtype(fields).itemsize
+    if record_length < size:
+        raise ValueError('Point data records of format {} need at least {} bytes.'.format(point_format, size))
+    if record_length > size:
+        fields.append(('extra_bytes', 'V{}'.format(record_length - size)))
+    return dtype(fields)
 
 
 class LAS(object):
     """LASer file format.
 
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
     See Also
     --------
     * http://www.asprs.org/wp-content/uploads/2010/12/LAS_1_4_r13.pdf
 
 
     """
-    pass
+
+    def __init__(self, filepath):
+        self.reader = LASReader(filepath)
+
+
+class LASReader(object):
+    """Read the header and point records of a LAS file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
+    Attributes
+    ----------
+    version : tuple
+        The major and minor version of the format.
+    point_format : int
+        The point data record format (0 - 10).
+    record_length : int
+        The number of bytes per point record.
+    number_of_points : int
+        The number of point records.
+    scale : tuple
+        The scale factors of the X, Y and Z coordinates.
+    offset : tuple
+        The offsets of the X, Y and Z coordinates.
+    bounds : tuple
+        The minimum and maximum XYZ coordinates of the points, according to the header.
+    header : dict
+        The remaining fields of the public header block.
+    vlrs : list
+        The variable length records, as dicts with ``user_id``, ``record_id``,
+        ``description`` and ``data``.
+    points : numpy.memmap
+        The point records, as a memory-mapped structured array.
+        The coordinates are stored as scaled integers in the fields
+        ``X``, ``Y`` and ``Z``.
+
+    Notes
+    -----
+    Versions 1.0 to 1.4 of the format are supported, with point data record
+    formats 0 to 10. Compressed (LAZ) files are not supported.
+
+    The point records are not read into memory. They are mapped from the file,
+    and read from disk only when (and as far as) they are accessed.
+    Scale and offset are applied when coordinates are requested,
+    for selected records or for one chunk of records at a time.
+
+    Examples
+    --------
+    >>> reader = LASReader('survey.las')
+    >>> xyz = reader.coordinates(reader.points[:1000])
+    >>> for xyz, records in reader.iter_chunks(bbox=[[0, 0, 0], [10, 10, 5]], classification=2):
+    ...     pass
+
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.version = None
+        self.point_format = None
+        self.record_length = None
+        self.number_of_points = None
+        self.scale = None
+        self.offset = None
+        self.bounds = None
+        self.header = {}
+        self.vlrs = []
+        self.points = None
+        self._data_offset = None
+        self._header_size = None
+        self._number_of_vlrs = None
+        self.read()
+
+    def __len__(self):
+        return self.number_of_points
+
+    def read(self):
+        self.read_header()
+        self.read_vlrs()
+        self.read_points()
+
+    def read_header(self):
+        with open(self.filepath, 'rb') as fh:
+            data = fh.read(struct.calcsize(HEADER))
+            if len(data) < struct.calcsize(HEADER) or data[:4] != b'LASF':
+                raise ValueError('Not a LAS file: {}'.format(self.filepath))
+            fields = struct.unpack(HEADER, data)
+            (_, file_source_id, global_encoding, guid, major, minor, system, software,
+             day, year, header_size, data_offset, number_of_vlrs, point_format, record_length,
+             number_of_points) = fields[:16]
+            by_return = list(fields[16:21])
+            scale = fields[21:24]
+            offset = fields[24:27]
+            xmax, xmin, ymax, ymin, zmax, zmin = fields[27:33]
+            if (major, minor) >= (1, 3):
+                fh.seek(struct.calcsize(HEADER))
+                self.header['waveform_data_offset'], = struct.unpack(HEADER_13, fh.read(struct.calcsize(HEADER_13)))
+            if (major, minor) >= (1, 4):
+                fh.seek(struct.calcsize(HEADER) + struct.calcsize(HEADER_13))
+                fields = struct.unpack(HEADER_14, fh.read(struct.calcsize(HEADER_14)))
+                self.header['evlr_offset'] = fields[0]
+                self.header['number_of_evlrs'] = fields[1]
+                if fields[2]:
+                    number_of_points = fields[2]
+                    by_return = list(fields[3:])
+        if point_format & 0xC0:
+            raise ValueError('Compressed LAS files are not supported: {}'.format(self.filepath))
+        self.version = (major, minor)
+        self.point_format = point_format
+        self.record_length = record_length
+        self.number_of_points = number_of_points
+        self.scale = scale
+        self.offset = offset
+        self.bounds = ((xmin, ymin, zmin), (xmax, ymax, zmax))
+        self.header['file_source_id'] = file_source_id
+        self.header['global_encoding'] = global_encoding
+        self.header['guid'] = guid
+        self.header['system_identifier'] = system.rstrip(b'\x00 ').decode('ascii', 'replace')
+        self.header['generating_software'] = software.rstrip(b'\x00 ').decode('ascii', 'replace')
+        self.header['creation_date'] = (year, day)
+        self.header['number_of_points_by_return'] = by_return
+        self._header_size = header_size
+        self._data_offset = data_offset
+        self._number_of_vlrs = number_of_vlrs
+
+    def read_vlrs(self):
+        size = struct.calcsize(VLR)
+        self.vlrs = []
+        with open(self.filepath, 'rb') as fh:
+            fh.seek(self._header_size)
+            for i in range(self._number_of_vlrs):
+                data = fh.read(size)
+                if len(data) < size:
+                    break
+                _, user_id, record_id, length, description = struct.unpack(VLR, data)
+                self.vlrs.append({
+                    'user_id'     : user_id.rstrip(b'\x00 ').decode('ascii', 'replace'),
+                    'record_id'   : record_id,
+                    'description' : description.rstrip(b'\x00 ').decode('ascii', 'replace'),
+                    'data'        : fh.read(length),
+                })
+
+    def read_points(self):
+        from numpy import empty
+        from numpy import memmap
+
+        dtype = _point_dtype(self.point_format, self.record_length)
+        if not self.number_of_points:
+            self.points = empty(0, dtype=dtype)
+        else:
+            self.points = memmap(self.filepath, dtype=dtype, mode='r',
+                                 offset=self._data_offset, shape=(self.number_of_points, ))
+
+    def coordinates(self, records):
+        """Compute the XYZ coordinates of point records.
+
+        Parameters
+        ----------
+        records : array
+            A selection of point records.
+
+        Returns
+        -------
+        array
+            The coordinates (n x 3).
+
+        """
+        from numpy import empty
+
+        xyz = empty((len(records), 3))
+        for i, name in enumerate('XYZ'):
+            xyz[:, i] = records[name]
+            xyz[:, i] *= self.scale[i]
+            xyz[:, i] += self.offset[i]
+        return xyz
+
+    def classification(self, records):
+        """Get the classes of point records.
+
+        Parameters
+        ----------
+        records : array
+            A selection of point records.
+
+        Returns
+        -------
+        array
+            The classes of the points.
+
+        Notes
+        -----
+        In point formats 0 to 5, the class is stored in the lower 5 bits
+        of the classification byte. The upper bits are flags.
+
+        """
+        if self.point_format < 6:
+            return records['classification'] & 31
+        return records['classification']
+
+    def _intersects(self, bbox):
+        (xmin, ymin, zmin), (xmax, ymax, zmax) = self.bounds
+        lower = (xmin, ymin, zmin)
+        upper = (xmax, ymax, zmax)
+        return all(bbox[0][i] <= upper[i] and lower[i] <= bbox[1][i] for i in range(3))
+
+    def iter_chunks(self, chunksize=2 ** 20, bbox=None, classification=None):
+        """Iterate over the points of the file in chunks.
+
+        Parameters
+        ----------
+        chunksize : int, optional
+            The number of records per chunk, before filtering.
+            Default is ``2 ** 20``.
+        bbox : list, optional
+            Only include points inside this box, defined by its minimum and
+            maximum XYZ coordinates: ``[[xmin, ymin, zmin], [xmax, ymax, zmax]]``.
+        classification : int or list of int, optional
+            Only include points of this class, or of one of these classes.
+
+        Yields
+        ------
+        tuple
+            * The XYZ coordinates of the points of the chunk (k x 3).
+            * The point records of the chunk (k).
+
+        Notes
+        -----
+        Only one chunk of coordinates is in memory at a time.
+        Without filters, the records are views of the memory-mapped records.
+        If the box does not intersect the bounds of the file,
+        nothing is read at all.
+
+        """
+        from numpy import zeros
+
+        if bbox is not None and not self._intersects(bbox):
+            return
+        table = None
+        if classification is not None:
+            if not hasattr(classification, '__iter__'):
+                classification = [classification]
+            table = zeros(256, dtype=bool)
+            table[list(classification)] = True
+        for start in range(0, self.number_of_points, chunksize):
+            records = self.points[start:start + chunksize]
+            mask = None
+            if table is not None:
+                mask = table[self.classification(records)]
+                records = records[mask]
+            xyz = self.coordinates(records)
+            if bbox is not None:
+                mask = ((xyz >= bbox[0]) & (xyz <= bbox[1])).all(axis=1)
+                records = records[mask]
+                xyz = xyz[mask]
+            if len(records):
+                yield xyz, records
+
+    def read_coordinates(self, bbox=None, classification=None, chunksize=2 ** 20):
+        """Read the XYZ coordinates of the (selected) points of the file.
+
+        Parameters
+        ----------
+        bbox : list, optional
+            Only include points inside this box.
+        classification : int or list of int, optional
+            Only include points of this class, or of one of these classes.
+        chunksize : int, optional
+            The number of records that is processed at once.
+            Default is ``2 ** 20``.
+
+        Returns
+        -------
+        array
+            The coordinates (n x 3).
+
+        Notes
+        -----
+        The file is filtered in chunks (see :meth:`iter_chunks`),
+        such that only the selected points are collected in memory.
+
+        """
+        from numpy import concatenate
+        from numpy import empty
+
+        chunks = [xyz for xyz, records in self.iter_chunks(chunksize, bbox, classification)]
+        if not chunks:
+            return empty((0, 3))
+        return concatenate(chunks)
 
 
 # ==============================================================================
@@ -29,4 +406,33 @@ class LAS(object):
 # ==============================================================================
 
 if __name__ == "__main__":
-    pass
+
+    import os
+    import tempfile
+
+    import numpy as np
+
+    filepath = os.path.join(tempfile.gettempdir(), 'points.las')
+
+    points = np.zeros(1000, dtype=_point_dtype(1, 28))
+    points['X'] = np.random.randint(0, 100000, 1000)
+    points['Y'] = np.random.randint(0, 100000, 1000)
+    points['Z'] = np.random.randint(0, 10000, 1000)
+    points['classification'] = np.random.randint(0, 3, 1000)
+
+    header = struct.pack(HEADER, b'LASF', 0, 0, b'\x00' * 16, 1, 2, b'', b'compas', 1, 2018,
+                         227, 227, 0, 1, 28, 1000, 1000, 0, 0, 0, 0,
+                         0.001, 0.001, 0.001, 0.0, 0.0, 0.0,
+                         100.0, 0.0, 100.0, 0.0, 10.0, 0.0)
+
+    with open(filepath, 'wb') as fh:
+        fh.write(header)
+        points.tofile(fh)
+
+    reader = LASReader(filepath)
+
+    print(reader.version, reader.point_format, len(reader))
+
+    xyz = reader.read_coordinates(bbox=[[0, 0, 0], [50, 50, 10]], classification=2)
+
+    print(xyz.shape)
@@ -2,6 +2,8 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import re
+
 try:
     import urllib.request as urllib2
 except ImportError:
@@ -20,6 +22,7 @@ __date__       = 'Mar 31, 2015'
 __all__ = [
     'OBJ',
     'OBJReader',
+    'OBJStreamReader',
     'OBJParser',
     'OBJComposer',
     'OBJWriter',
@@ -34,9 +37,9 @@ class OBJ(object):
     * http://paulbourke.net/dataformats/obj/
 
     """
-    def __init__(self, filepath, remote=False, precision=None):
+    def __init__(self, filepath, remote=False, precision=None, tolerance=None):
         self.reader = OBJReader(filepath, remote=remote)
-        self.parser = OBJParser(self.reader, precision=precision)
+        self.parser = OBJParser(self.reader, precision=precision, tolerance=tolerance)
 
 
 class OBJReader(object):
@@ -310,10 +313,323 @@ class OBJReader(object):
             return
 
 
+class _Buffer(object):
+    """A growable array.
+
+    Rows are appended in blocks, and the capacity is doubled whenever necessary,
+    such that the data is copied only a logarithmic number of times.
+    """
+
+    def __init__(self, dtype, width=None):
+        from numpy import empty
+        self.shape = () if width is None else (width, )
+        self.data = empty((1024, ) + self.shape, dtype=dtype)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, values):
+        from numpy import empty
+        n = len(values)
+        if self.size + n > len(self.data):
+            capacity = max(2 * len(self.data), self.size + n)
+            data = empty((capacity, ) + self.shape, dtype=self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+        self.data[self.size:self.size + n] = values
+        self.size += n
+
+    def clear(self):
+        self.size = 0
+
+    def array(self):
+        return self.data[:self.size]
+
+
+class OBJStreamReader(object):
+    """Read the polygonal geometry of an *obj* file in chunks, directly into arrays.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    chunksize : int, optional
+        The (approximate) number of bytes that is read and parsed at once.
+        Default is ``2 ** 24``.
+    tolerance : float, optional
+        If provided, vertices closer to each other than this distance are merged
+        (see :func:`compas.geometry.weld_points_numpy`).
+        Default is ``None``, in which case the vertices are not welded.
+
+    Attributes
+    ----------
+    vertices : array
+        The vertex coordinates (n x 3).
+    normals : array
+        The vertex normals (vn x 3).
+    textures : array
+        The texture coordinates (vt x 3).
+        Missing coordinates are zero.
+    offsets : array
+        The face offsets (f + 1).
+        The vertices of face ``i`` are ``indices[offsets[i]:offsets[i + 1]]``.
+    indices : array
+        The (zero-based) vertex indices of all faces, one after the other.
+    groups : list
+        The groups and objects of the file, as tuples ``(name, start, stop)``,
+        with ``start`` and ``stop`` the range of faces of the group.
+        Faces defined before the first group or object statement are in a group named ``None``.
+
+    Notes
+    -----
+    In contrast to :class:`OBJReader`, the file is never loaded into memory entirely.
+    It is read in blocks of approximately ``chunksize`` bytes, and the numerical data
+    of every block is converted in bulk and appended to growable arrays.
+
+    Only vertices (``v``), normals (``vn``), texture coordinates (``vt``) and faces (``f``) are read.
+    Vertex weights and colours, the texture and normal indices of faces, and all other
+    statements are ignored. A new group starts at every ``g`` and ``o`` statement.
+    Negative (relative) face indices are supported.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from compas.datastructures import Mesh
+    >>> reader = OBJStreamReader(compas.get('faces.obj'))
+    >>> reader.read()
+    >>> faces = np.split(reader.indices, reader.offsets[1:-1])
+    >>> mesh = Mesh.from_arrays(reader.vertices, faces)
+
+    The groups of a large file can be processed one at a time.
+
+    >>> reader = OBJStreamReader('scan.obj')
+    >>> for name, vertices, offsets, indices in reader.iter_groups():
+    ...     print(name, len(vertices), len(offsets) - 1)
+
+    """
+
+    ignore = re.compile(br'/\S*')
+
+    def __init__(self, filepath, chunksize=2 ** 24, tolerance=None):
+        self.filepath = filepath
+        self.chunksize = chunksize
+        self.tolerance = tolerance
+        self.vertices = None
+        self.normals = None
+        self.textures = None
+        self.offsets = None
+        self.indices = None
+        self.groups = None
+
+    def _chunks(self):
+        # yield blocks of complete lines
+        # a line is not complete if it is continued on the next line with a backslash
+        with open(self.filepath, 'rb') as fh:
+            remainder = b''
+            while True:
+                block = fh.read(self.chunksize)
+                if not block:
+                    break
+                data = remainder + block
+                cut = data.rfind(b'\n')
+                while cut > 0 and data[max(0, cut - 2):cut].rstrip(b'\r').endswith(b'\\'):
+                    cut = data.rfind(b'\n', 0, cut)
+                if cut < 0:
+                    remainder = data
+                    continue
+                remainder = data[cut + 1:]
+                yield data[:cut + 1]
+            if remainder:
+                yield remainder
+
+    def _parse(self):
+        # parse the file into the buffers
+        # and yield the name of every group that is started
+        from numpy import array
+        from numpy import float64
+        from numpy import int64
+
+        self._v = _Buffer(float64, 3)
+        self._vn = _Buffer(float64, 3)
+        self._vt = _Buffer(float64, 3)
+        self._sizes = _Buffer(int64)
+        self._indices = _Buffer(int64)
+
+        for text in self._chunks():
+            if b'\\' in text:
+                text = text.replace(b'\\\r\n', b' ').replace(b'\\\n', b' ')
+            v = []
+            vn = []
+            vt = []
+            f = []
+            count = []
+            for line in text.splitlines():
+                parts = line.split(None, 1)
+                if len(parts) < 2:
+                    continue
+                head, tail = parts
+                if head == b'v':
+                    v.append(tail)
+                elif head == b'f':
+                    f.append(tail)
+                    count.append(len(v))
+                elif head == b'vn':
+                    vn.append(tail)
+                elif head == b'vt':
+                    vt.append(tail)
+                elif head == b'g' or head == b'o':
+                    self._flush(v, vn, vt, f, array(count, dtype=int64))
+                    v = []
+                    vn = []
+                    vt = []
+                    f = []
+                    count = []
+                    yield b' '.join(tail.split()).decode('utf-8', 'replace')
+            self._flush(v, vn, vt, f, array(count, dtype=int64))
+
+    def _flush(self, v, vn, vt, f, count):
+        # convert the collected lines to numbers
+        # count is the number of vertices of the block preceding every face
+        from numpy import fromstring
+        from numpy import int64
+        from numpy import repeat
+
+        if f:
+            sizes = [len(tail.split()) for tail in f]
+            indices = fromstring(self.ignore.sub(b'', b' '.join(f)), dtype=int64, sep=' ')
+            relative = indices < 0
+            if relative.any():
+                count = repeat(count + len(self._v), sizes)
+                indices[relative] += count[relative]
+                indices[~relative] -= 1
+            else:
+                indices -= 1
+            self._sizes.extend(sizes)
+            self._indices.extend(indices)
+        if v:
+            self._v.extend(self._rows(v))
+        if vn:
+            self._vn.extend(self._rows(vn))
+        if vt:
+            self._vt.extend(self._rows(vt))
+
+    @staticmethod
+    def _rows(lines):
+        # convert lines of numbers into rows of three values
+        # lines with more values are truncated and lines with less are padded with zeros
+        from numpy import array
+        from numpy import fromstring
+
+        values = fromstring(b' '.join(lines), sep=' ')
+        if len(values) == 3 * len(lines):
+            return values.reshape((-1, 3))
+        rows = []
+        for line in lines:
+            row = [float(x) for x in line.split()[:3]]
+            rows.append(row + [0.0] * (3 - len(row)))
+        return array(rows, dtype=float)
+
+    def _faces(self):
+        from numpy import cumsum
+        from numpy import int64
+        from numpy import zeros
+
+        sizes = self._sizes.array()
+        offsets = zeros(len(sizes) + 1, dtype=int64)
+        cumsum(sizes, out=offsets[1:])
+        return offsets, self._indices.array()
+
+    def _weld(self, vertices, indices):
+        from compas.geometry import weld_points_numpy
+
+        vertices, index = weld_points_numpy(vertices, self.tolerance)
+        return vertices, index[indices]
+
+    def read(self):
+        """Read the entire file."""
+        self.groups = []
+        name = None
+        start = 0
+        for group in self._parse():
+            stop = len(self._sizes)
+            if stop > start:
+                self.groups.append((name, start, stop))
+            name = group
+            start = stop
+        stop = len(self._sizes)
+        if stop > start:
+            self.groups.append((name, start, stop))
+
+        self.offsets, self.indices = self._faces()
+        self.vertices = self._v.array()
+        self.normals = self._vn.array()
+        self.textures = self._vt.array()
+        if self.tolerance:
+            self.vertices, self.indices = self._weld(self.vertices, self.indices)
+
+    def iter_groups(self):
+        """Read the file one group at a time.
+
+        Yields
+        ------
+        tuple
+            The name of a group, the coordinates of the vertices used by the faces of the group,
+            the offsets of the faces and the vertex indices of the faces.
+            The indices refer to the vertices of the group.
+
+        Notes
+        -----
+        Only the faces of the current group are kept in memory.
+        Since faces can refer to any of the vertices defined before them,
+        all vertex coordinates are kept.
+
+        """
+        from numpy import unique
+
+        name = None
+        groups = self._parse()
+        while True:
+            try:
+                group = next(groups)
+            except StopIteration:
+                group = StopIteration
+            if len(self._sizes):
+                offsets, indices = self._faces()
+                used, indices = unique(indices, return_inverse=True)
+                vertices = self._v.array()[used]
+                indices = indices.reshape(-1)
+                if self.tolerance:
+                    vertices, indices = self._weld(vertices, indices)
+                self._sizes.clear()
+                self._indices.clear()
+                yield name, vertices, offsets, indices
+            if group is StopIteration:
+                break
+            name = group
+
+
 class OBJParser(object):
-    """"""
-    def __init__(self, reader, precision=None):
+    """Parse the data read by an :class:`OBJReader` into lists of unique vertices and
+    of lines, polylines and faces referencing them.
+
+    Parameters
+    ----------
+    reader : OBJReader
+        The reader.
+    precision : str, optional
+        The precision of the geometric keys used to identify duplicate vertices.
+        Default is ``'3f'``.
+    tolerance : float, optional
+        If provided, duplicate vertices are identified with
+        :func:`compas.geometry.weld_points_numpy` instead,
+        i.e. vertices closer to each other than this distance are merged.
+        Default is ``None``.
+
+    """
+    def __init__(self, reader, precision=None, tolerance=None):
         self.precision = precision if precision is not None else '3f'
+        self.tolerance = tolerance
         self.reader    = reader
         self.vertices  = None
         self.weights   = None
@@ -331,6 +647,14 @@ class OBJParser(object):
         self.parse()
 
     def parse(self):
+        if self.tolerance is not None:
+            from compas.geometry import weld_points_numpy
+
+            vertices, index = weld_points_numpy(self.reader.vertices, self.tolerance)
+            self.vertices = vertices.tolist()
+            self._parse_indices(index.tolist())
+            return
+
         index_key = {}
         vertex = {}
 
@@ -343,6 +667,9 @@ class OBJParser(object):
         index_index = {index: key_index[key] for index, key in iter(index_key.items())}
 
         self.vertices  = [xyz for xyz in iter(vertex.values())]
+        self._parse_indices(index_index)
+
+    def _parse_indices(self, index_index):
         self.points    = [index_index[index] for index in self.reader.points]
         self.lines     = [[index_index[index] for index in line] for line in self.reader.lines if len(line) == 2]
         self.polylines = [[index_index[index] for index in line] for line in self.reader.lines if len(line) > 2]
@@ -351,21 +678,111 @@ class OBJParser(object):
 
 
 class OBJComposer(object):
-    """"""
-    def __init__(self):
-        pass
+    """Compose the contents of an *obj* file in blocks of text.
+
+    Parameters
+    ----------
+    vertices : sequence
+        The XYZ coordinates of the vertices.
+    faces : sequence, optional
+        The faces, as lists of (zero-based) indices into the vertices.
+        Rows of a 2D array padded with negative indices are allowed.
+    lines : sequence, optional
+        The lines and polylines, as lists of (zero-based) indices into the vertices.
+    precision : str, optional
+        The format specification of the coordinates.
+        Default is ``'3f'``.
+    blocksize : int, optional
+        The number of records per block of text.
+        Default is ``2 ** 16``.
+
+    Notes
+    -----
+    Every block is formatted with a single call to :meth:`str.format` on a
+    preassembled template, instead of formatting the records one by one.
+
+    """
+
+    def __init__(self, vertices, faces=None, lines=None, precision='3f', blocksize=2 ** 16):
+        self.vertices = vertices
+        self.faces = faces
+        self.lines = lines
+        self.precision = precision
+        self.blocksize = blocksize
+
+    @staticmethod
+    def _rows(rows):
+        if hasattr(rows, 'tolist'):
+            rows = rows.tolist()
+        return rows
 
     def compose(self):
-        pass
+        """Generate the contents of the file.
+
+        Yields
+        ------
+        str
+            The next block of text.
+
+        """
+        for block in self.compose_vertices():
+            yield block
+        if self.faces is not None:
+            for block in self.compose_elements(self.faces, 'f'):
+                yield block
+        if self.lines is not None:
+            for block in self.compose_elements(self.lines, 'l'):
+                yield block
+
+    def compose_vertices(self):
+        template = 'v {{:.{0}}} {{:.{0}}} {{:.{0}}}\n'.format(self.precision)
+        for i in range(0, len(self.vertices), self.blocksize):
+            block = self._rows(self.vertices[i:i + self.blocksize])
+            yield (template * len(block)).format(*[c for xyz in block for c in xyz[:3]])
+
+    def compose_elements(self, elements, prefix):
+        for i in range(0, len(elements), self.blocksize):
+            block = [[index + 1 for index in element if index >= 0] for element in self._rows(elements[i:i + self.blocksize])]
+            template = ''.join([prefix + ' {}' * len(element) + '\n' for element in block])
+            yield template.format(*[index for element in block for index in element])
 
 
 class OBJWriter(object):
-    """"""
-    def __init__(self):
-        pass
+    """Write vertices, faces and lines to an *obj* file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    vertices : sequence
+        The XYZ coordinates of the vertices.
+    faces : sequence, optional
+        The faces, as lists of (zero-based) indices into the vertices.
+    lines : sequence, optional
+        The lines and polylines, as lists of (zero-based) indices into the vertices.
+    precision : str, optional
+        The format specification of the coordinates.
+        Default is ``'3f'``.
+
+    Notes
+    -----
+    The contents are composed by an :class:`OBJComposer` and written to the file
+    block by block, such that the complete text is never held in memory.
+
+    Examples
+    --------
+    >>> OBJWriter('quad.obj', [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], faces=[[0, 1, 2, 3]]).write()
+
+    """
+
+    def __init__(self, filepath, vertices, faces=None, lines=None, precision='3f'):
+        self.filepath = filepath
+        self.composer = OBJComposer(vertices, faces=faces, lines=lines, precision=precision)
 
     def write(self):
-        pass
+        with open(self.filepath, 'w') as fh:
+            for block in self.composer.compose():
+                fh.write(block)
 
 
 # ==============================================================================
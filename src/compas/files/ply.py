@@ -4,6 +4,8 @@ from __future__ import division
 
 import struct
 
+from itertools import chain
+
 
 __author__    = ['Tom Van Mele', ]
 __copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
@@ -113,6 +115,9 @@ class PLYreader(object):
         self.vertices = []
         self.edges = []
         self.faces = []
+        self.vertex_array = None
+        self.edge_array = None
+        self.face_array = None
 
     def is_valid(self):
         self.read_header()
@@ -145,13 +150,13 @@ class PLYreader(object):
 
     def read_header(self):
         # the header is always in ascii format
-        # read it as text
-        # otherwise file.tell() can't be used reliably
-        # to figure out where the header ends
-        with open(self.filename) as file:
+        # read it line by line in binary mode
+        # such that file.tell() reliably points at the end of the header
+        # and the (binary) body is never decoded
+        with open(self.filename, 'rb') as file:
             file.seek(0)
 
-            line = file.readline().rstrip()
+            line = file.readline().decode('ascii', 'replace').rstrip()
 
             if line != 'ply':
                 raise Exception('not a valid ply file')
@@ -162,7 +167,9 @@ class PLYreader(object):
 
             while True:
                 line = file.readline()
-                line = line.rstrip()
+                if not line:
+                    raise Exception('not a valid ply file')
+                line = line.decode('ascii', 'replace').rstrip()
 
                 self.header.append(line)
 
@@ -287,9 +294,17 @@ class PLYreader(object):
             line = line.rstrip()
             parts = line.split()
             face = {}
-            for i, prop in enumerate(self.face_properties):
-                pname, ptype, plen = prop
-                face[pname] = [self.property_types[ptype](part) for part in parts[1:]]
+            i = 0
+            for prop in self.face_properties:
+                if len(prop) == 2:
+                    pname, ptype = prop
+                    face[pname] = self.property_types[ptype](parts[i])
+                    i += 1
+                else:
+                    pname, ptype, plen = prop
+                    n = int(parts[i])
+                    face[pname] = [self.property_types[ptype](part) for part in parts[i + 1:i + 1 + n]]
+                    i += 1 + n
             self.faces.append(face)
             count += 1
             if count == self.number_of_faces:
@@ -364,33 +379,22 @@ class PLYreader(object):
         pass
 
     def read_faces_binary_wo_numpy(self):
+        # lists have a variable length
+        # therefore, every property is unpacked separately
         ext = self.binary_byte_order[self.format]
-        fmt = ext
-        chunk = 0
-        for prop in self.face_properties:
-            if len(prop) == 2:
-                pname, ptype = prop
-                chunk += self.number_of_bytes_per_type[ptype]
-                fmt += self.struct_format_per_type[ptype]
-            elif len(prop) == 3:
-                pname, ptype, plen = prop
-                chunk += self.number_of_bytes_per_type[plen]
-                chunk += self.number_of_bytes_per_type[ptype] * 3
-                fmt += self.struct_format_per_type[plen]
-                fmt += self.struct_format_per_type[ptype] * 3
-            else:
-                pass
         for i in range(self.number_of_faces):
-            data = self.file.read(chunk)
-            data = struct.unpack(fmt, data)
             face = {}
-            for i, prop in enumerate(self.face_properties):
+            for prop in self.face_properties:
                 if len(prop) == 2:
                     pname, ptype = prop
-                    face[pname] = data[i]
+                    size = self.number_of_bytes_per_type[ptype]
+                    face[pname], = struct.unpack(ext + self.struct_format_per_type[ptype], self.file.read(size))
                 elif len(prop) == 3:
                     pname, ptype, plen = prop
-                    face[pname] = list(data[2:])
+                    size = self.number_of_bytes_per_type[plen]
+                    count, = struct.unpack(ext + self.struct_format_per_type[plen], self.file.read(size))
+                    size = self.number_of_bytes_per_type[ptype] * count
+                    face[pname] = list(struct.unpack(ext + self.struct_format_per_type[ptype] * count, self.file.read(size)))
             self.faces.append(face)
 
     def read_faces_binary(self):
@@ -414,16 +418,419 @@ class PLYreader(object):
             self.faces.append(face)
 
 
+    # ==========================================================================
+    # read the data into arrays
+    # ==========================================================================
+
+    def read_arrays(self, mmap=True):
+        """Read the data of the file into NumPy arrays.
+
+        Parameters
+        ----------
+        mmap : bool, optional
+            Map the body of a binary file into memory instead of reading it.
+            Default is ``True``.
+
+        Notes
+        -----
+        After reading, the data is available in the following attributes.
+
+        * ``vertex_array``: a structured array with one field per vertex property.
+        * ``edge_array``: a structured array with one field per edge property.
+        * ``face_array``: the vertex indices of the faces (f x k),
+          with ``k`` the size of the largest face.
+          Rows of faces with less than ``k`` vertices are padded with ``-1``.
+          This is the format expected by :meth:`compas.datastructures.Mesh.from_arrays`.
+
+        Fixed-size elements of binary files are decoded with a single view of
+        the body of the file. If all faces have the same size, this is the case for
+        the faces as well. Otherwise, the start of every variable-length face record
+        is found with a vectorized scan of the body, after which all records are
+        decoded in bulk.
+        Other face properties than the vertex indices are ignored.
+
+        ASCII files are read with :meth:`read` and converted.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from compas.datastructures import Mesh
+        >>> reader = PLYreader('scan.ply')
+        >>> reader.read_arrays()
+        >>> xyz = np.column_stack([reader.vertex_array[name] for name in 'xyz'])
+        >>> mesh = Mesh.from_arrays(xyz, reader.face_array)
+
+        """
+        self.read_header()
+        if self.format == 'ascii':
+            self._read_arrays_ascii()
+            return
+
+        from numpy import fromfile
+        from numpy import memmap
+        from numpy import uint8
+
+        if mmap:
+            body = memmap(self.filename, dtype=uint8, mode='r', offset=self.end_header)
+        else:
+            with open(self.filename, 'rb') as fh:
+                fh.seek(self.end_header)
+                body = fromfile(fh, dtype=uint8)
+
+        self.vertex_array = None
+        self.edge_array = None
+        self.face_array = None
+        position = 0
+        for section in self.sections:
+            if section == 'vertex':
+                self.vertex_array, position = self._read_records(body, position, self.vertex_properties, self.number_of_vertices)
+            elif section == 'edge':
+                self.edge_array, position = self._read_records(body, position, self.edge_properties, self.number_of_edges)
+            elif section == 'face':
+                self.face_array, position = self._read_face_lists(body, position)
+
+    def _read_arrays_ascii(self):
+        from numpy import array
+        from numpy import full
+        from numpy import int64
+
+        self.vertices = []
+        self.edges = []
+        self.faces = []
+        self.read_data()
+        dtype = self._numpy_dtype(self.vertex_properties)
+        self.vertex_array = array([tuple(vertex[name] for name, _ in self.vertex_properties) for vertex in self.vertices], dtype=dtype)
+        self.edge_array = None
+        self.face_array = None
+        if 'face' not in self.sections:
+            return
+        name = self._face_list()[0][0]
+        faces = [face[name] for face in self.faces]
+        k = max(len(face) for face in faces) if faces else 0
+        self.face_array = full((len(faces), k), -1, dtype=int64)
+        for i, face in enumerate(faces):
+            self.face_array[i, :len(face)] = face
+
+    def _numpy_dtype(self, properties):
+        from numpy import dtype
+
+        ext = self.binary_byte_order.get(self.format, '=')
+        return dtype([(pname, ext + self.binary_property_types[ptype]) for pname, ptype in properties])
+
+    def _read_records(self, body, position, properties, count):
+        dtype = self._numpy_dtype(properties)
+        end = position + dtype.itemsize * count
+        if end > len(body):
+            raise Exception('the file is too short for the number of elements in the header')
+        return body[position:end].view(dtype), end
+
+    def _face_list(self):
+        # split the face properties in fixed properties before and after the (only) list property
+        lists = [i for i, prop in enumerate(self.face_properties) if len(prop) == 3]
+        if len(lists) != 1:
+            raise Exception('faces should have exactly one list property')
+        i = lists[0]
+        return self.face_properties[i], self.face_properties[:i], self.face_properties[i + 1:]
+
+    def _read_face_lists(self, body, position):
+        from numpy import arange
+        from numpy import dtype
+        from numpy import empty
+        from numpy import int64
+
+        (pname, ptype, plen), before, after = self._face_list()
+        ext = self.binary_byte_order[self.format]
+        before = sum(self.number_of_bytes_per_type[t] for _, t in before)
+        after = sum(self.number_of_bytes_per_type[t] for _, t in after)
+        cdtype = dtype(ext + self.binary_property_types[plen])
+        idtype = dtype(ext + self.binary_property_types[ptype])
+        fixed = before + cdtype.itemsize + after
+        isize = idtype.itemsize
+        m = self.number_of_faces
+
+        if not m:
+            return empty((0, 0), dtype=int64), position
+
+        # try faces of equal size first
+        k = int(_gather(body, arange(position + before, position + before + 1), cdtype)[0])
+        record = fixed + k * isize
+        end = position + m * record
+        if end <= len(body):
+            records = body[position:end].reshape((m, record))
+            counts = records[:, before:before + cdtype.itemsize].copy().view(cdtype).reshape(-1)
+            if (counts == k).all():
+                indices = records[:, before + cdtype.itemsize:before + cdtype.itemsize + k * isize]
+                return indices.copy().view(idtype).reshape((m, k)).astype(int64), end
+
+        starts = _scan_records(body, position, m, before, cdtype, isize, fixed)
+        counts = _gather(body, starts + before, cdtype).astype(int64)
+        end = int(starts[-1] + fixed + counts[-1] * isize)
+        if end > len(body):
+            raise Exception('the file is too short for the number of elements in the header')
+        k = int(counts.max())
+        faces = empty((m, k), dtype=int64)
+        columns = arange(k * isize)
+        for i in range(0, m, 2 ** 20):
+            j = min(i + 2 ** 20, m)
+            index = starts[i:j, None] + (before + cdtype.itemsize) + columns
+            # the padding of faces with less than k vertices is read from the start of the body
+            index[columns >= counts[i:j, None] * isize] = 0
+            block = body[index].view(idtype).astype(int64)
+            block[arange(k) >= counts[i:j, None]] = -1
+            faces[i:j] = block
+        return faces, end
+
+
+def _gather(body, positions, dtype):
+    """Decode values of a given type at the given byte positions."""
+    from numpy import arange
+
+    index = positions[:, None] + arange(dtype.itemsize)
+    return body[index].view(dtype).reshape(-1)
+
+
+def _scan_records(body, position, count, before, cdtype, isize, fixed):
+    """Find the start positions of a sequence of records containing a list.
+
+    Every record consists of ``before`` bytes, the length of the list, the items
+    of the list, and some more bytes, ``fixed`` bytes in total plus the items.
+
+    The body is scanned in blocks. Per block, the position of the next record is
+    computed for every byte, as if a record would start there, and the chain of
+    records starting at the first one is followed by pointer doubling.
+    Therefore, the number of operations per block is logarithmic in the number
+    of records in the block, and every operation is vectorized.
+    """
+    from numpy import arange
+    from numpy import argmax
+    from numpy import concatenate
+    from numpy import int64
+
+    size = 2 ** 20
+    found = []
+    total = 0
+    while total < count:
+        start = position
+        stop = min(start + size, len(body) - before - cdtype.itemsize + 1)
+        if stop <= start:
+            raise Exception('the file is too short for the number of faces in the header')
+        n = stop - start
+        lengths = _gather(body, arange(start + before, stop + before), cdtype).astype(int64)
+        jump = arange(n) + fixed + lengths * isize
+        jump[jump > n] = n
+        jump = concatenate((jump, [n]))
+        # jumps over 1, 2, 4, ... records
+        jumps = [jump]
+        steps = min(count - total, n // (fixed + 3 * isize) + 1)
+        while 2 ** len(jumps) < steps:
+            jump = jump[jump]
+            jumps.append(jump)
+        # the positions after 0, 1, 2, ... records
+        chain = arange(1)
+        for jump in reversed(jumps):
+            chain = concatenate((chain[:, None], jump[chain][:, None]), axis=1).reshape(-1)
+        end = chain == n
+        if end.any():
+            chain = chain[:argmax(end)]
+        chain = chain[:count - total] + start
+        found.append(chain)
+        total += len(chain)
+        last = chain[-1]
+        position = int(last + fixed + _gather(body, arange(last + before, last + before + 1), cdtype)[0] * isize)
+    return concatenate(found)
+
+
 class PLYparser(object):
     pass
 
 
 class PLYcomposer(object):
-    pass
+    """Compose the header and the body of a *ply* file in blocks.
+
+    Parameters
+    ----------
+    vertices : sequence
+        The XYZ coordinates of the vertices.
+    faces : sequence, optional
+        The faces, as lists of indices into the vertices.
+        Rows of a 2D array padded with negative indices are allowed.
+    edges : sequence, optional
+        The edges, as pairs of indices into the vertices.
+    binary : bool, optional
+        Compose a binary little-endian body instead of an ASCII body.
+        Default is ``True``.
+    double : bool, optional
+        Store the coordinates as doubles instead of floats.
+        Default is ``False``.
+    blocksize : int, optional
+        The number of elements per block.
+        Default is ``2 ** 16``.
+
+    Notes
+    -----
+    Binary blocks are assembled as arrays and converted to bytes at once.
+    The variable-length records of the faces are scattered into one byte
+    buffer per block, with the vertex count followed by the vertex indices.
+    ASCII blocks are formatted with a single call to :meth:`str.format`.
+
+    """
+
+    def __init__(self, vertices, faces=None, edges=None, binary=True, double=False, blocksize=2 ** 16):
+        self.vertices = vertices
+        self.faces = faces
+        self.edges = edges
+        self.binary = binary
+        self.double = double
+        self.blocksize = blocksize
+
+    def compose_header(self):
+        ptype = 'double' if self.double else 'float'
+        lines = ['ply']
+        lines.append('format binary_little_endian 1.0' if self.binary else 'format ascii 1.0')
+        lines.append('comment compas')
+        lines.append('element vertex {}'.format(len(self.vertices)))
+        lines += ['property {} {}'.format(ptype, name) for name in 'xyz']
+        if self.faces is not None:
+            lines.append('element face {}'.format(len(self.faces)))
+            lines.append('property list uchar int vertex_indices')
+        if self.edges is not None:
+            lines.append('element edge {}'.format(len(self.edges)))
+            lines.append('property int vertex1')
+            lines.append('property int vertex2')
+        lines.append('end_header')
+        return '\n'.join(lines) + '\n'
+
+    def compose(self):
+        """Generate the contents of the file.
+
+        Yields
+        ------
+        bytes
+            The next block of the file.
+
+        """
+        yield self.compose_header().encode('ascii')
+        if self.binary:
+            blocks = [self.compose_vertices_binary()]
+            if self.faces is not None:
+                blocks.append(self.compose_faces_binary())
+            if self.edges is not None:
+                blocks.append(self.compose_edges_binary())
+        else:
+            blocks = [self.compose_vertices_ascii()]
+            if self.faces is not None:
+                blocks.append(self.compose_elements_ascii(self.faces, True))
+            if self.edges is not None:
+                blocks.append(self.compose_elements_ascii(self.edges, False))
+        for block in chain.from_iterable(blocks):
+            yield block
+
+    def _blocks(self, rows):
+        for i in range(0, len(rows), self.blocksize):
+            yield rows[i:i + self.blocksize]
+
+    def compose_vertices_binary(self):
+        from numpy import asarray
+
+        ptype = '<f8' if self.double else '<f4'
+        for block in self._blocks(self.vertices):
+            yield asarray(block, dtype=float)[:, :3].astype(ptype).tobytes()
+
+    def compose_edges_binary(self):
+        from numpy import asarray
+
+        for block in self._blocks(self.edges):
+            yield asarray(block)[:, :2].astype('<i4').tobytes()
+
+    def compose_faces_binary(self):
+        from numpy import arange
+        from numpy import asarray
+        from numpy import cumsum
+        from numpy import fromiter
+        from numpy import int64
+        from numpy import repeat
+        from numpy import uint8
+        from numpy import zeros
+
+        for block in self._blocks(self.faces):
+            if hasattr(block, 'ndim') and block.ndim == 2:
+                block = asarray(block)
+                mask = block >= 0
+                sizes = mask.sum(axis=1)
+                corners = block[mask]
+            else:
+                block = [[index for index in face if index >= 0] for face in block]
+                sizes = fromiter((len(face) for face in block), dtype=int64, count=len(block))
+                corners = fromiter(chain.from_iterable(block), dtype=int64, count=int(sizes.sum()))
+            if len(sizes) and sizes.max() > 255:
+                raise ValueError('Faces with more than 255 vertices cannot be written.')
+            lengths = 1 + 4 * sizes
+            starts = cumsum(lengths) - lengths
+            buffer = zeros(int(lengths.sum()), dtype=uint8)
+            buffer[starts] = sizes
+            j = arange(len(corners)) - repeat(cumsum(sizes) - sizes, sizes)
+            first = repeat(starts + 1, sizes) + 4 * j
+            buffer[first[:, None] + arange(4)] = corners.astype('<i4').view(uint8).reshape((-1, 4))
+            yield buffer.tobytes()
+
+    def compose_vertices_ascii(self):
+        template = '{!r} {!r} {!r}\n'
+        for block in self._blocks(self.vertices):
+            if hasattr(block, 'tolist'):
+                block = block.tolist()
+            yield (template * len(block)).format(*[float(c) for xyz in block for c in xyz[:3]]).encode('ascii')
+
+    def compose_elements_ascii(self, elements, counted):
+        for block in self._blocks(elements):
+            if hasattr(block, 'tolist'):
+                block = block.tolist()
+            block = [[int(index) for index in element if index >= 0] for element in block]
+            if counted:
+                block = [[len(element)] + element for element in block]
+            template = ''.join([' '.join(['{}'] * len(element)) + '\n' for element in block])
+            yield template.format(*[index for element in block for index in element]).encode('ascii')
 
 
 class PLYwriter(object):
-    pass
+    """Write vertices, edges and faces to a *ply* file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    vertices : sequence
+        The XYZ coordinates of the vertices (or points).
+    faces : sequence, optional
+        The faces, as lists of indices into the vertices.
+    edges : sequence, optional
+        The edges, as pairs of indices into the vertices.
+    binary : bool, optional
+        Write a binary little-endian file. Default is ``True``.
+    double : bool, optional
+        Store the coordinates as doubles instead of floats.
+        Default is ``False``.
+
+    Notes
+    -----
+    The contents are composed by a :class:`PLYcomposer` and written to the file
+    block by block, such that the complete file is never held in memory.
+    Binary files require NumPy.
+
+    Examples
+    --------
+    >>> PLYwriter('points.ply', points).write()
+    >>> PLYwriter('mesh.ply', vertices, faces=faces).write()
+
+    """
+
+    def __init__(self, filepath, vertices, faces=None, edges=None, binary=True, double=False):
+        self.filepath = filepath
+        self.composer = PLYcomposer(vertices, faces=faces, edges=edges, binary=binary, double=double)
+
+    def write(self):
+        with open(self.filepath, 'wb') as fh:
+            for block in self.composer.compose():
+                fh.write(block)
 
 
 # ==============================================================================
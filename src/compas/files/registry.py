@@ -0,0 +1,246 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+
+
+__author__    = ['Tom Van Mele', ]
+__copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
+__license__   = 'MIT License'
+__email__     = 'vanmelet@ethz.ch'
+
+
+__all__ = [
+    'register_format',
+    'get_format',
+    'find_format',
+    'read_arrays',
+]
+
+
+FORMATS = {}
+
+
+def register_format(name, reader, extensions=None, magic=None, streaming=False, mmap=False):
+    """Register a file format.
+
+    Parameters
+    ----------
+    name : str
+        The name of the format.
+    reader : str or callable
+        A function that reads a file of this format into arrays,
+        or its full name as ``'module/function'``.
+        The module is only imported when the function is first used.
+        The function is called with the path to the file and the keyword arguments
+        passed to :func:`read_arrays`, and returns a dict with (some of) the
+        ``vertices``, ``faces`` and ``edges`` of the file.
+    extensions : list, optional
+        The file extensions of the format, without the dot.
+    magic : list, optional
+        Byte strings with which files of this format start.
+    streaming : bool, optional
+        The reader does not load the entire file into memory.
+        Default is ``False``.
+    mmap : bool, optional
+        The reader maps (part of) the file into memory instead of reading it.
+        Default is ``False``.
+
+    Examples
+    --------
+    >>> register_format('xyz', 'mypackage.xyz/read_xyz', extensions=['xyz'])
+
+    """
+    FORMATS[name] = {
+        'name'       : name,
+        'reader'     : reader,
+        'extensions' : [extension.lower() for extension in extensions or []],
+        'magic'      : list(magic or []),
+        'streaming'  : streaming,
+        'mmap'       : mmap,
+    }
+
+
+def get_format(name):
+    """Get the description of a registered format.
+
+    Parameters
+    ----------
+    name : str
+        The name of the format.
+
+    Returns
+    -------
+    dict
+        The name, reader, extensions and magic bytes of the format,
+        and whether its reader supports streaming and memory mapping.
+
+    Raises
+    ------
+    KeyError
+        If the format is not registered.
+
+    """
+    if name not in FORMATS:
+        raise KeyError('Unknown file format: {}'.format(name))
+    return FORMATS[name]
+
+
+def find_format(filepath):
+    """Find the format of a file, from its first bytes or its extension.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the file.
+
+    Returns
+    -------
+    str
+        The name of the format.
+
+    Raises
+    ------
+    ValueError
+        If the format of the file can not be identified.
+
+    Notes
+    -----
+    The magic bytes are checked first, because they do not depend on the name of the file.
+    Only the first bytes of the file are read.
+
+    """
+    size = max([len(magic) for fmt in FORMATS.values() for magic in fmt['magic']] or [0])
+    if size and os.path.isfile(filepath):
+        with open(filepath, 'rb') as fh:
+            head = fh.read(size)
+        for name, fmt in FORMATS.items():
+            if any(head.startswith(magic) for magic in fmt['magic']):
+                return name
+    extension = os.path.splitext(filepath)[1][1:].lower()
+    for name, fmt in FORMATS.items():
+        if extension in fmt['extensions']:
+            return name
+    raise ValueError('Unknown file format: {}'.format(filepath))
+
+
+def _reader(fmt):
+    reader = fmt['reader']
+    if not callable(reader):
+        module, attr = reader.split('/')
+        reader = fmt['reader'] = getattr(__import__(module, fromlist=[attr]), attr)
+    return reader
+
+
+def read_arrays(filepath, format=None, **kwargs):
+    """Read the geometry of a file into arrays, without constructing a datastructure.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the file.
+    format : str, optional
+        The name of the format.
+        Default is ``None``, in which case the format is identified with :func:`find_format`.
+    kwargs : dict, optional
+        Options of the reader of the format, for example a welding ``tolerance``.
+
+    Returns
+    -------
+    dict
+        The ``vertices`` of the file, and, depending on the format, its ``faces`` and ``edges``.
+
+    Examples
+    --------
+    >>> data = read_arrays('scan.ply')
+    >>> data['vertices'].shape
+    (100000, 3)
+
+    """
+    fmt = get_format(format or find_format(filepath))
+    return _reader(fmt)(filepath, **kwargs)
+
+
+# ==============================================================================
+# Readers
+# the reader modules and NumPy are only imported when a reader is called
+# ==============================================================================
+
+
+def _read_obj(filepath, precision=None, tolerance=None):
+    from compas.files.obj import OBJ
+
+    obj = OBJ(filepath, precision=precision, tolerance=tolerance)
+    edges = [[u, v] for line in obj.parser.lines + obj.parser.polylines for u, v in zip(line[:-1], line[1:])]
+    data = {'vertices': obj.parser.vertices}
+    if obj.parser.faces:
+        data['faces'] = obj.parser.faces
+    if edges:
+        data['edges'] = edges
+    return data
+
+
+def _read_ply(filepath, mmap=True):
+    from numpy import column_stack
+    from compas.files.ply import PLYreader
+
+    reader = PLYreader(filepath)
+    reader.read_arrays(mmap=mmap)
+    data = {'vertices': column_stack([reader.vertex_array[name] for name in 'xyz'])}
+    if reader.face_array is not None:
+        data['faces'] = reader.face_array
+    if reader.edge_array is not None:
+        data['edges'] = column_stack([reader.edge_array['vertex1'], reader.edge_array['vertex2']])
+    return data
+
+
+def _read_stl(filepath, tolerance=0.0):
+    from compas.files.stl import STL
+
+    stl = STL(filepath, tolerance=tolerance)
+    return {'vertices': stl.parser.vertices, 'faces': stl.parser.faces}
+
+
+def _read_amf(filepath):
+    from compas.files.amf import AMFReader
+
+    reader = AMFReader(filepath)
+    return {'vertices': reader.vertices, 'faces': reader.faces}
+
+
+def _read_dxf(filepath, precision=None, tolerance=None):
+    from compas.files.dxf import DXF
+
+    dxf = DXF(filepath, precision=precision, tolerance=tolerance)
+    return {'vertices': dxf.parser.vertices, 'faces': dxf.parser.faces, 'edges': dxf.parser.lines}
+
+
+def _read_las(filepath, bbox=None, classification=None):
+    from compas.files.las import LASReader
+
+    reader = LASReader(filepath)
+    return {'vertices': reader.read_coordinates(bbox=bbox, classification=classification)}
+
+
+register_format('obj', _read_obj, extensions=['obj'])
+register_format('ply', _read_ply, extensions=['ply'], magic=[b'ply'], mmap=True)
+register_format('stl', _read_stl, extensions=['stl'])
+register_format('amf', _read_amf, extensions=['amf'], streaming=True)
+register_format('dxf', _read_dxf, extensions=['dxf'], streaming=True)
+register_format('las', _read_las, extensions=['las'], magic=[b'LASF'], streaming=True, mmap=True)
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import compas
+
+    print(find_format(compas.get_data('faces.obj')))
+
+    data = read_arrays(compas.get_data('faces.obj'))
+
+    print(len(data['vertices']), len(data['faces']))
@@ -2,6 +2,10 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import os
+import re
+import struct
+
 
 __author__    = ['Tom Van Mele', ]
 __copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
@@ -9,18 +13,270 @@ __license__   = 'MIT License'
 __email__     = 'vanmelet@ethz.ch'
 
 
-__all__ = []
+__all__ = [
+    'STL',
+    'STLReader',
+    'STLParser',
+    'STLWriter',
+]
+
+
+def _record():
+    # the 50-byte triangle record of a binary STL file
+    from numpy import dtype
+    return dtype([('normal', '<f4', (3, )), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
 
 
 class STL(object):
     """Standard triangle library format.
 
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    tolerance : float, optional
+        The distance under which the corners of the triangles are merged
+        into shared vertices. Default is ``0.0``, i.e. only identical
+        corners are merged.
+
     See Also
     --------
     * http://paulbourke.net/dataformats/stl/
 
     """
-    pass
+
+    def __init__(self, filepath, tolerance=0.0):
+        self.reader = STLReader(filepath)
+        self.parser = STLParser(self.reader, tolerance=tolerance)
+
+
+class STLReader(object):
+    """Read the triangles of a binary or ASCII *stl* file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
+    Attributes
+    ----------
+    binary : bool
+        True if the file is a binary file.
+    header : str
+        The 80-byte header of a binary file, or the name of the solid of an ASCII file.
+    normals : array
+        The normals of the triangles (m x 3).
+    triangles : array
+        The coordinates of the corners of the triangles (m x 3 x 3).
+    attributes : array
+        The attribute byte counts of the triangles of a binary file (m).
+
+    Notes
+    -----
+    A binary file is decoded with a single view of its triangle records.
+    A file is considered binary if its size matches the number of triangles in
+    its header, even if the header starts with ``solid``, as it often does.
+
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.binary = None
+        self.header = None
+        self.normals = None
+        self.triangles = None
+        self.attributes = None
+        self.read()
+
+    def is_binary(self):
+        size = os.path.getsize(self.filepath)
+        if size < 84:
+            return False
+        with open(self.filepath, 'rb') as fh:
+            fh.seek(80)
+            count, = struct.unpack('<I', fh.read(4))
+        return size == 84 + 50 * count
+
+    def read(self):
+        self.binary = self.is_binary()
+        if self.binary:
+            self.read_binary()
+        else:
+            self.read_ascii()
+
+    def read_binary(self):
+        from numpy import fromfile
+
+        with open(self.filepath, 'rb') as fh:
+            self.header = fh.read(80).rstrip(b'\x00 ').decode('ascii', 'replace')
+            fh.read(4)
+            records = fromfile(fh, dtype=_record())
+        self.normals = records['normal'].astype(float)
+        self.triangles = records['vertices'].astype(float)
+        self.attributes = records['attribute'].copy()
+
+    def read_ascii(self):
+        from numpy import array
+        from numpy import zeros
+
+        with open(self.filepath, 'rb') as fh:
+            data = fh.read()
+        match = re.match(br'\s*solid[ \t]*([^\r\n]*)', data)
+        self.header = match.group(1).strip().decode('ascii', 'replace') if match else ''
+        normals = re.findall(br'facet\s+normal\s+(\S+)\s+(\S+)\s+(\S+)', data)
+        vertices = re.findall(br'vertex\s+(\S+)\s+(\S+)\s+(\S+)', data)
+        self.normals = array(normals, dtype=float).reshape((-1, 3))
+        self.triangles = array(vertices, dtype=float).reshape((-1, 3, 3))
+        self.attributes = zeros(len(self.triangles), dtype=int)
+
+
+class STLParser(object):
+    """Convert the triangle soup of an :class:`STLReader` into shared vertices and faces.
+
+    Parameters
+    ----------
+    reader : STLReader
+        The reader.
+    tolerance : float, optional
+        The distance under which corners are merged.
+        Default is ``0.0``.
+
+    Attributes
+    ----------
+    vertices : array
+        The coordinates of the unique vertices (n x 3).
+    faces : array
+        The vertex indices of the triangles (m x 3).
+
+    Notes
+    -----
+    The corners are merged with :func:`compas.geometry.weld_points_numpy`.
+    Triangles of which two or more corners are merged, such as zero-area slivers,
+    are dropped.
+
+    """
+
+    def __init__(self, reader, tolerance=0.0):
+        self.reader = reader
+        self.tolerance = tolerance
+        self.vertices = None
+        self.faces = None
+        self.parse()
+
+    def parse(self):
+        from compas.geometry import weld_points_numpy
+
+        points = self.reader.triangles.reshape((-1, 3))
+        self.vertices, index = weld_points_numpy(points, self.tolerance)
+        faces = index.reshape((-1, 3))
+        # drop the triangles of which corners were merged
+        valid = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+        self.faces = faces[valid]
+
+
+class STLWriter(object):
+    """Write triangles to a binary or ASCII *stl* file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    vertices : array-like
+        The coordinates of the vertices (n x 3).
+    faces : array-like
+        The vertex indices of the faces.
+        This is either an array of triangles (m x 3),
+        or a sequence of polygons, which are triangulated as fans.
+    binary : bool, optional
+        Write a binary file. Default is ``True``.
+    name : str, optional
+        The name of the solid, written to the header.
+        Default is ``'compas'``.
+
+    Notes
+    -----
+    The normals of the triangles are computed from the vertices.
+    In a binary file, all triangle records are assembled in one array
+    and written with a single call.
+    ASCII files are written in blocks of triangles.
+
+    """
+
+    def __init__(self, filepath, vertices, faces, binary=True, name='compas'):
+        self.filepath = filepath
+        self.vertices = vertices
+        self.faces = faces
+        self.binary = binary
+        self.name = name
+
+    def _triangles(self):
+        from itertools import chain
+
+        from numpy import arange
+        from numpy import asarray
+        from numpy import column_stack
+        from numpy import cross
+        from numpy import cumsum
+        from numpy import fromiter
+        from numpy import int64
+        from numpy import repeat
+        from numpy.linalg import norm
+
+        xyz = asarray(self.vertices, dtype=float).reshape((-1, 3))
+        faces = self.faces
+        if hasattr(faces, 'ndim') and faces.ndim == 2 and faces.shape[1] == 3:
+            triangles = asarray(faces, dtype=int64)
+        else:
+            faces = list(faces)
+            sizes = fromiter((len(face) for face in faces), dtype=int64, count=len(faces))
+            corners = fromiter(chain.from_iterable(faces), dtype=int64, count=int(sizes.sum()))
+            fans = sizes - 2
+            fans[fans < 0] = 0
+            first = repeat(cumsum(sizes) - sizes, fans)
+            j = arange(int(fans.sum())) - repeat(cumsum(fans) - fans, fans)
+            triangles = column_stack((corners[first], corners[first + j + 1], corners[first + j + 2]))
+        points = xyz[triangles]
+        normals = cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+        lengths = norm(normals, axis=1)
+        lengths[lengths == 0] = 1.0
+        return normals / lengths[:, None], points
+
+    def write(self):
+        normals, points = self._triangles()
+        if self.binary:
+            self.write_binary(normals, points)
+        else:
+            self.write_ascii(normals, points)
+
+    def write_binary(self, normals, points):
+        from numpy import zeros
+
+        records = zeros(len(points), dtype=_record())
+        records['normal'] = normals
+        records['vertices'] = points
+        header = self.name.encode('ascii', 'replace')[:80]
+        with open(self.filepath, 'wb') as fh:
+            fh.write(header + b' ' * (80 - len(header)))
+            fh.write(struct.pack('<I', len(records)))
+            records.tofile(fh)
+
+    def write_ascii(self, normals, points):
+        from numpy import concatenate
+
+        facet = ('facet normal {:e} {:e} {:e}\n'
+                 '  outer loop\n'
+                 '    vertex {:e} {:e} {:e}\n'
+                 '    vertex {:e} {:e} {:e}\n'
+                 '    vertex {:e} {:e} {:e}\n'
+                 '  endloop\n'
+                 'endfacet\n')
+        rows = concatenate((normals, points.reshape((-1, 9))), axis=1)
+        with open(self.filepath, 'w') as fh:
+            fh.write('solid {}\n'.format(self.name))
+            for i in range(0, len(rows), 100000):
+                block = rows[i:i + 100000].tolist()
+                fh.write(''.join([facet.format(*row) for row in block]))
+            fh.write('endsolid {}\n'.format(self.name))
 
 
 # ==============================================================================
@@ -28,4 +284,18 @@ class STL(object):
 # ==============================================================================
 
 if __name__ == "__main__":
-    pass
+
+    import tempfile
+
+    vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]]
+    faces = [[0, 1, 2, 3]]
+
+    filepath = os.path.join(tempfile.gettempdir(), 'quad.stl')
+
+    STLWriter(filepath, vertices, faces).write()
+
+    stl = STL(filepath)
+
+    print(stl.reader.header)
+    print(stl.parser.vertices)
+    print(stl.parser.faces)
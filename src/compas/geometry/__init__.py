@@ -57,11 +57,16 @@ Algorithms
     flatness
     mesh_contours_numpy
     mesh_cull_duplicate_vertices
+    mesh_face_areas_numpy
+    mesh_face_centroids_numpy
+    mesh_face_normals_numpy
     mesh_flatness
     mesh_isolines_numpy
     mesh_planarize_faces
     mesh_planarize_faces_shapeop
     mesh_smooth_centroid
+    mesh_vertex_areas_numpy
+    mesh_vertex_normals_numpy
     network_parallelise_edges
     network_smooth_centroid
     oriented_bounding_box_numpy
@@ -71,6 +76,7 @@ Algorithms
     smooth_area
     smooth_centroid
     smooth_centerofmass
+    weld_points_numpy
 
 
 Functions
@@ -150,6 +156,10 @@ Distance
     closest_point_on_polyline_xy
     closest_point_on_segment
     closest_point_on_segment_xy
+    closest_points_on_lines_numpy
+    closest_points_on_planes_numpy
+    closest_points_on_polyline_numpy
+    closest_points_on_segments_numpy
     distance_line_line
     distance_point_line
     distance_point_line_xy
@@ -363,6 +373,7 @@ Classes
     :nosignatures:
 
     KDTree
+    BVH
 
 """
 
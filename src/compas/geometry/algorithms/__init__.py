@@ -2,30 +2,36 @@ from .bbox import *
 from .bbox_numpy import *
 from .bestfit import *
 from .boolean import *
+from .bvh_numpy import *
 from .geodesics import *
 from .hull import *
 from .hull_numpy import *
 from .interpolation import *
 from .isolines import *
+from .mesh_numpy import *
 from .parallelisation import *
 from .planarisation import *
 from .purging import *
 from .smoothing import *
 from .smoothing_cpp import *
+from .welding_numpy import *
 
 from .bbox import __all__ as a
 from .bbox_numpy import __all__ as aa
 from .bestfit import __all__ as b
 from .boolean import __all__ as c
+from .bvh_numpy import __all__ as cc
 from .geodesics import __all__ as d
 from .hull import __all__ as e
 from .hull_numpy import __all__ as ee
 from .interpolation import __all__ as f
 from .isolines import __all__ as g
+from .mesh_numpy import __all__ as gg
 from .parallelisation import __all__ as h
 from .planarisation import __all__ as i
 from .purging import __all__ as j
 from .smoothing import __all__ as k
 from .smoothing_cpp import __all__ as kk
+from .welding_numpy import __all__ as l
 
-__all__ = a + aa + b + d + e + ee + f + g + h + i + j + k + kk
+__all__ = a + aa + b + cc + d + e + ee + f + g + gg + h + i + j + k + kk + l
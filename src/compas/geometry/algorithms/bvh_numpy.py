@@ -0,0 +1,591 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+
+try:
+    from numpy import arange
+    from numpy import argpartition
+    from numpy import asarray
+    from numpy import concatenate
+    from numpy import cross
+    from numpy import cumsum
+    from numpy import einsum
+    from numpy import errstate
+    from numpy import fmax
+    from numpy import fmin
+    from numpy import full
+    from numpy import int64
+    from numpy import lexsort
+    from numpy import maximum
+    from numpy import minimum
+    from numpy import nan
+    from numpy import ones
+    from numpy import repeat
+    from numpy import sqrt
+    from numpy import unique
+    from numpy import where
+    from numpy import zeros
+
+except ImportError:
+    if 'ironpython' not in sys.version.lower():
+        raise
+
+
+__author__    = ['Tom Van Mele', ]
+__copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
+__license__   = 'MIT License'
+__email__     = 'vanmelet@ethz.ch'
+
+
+__all__ = [
+    'BVH',
+]
+
+
+# ==============================================================================
+# helpers
+# ==============================================================================
+
+
+def _triangulate(faces):
+    # fan triangles of the faces, and the face of every triangle
+    # rows of a 2D array may be padded with negative indices
+    if hasattr(faces, 'ndim') and faces.ndim == 2:
+        faces = asarray(faces, dtype=int64)
+        sizes = (faces >= 0).sum(axis=1)
+        corners = faces[faces >= 0]
+    else:
+        faces = [list(face) for face in faces]
+        sizes = asarray([len(face) for face in faces], dtype=int64)
+        corners = asarray([index for face in faces for index in face], dtype=int64)
+    fans = maximum(sizes - 2, 0)
+    first = repeat(cumsum(sizes) - sizes, fans)
+    j = arange(int(fans.sum())) - repeat(cumsum(fans) - fans, fans)
+    triangles = concatenate((corners[first], corners[first + j + 1], corners[first + j + 2])).reshape((3, -1)).T
+    return triangles, repeat(arange(len(sizes)), fans)
+
+
+def _expand(lo, hi):
+    # the concatenated ranges lo[i]:hi[i], and the range of every item
+    counts = hi - lo
+    owner = repeat(arange(len(lo)), counts)
+    items = arange(int(counts.sum())) - repeat(cumsum(counts) - counts, counts) + lo[owner]
+    return items, owner
+
+
+def _first(keys, values):
+    # the positions of the smallest value per key
+    order = lexsort((values, keys))
+    keys = keys[order]
+    first = ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    return order[first]
+
+
+def _closest_points_triangles(p, a, b, c):
+    """Compute the closest points on triangles to points, row by row.
+
+    The regions of the triangle (vertices, edges, interior) are identified
+    as described in Ericson, *Real-Time Collision Detection*, section 5.1.5.
+
+    """
+    ab = b - a
+    ac = c - a
+    ap = p - a
+    d1 = einsum('ij,ij->i', ab, ap)
+    d2 = einsum('ij,ij->i', ac, ap)
+    bp = p - b
+    d3 = einsum('ij,ij->i', ab, bp)
+    d4 = einsum('ij,ij->i', ac, bp)
+    cp = p - c
+    d5 = einsum('ij,ij->i', ab, cp)
+    d6 = einsum('ij,ij->i', ac, cp)
+
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    # barycentric coordinates of the closest points, region by region,
+    # from the interior to the vertices, the later regions taking precedence
+    with errstate(divide='ignore', invalid='ignore'):
+        denom = 1.0 / (va + vb + vc)
+        v = vb * denom
+        w = vc * denom
+        # edge bc
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        mask = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        v = where(mask, 1 - t, v)
+        w = where(mask, t, w)
+        # edge ac
+        t = d2 / (d2 - d6)
+        mask = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        v = where(mask, 0, v)
+        w = where(mask, t, w)
+        # edge ab
+        t = d1 / (d1 - d3)
+        mask = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        v = where(mask, t, v)
+        w = where(mask, 0, w)
+
+    # vertices
+    mask = (d6 >= 0) & (d5 <= d6)
+    v = where(mask, 0, v)
+    w = where(mask, 1, w)
+    mask = (d3 >= 0) & (d4 <= d3)
+    v = where(mask, 1, v)
+    w = where(mask, 0, w)
+    mask = (d1 <= 0) & (d2 <= 0)
+    v = where(mask, 0, v)
+    w = where(mask, 0, w)
+
+    # degenerate triangles
+    mask = (v != v) | (w != w)
+    v[mask] = 0
+    w[mask] = 0
+    return a + ab * v[:, None] + ac * w[:, None]
+
+
+# ==============================================================================
+# BVH
+# ==============================================================================
+
+
+class BVH(object):
+    """A bounding volume hierarchy of axis-aligned boxes over the faces of a mesh.
+
+    Parameters
+    ----------
+    vertices : array-like
+        The XYZ coordinates of the vertices (n x 3).
+    faces : array-like
+        The vertex indices of the faces.
+        Faces with more than three vertices are triangulated as fans.
+        Rows of a 2D array padded with negative indices are allowed.
+    leafsize : int, optional
+        The maximum number of triangles in a leaf.
+        Default is ``8``.
+
+    Attributes
+    ----------
+    vertices : array
+        The XYZ coordinates of the vertices (n x 3).
+    triangles : array
+        The vertex indices of the triangles (t x 3).
+    face : array
+        The index of the face of every triangle (t).
+    keys : list
+        The identifiers of the faces, if the hierarchy was built with :meth:`from_mesh`.
+        Otherwise ``None``.
+    bmin : array
+        The minimum coordinates of the boxes of the nodes (k x 3).
+    bmax : array
+        The maximum coordinates of the boxes of the nodes (k x 3).
+
+    Notes
+    -----
+    The hierarchy is stored in flat arrays. Nodes are split at the median of
+    the centroids of their triangles, along the axis with the largest extent.
+    The root is the first node, and every child comes after its parent.
+
+    All queries are batched: pairs of queries and nodes are tested against the
+    boxes level by level, in bulk, and pairs that can not produce a better
+    result than the one found so far are discarded.
+
+    Since the tree only depends on the topology, the boxes can be updated with
+    :meth:`refit` if the vertices move, without rebuilding the tree.
+
+    Examples
+    --------
+    >>> bvh = BVH.from_mesh(mesh)
+    >>> faces, points, distances = bvh.closest_point(cloud)
+    >>> faces, t, points = bvh.raycast(origins, directions)
+    >>> mesh.set_vertices_attributes('xyz', relaxed)
+    >>> bvh.refit(relaxed)
+
+    """
+
+    def __init__(self, vertices, faces, leafsize=8):
+        self.leafsize = max(1, leafsize)
+        self.vertices = asarray(vertices, dtype=float).reshape((-1, 3))
+        self.triangles, self.face = _triangulate(faces)
+        self.keys = None
+        self.order = None
+        self.lo = None
+        self.hi = None
+        self.left = None
+        self.right = None
+        self.depth = None
+        self.bmin = None
+        self.bmax = None
+        self.build()
+
+    @classmethod
+    def from_mesh(cls, mesh, leafsize=8):
+        """Construct a hierarchy over the faces of a mesh.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            A mesh object.
+        leafsize : int, optional
+            The maximum number of triangles in a leaf.
+            Default is ``8``.
+
+        Returns
+        -------
+        BVH
+            The hierarchy. The face indices returned by its queries
+            refer to the face identifiers in ``keys``.
+
+        """
+        key_index = mesh.key_index()
+        keys = list(mesh.faces())
+        faces = [[key_index[key] for key in mesh.face_vertices(fkey)] for fkey in keys]
+        bvh = cls(mesh.get_vertices_attributes('xyz'), faces, leafsize=leafsize)
+        bvh.keys = keys
+        return bvh
+
+    def __len__(self):
+        return len(self.triangles)
+
+    # --------------------------------------------------------------------------
+    # construction
+    # --------------------------------------------------------------------------
+
+    def build(self):
+        """Build the tree, and compute the boxes of its nodes."""
+        points = self.vertices[self.triangles]
+        centroids = points.mean(axis=1)
+        order = arange(len(centroids))
+        lo, hi, left, right, depth = [], [], [], [], []
+        stack = [(0, len(order), -1, None, 0)]
+        while stack:
+            start, stop, parent, side, level = stack.pop()
+            node = len(lo)
+            lo.append(start)
+            hi.append(stop)
+            left.append(-1)
+            right.append(-1)
+            depth.append(level)
+            if parent >= 0:
+                side[parent] = node
+            if stop - start <= self.leafsize:
+                continue
+            c = centroids[order[start:stop]]
+            axis = (c.max(axis=0) - c.min(axis=0)).argmax()
+            mid = (stop - start) // 2
+            order[start:stop] = order[start:stop][argpartition(c[:, axis], mid)]
+            stack.append((start + mid, stop, node, right, level + 1))
+            stack.append((start, start + mid, node, left, level + 1))
+        self.order = order
+        self.lo = asarray(lo, dtype=int64)
+        self.hi = asarray(hi, dtype=int64)
+        self.left = asarray(left, dtype=int64)
+        self.right = asarray(right, dtype=int64)
+        self.depth = asarray(depth, dtype=int64)
+        self.refit()
+
+    def refit(self, vertices=None):
+        """Update the boxes of the nodes to (new) vertex coordinates.
+
+        Parameters
+        ----------
+        vertices : array-like, optional
+            The new XYZ coordinates of the vertices (n x 3).
+            Default is ``None``, in which case the current coordinates are used.
+
+        Notes
+        -----
+        The tree itself is not changed. Refitting is much cheaper than rebuilding,
+        but the queries become slower if the vertices move a lot.
+
+        """
+        if vertices is not None:
+            self.vertices = asarray(vertices, dtype=float).reshape((-1, 3))
+        n = len(self.lo)
+        self.bmin = zeros((n, 3))
+        self.bmax = zeros((n, 3))
+        if not len(self.triangles):
+            return
+        points = self.vertices[self.triangles[self.order]]
+        tmin = points.min(axis=1)
+        tmax = points.max(axis=1)
+        leaves = where(self.left < 0)[0]
+        leaves = leaves[self.lo[leaves].argsort()]
+        self.bmin[leaves] = minimum.reduceat(tmin, self.lo[leaves], axis=0)
+        self.bmax[leaves] = maximum.reduceat(tmax, self.lo[leaves], axis=0)
+        nodes = where(self.left >= 0)[0]
+        for level in range(self.depth.max(), -1, -1):
+            level = nodes[self.depth[nodes] == level]
+            self.bmin[level] = minimum(self.bmin[self.left[level]], self.bmin[self.right[level]])
+            self.bmax[level] = maximum(self.bmax[self.left[level]], self.bmax[self.right[level]])
+
+    def _faces(self, triangles):
+        faces = self.face[triangles]
+        if self.keys is not None:
+            return [self.keys[index] for index in faces.tolist()]
+        return faces
+
+    def _leaves(self, q, nodes):
+        # expand pairs of queries and leaves into pairs of queries and triangles
+        items, owner = _expand(self.lo[nodes], self.hi[nodes])
+        return q[owner], self.order[items]
+
+    # --------------------------------------------------------------------------
+    # queries
+    # --------------------------------------------------------------------------
+
+    def raycast(self, origins, directions, chunksize=2 ** 14):
+        """Find the first intersection of rays with the faces.
+
+        Parameters
+        ----------
+        origins : array-like
+            The start points of the rays (n x 3).
+        directions : array-like
+            The directions of the rays (n x 3).
+        chunksize : int, optional
+            The number of rays that is processed at once.
+            Default is ``2 ** 14``.
+
+        Returns
+        -------
+        tuple
+            * The faces that are hit (n), or ``-1`` (``None`` for a mesh) if a ray does not hit the mesh.
+            * The ray parameters of the hits (n), such that the hit points are
+              ``origins + t * directions``, or ``inf``.
+            * The hit points (n x 3), or ``nan``.
+
+        Notes
+        -----
+        Only intersections in the direction of the rays are found (``t >= 0``).
+        The triangles are intersected with the Moeller-Trumbore algorithm.
+
+        """
+        origins = asarray(origins, dtype=float).reshape((-1, 3))
+        directions = asarray(directions, dtype=float).reshape((-1, 3))
+        n = len(origins)
+        best_t = full(n, float('inf'))
+        best_f = full(n, -1, dtype=int64)
+        if len(self.triangles):
+            for start in range(0, n, chunksize):
+                self._raycast(origins, directions, arange(start, min(n, start + chunksize)), best_t, best_f)
+        points = full((n, 3), nan)
+        hit = best_f >= 0
+        points[hit] = origins[hit] + best_t[hit, None] * directions[hit]
+        faces = self._faces(best_f[hit])
+        if self.keys is not None:
+            keys = [None] * n
+            for i, key in zip(where(hit)[0].tolist(), faces):
+                keys[i] = key
+            return keys, best_t, points
+        result = full(n, -1, dtype=int64)
+        result[hit] = faces
+        return result, best_t, points
+
+    def _raycast(self, origins, directions, q, best_t, best_f):
+        with errstate(divide='ignore', invalid='ignore'):
+            inverse = 1.0 / directions
+        nodes = zeros(len(q), dtype=int64)
+        while len(q):
+            with errstate(invalid='ignore'):
+                t1 = (self.bmin[nodes] - origins[q]) * inverse[q]
+                t2 = (self.bmax[nodes] - origins[q]) * inverse[q]
+            tmin = fmax.reduce(fmin(t1, t2), axis=1)
+            tmax = fmin.reduce(fmax(t1, t2), axis=1)
+            keep = (tmax >= maximum(tmin, 0)) & (tmin <= best_t[q])
+            q = q[keep]
+            nodes = nodes[keep]
+            leaf = self.left[nodes] < 0
+            if leaf.any():
+                tq, tt = self._leaves(q[leaf], nodes[leaf])
+                t = self._intersect(origins[tq], directions[tq], tt)
+                hit = t < best_t[tq]
+                tq, tt, t = tq[hit], tt[hit], t[hit]
+                if len(tq):
+                    first = _first(tq, t)
+                    tq, tt, t = tq[first], tt[first], t[first]
+                    best_t[tq] = t
+                    best_f[tq] = tt
+            q = q[~leaf]
+            nodes = nodes[~leaf]
+            q = concatenate((q, q))
+            nodes = concatenate((self.left[nodes], self.right[nodes]))
+
+    def _intersect(self, o, d, triangles, epsilon=1e-12):
+        a, b, c = [self.vertices[self.triangles[triangles, i]] for i in range(3)]
+        e1 = b - a
+        e2 = c - a
+        p = cross(d, e2)
+        det = einsum('ij,ij->i', e1, p)
+        with errstate(divide='ignore', invalid='ignore'):
+            inv = 1.0 / det
+            s = o - a
+            u = einsum('ij,ij->i', s, p) * inv
+            qv = cross(s, e1)
+            v = einsum('ij,ij->i', d, qv) * inv
+            t = einsum('ij,ij->i', e2, qv) * inv
+        valid = (abs(det) > epsilon) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+        return where(valid, t, float('inf'))
+
+    def closest_point(self, points, chunksize=2 ** 14):
+        """Find the closest points on the faces to a set of points.
+
+        Parameters
+        ----------
+        points : array-like
+            The XYZ coordinates of the points (n x 3).
+        chunksize : int, optional
+            The number of points that is processed at once.
+            Default is ``2 ** 14``.
+
+        Returns
+        -------
+        tuple
+            * The faces of the closest points (n).
+            * The closest points (n x 3).
+            * The distances to the closest points (n).
+
+        Notes
+        -----
+        Every point first descends to its nearest leaf, and the distance to the
+        triangles of that leaf is used as the initial bound.
+        Pairs of points and boxes farther than the bound of the point are discarded.
+
+        """
+        points = asarray(points, dtype=float).reshape((-1, 3))
+        n = len(points)
+        best_d = full(n, float('inf'))
+        best_f = full(n, -1, dtype=int64)
+        closest = full((n, 3), nan)
+        if len(self.triangles):
+            for start in range(0, n, chunksize):
+                self._closest(points, arange(start, min(n, start + chunksize)), best_d, best_f, closest)
+        found = best_f >= 0
+        faces = self._faces(best_f[found])
+        if self.keys is not None:
+            result = [None] * n
+            for i, key in zip(where(found)[0].tolist(), faces):
+                result[i] = key
+        else:
+            result = full(n, -1, dtype=int64)
+            result[found] = faces
+        return result, closest, sqrt(best_d)
+
+    def _near(self, p, nodes):
+        # squared distances of points to the boxes of nodes
+        near = maximum(maximum(self.bmin[nodes] - p, p - self.bmax[nodes]), 0)
+        return einsum('ij,ij->i', near, near)
+
+    def _update(self, points, tq, tt, best_d, best_f, closest):
+        # keep the closest of the candidate triangles per point
+        a, b, c = [self.vertices[self.triangles[tt, i]] for i in range(3)]
+        x = _closest_points_triangles(points[tq], a, b, c)
+        d = x - points[tq]
+        d = einsum('ij,ij->i', d, d)
+        better = d < best_d[tq]
+        tq, tt, x, d = tq[better], tt[better], x[better], d[better]
+        if len(tq):
+            first = _first(tq, d)
+            tq, tt, x, d = tq[first], tt[first], x[first], d[first]
+            best_d[tq] = d
+            best_f[tq] = tt
+            closest[tq] = x
+
+    def _descend(self, points, q, nodes, best_d, best_f, closest):
+        # descend from nodes to their nearest leaves, and update the closest points
+        inner = self.left[nodes] >= 0
+        while inner.any():
+            left = self.left[nodes[inner]]
+            right = self.right[nodes[inner]]
+            p = points[q[inner]]
+            nodes[inner] = where(self._near(p, left) <= self._near(p, right), left, right)
+            inner = self.left[nodes] >= 0
+        self._update(points, *self._leaves(q, nodes), best_d=best_d, best_f=best_f, closest=closest)
+
+    def _closest(self, points, q, best_d, best_f, closest):
+        # squared distances throughout
+        nodes = zeros(len(q), dtype=int64)
+        while len(q):
+            near = self._near(points[q], nodes)
+            # tighten the bounds by descending from the nearest node of every point
+            first = _first(q, near)
+            self._descend(points, q[first], nodes[first].copy(), best_d, best_f, closest)
+            keep = near < best_d[q]
+            q = q[keep]
+            nodes = nodes[keep]
+            leaf = self.left[nodes] < 0
+            if leaf.any():
+                self._update(points, *self._leaves(q[leaf], nodes[leaf]), best_d=best_d, best_f=best_f, closest=closest)
+            q = q[~leaf]
+            nodes = nodes[~leaf]
+            q = concatenate((q, q))
+            nodes = concatenate((self.left[nodes], self.right[nodes]))
+
+    def faces_in_box(self, bmin, bmax):
+        """Find the faces of which the bounding box overlaps a given box.
+
+        Parameters
+        ----------
+        bmin : list
+            The minimum XYZ coordinates of the box.
+        bmax : list
+            The maximum XYZ coordinates of the box.
+
+        Returns
+        -------
+        list
+            The faces.
+
+        """
+        bmin = asarray(bmin, dtype=float)
+        bmax = asarray(bmax, dtype=float)
+        if not len(self.triangles):
+            return []
+        nodes = zeros(1, dtype=int64)
+        found = []
+        while len(nodes):
+            keep = ((self.bmin[nodes] <= bmax) & (self.bmax[nodes] >= bmin)).all(axis=1)
+            nodes = nodes[keep]
+            leaf = self.left[nodes] < 0
+            if leaf.any():
+                items, _ = _expand(self.lo[nodes[leaf]], self.hi[nodes[leaf]])
+                triangles = self.order[items]
+                points = self.vertices[self.triangles[triangles]]
+                overlap = ((points.min(axis=1) <= bmax) & (points.max(axis=1) >= bmin)).all(axis=1)
+                found.append(triangles[overlap])
+            nodes = nodes[~leaf]
+            nodes = concatenate((self.left[nodes], self.right[nodes]))
+        if not found:
+            return []
+        faces = unique(self.face[concatenate(found)])
+        if self.keys is not None:
+            return [self.keys[index] for index in faces.tolist()]
+        return faces.tolist()
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import compas
+
+    from compas.datastructures import Mesh
+
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+
+    bvh = BVH.from_mesh(mesh)
+
+    faces, t, points = bvh.raycast([[5.0, 5.0, 10.0]], [[0.0, 0.0, -1.0]])
+
+    print(faces, t, points)
+
+    faces, points, distances = bvh.closest_point([[5.0, 5.0, 1.0], [-1.0, -1.0, 0.0]])
+
+    print(faces, points, distances)
+
+    print(bvh.faces_in_box([0.0, 0.0, -1.0], [2.0, 2.0, 1.0]))
@@ -0,0 +1,277 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+
+try:
+    from numpy import arange
+    from numpy import array
+    from numpy import bincount
+    from numpy import cross
+    from numpy import int64
+    from numpy import repeat
+    from numpy import zeros
+    from numpy.linalg import norm
+
+except ImportError:
+    if 'ironpython' not in sys.version.lower():
+        raise
+
+
+__author__    = ['Tom Van Mele', ]
+__copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
+__license__   = 'MIT License'
+__email__     = 'vanmelet@ethz.ch'
+
+
+__all__ = [
+    'mesh_face_normals_numpy',
+    'mesh_face_areas_numpy',
+    'mesh_face_centroids_numpy',
+    'mesh_vertex_normals_numpy',
+    'mesh_vertex_areas_numpy',
+]
+
+
+# ==============================================================================
+# helpers
+# ==============================================================================
+
+
+def _mesh_arrays(mesh):
+    """Gather the vertex coordinates and the (flattened) face vertices of a mesh.
+
+    Returns
+    -------
+    tuple
+        * The vertex coordinates (v x 3), in the order of ``mesh.key_index()``.
+        * The vertex index of every face corner (c).
+        * The vertex index of the next corner of every face corner (c).
+        * The face index of every face corner (c), in the order of ``mesh.faces()``.
+        * The number of vertices of every face (f).
+
+    """
+    key_index = mesh.key_index()
+    xyz = array([mesh.vertex_coordinates(key) for key in mesh.vertices()], dtype=float).reshape((-1, 3))
+
+    corners = []
+    following = []
+    sizes = []
+    for fkey in mesh.faces():
+        vertices = [key_index[key] for key in mesh.face_vertices(fkey)]
+        corners.extend(vertices)
+        following.extend(vertices[1:] + vertices[:1])
+        sizes.append(len(vertices))
+
+    sizes = array(sizes, dtype=int64)
+    corners = array(corners, dtype=int64)
+    following = array(following, dtype=int64)
+    faces = repeat(arange(len(sizes), dtype=int64), sizes)
+    return xyz, corners, following, faces, sizes
+
+
+def _sum_rows(values, index, n):
+    """Sum the rows of a (c x 3) array per group index."""
+    out = zeros((n, 3))
+    for axis in range(3):
+        out[:, axis] = bincount(index, weights=values[:, axis], minlength=n)
+    return out
+
+
+def _face_centroids(xyz, corners, faces, sizes):
+    return _sum_rows(xyz[corners], faces, len(sizes)) / sizes[:, None]
+
+
+def _face_fans(xyz, corners, following, faces, sizes):
+    """Compute the cross products of the triangles of the centroid fans of the faces."""
+    c = _face_centroids(xyz, corners, faces, sizes)
+    a = xyz[corners] - c[faces]
+    b = xyz[following] - c[faces]
+    return cross(a, b), c
+
+
+def _unitize(vectors):
+    lengths = norm(vectors, axis=1)
+    lengths[lengths == 0] = 1.0
+    return vectors / lengths[:, None]
+
+
+# ==============================================================================
+# faces
+# ==============================================================================
+
+
+def mesh_face_normals_numpy(mesh, unitized=True):
+    """Compute the normals of all faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    unitized : bool, optional
+        Unitize the normal vectors.
+        Default is ``True``.
+
+    Returns
+    -------
+    array
+        The normal vectors of the faces (f x 3), in the order of ``mesh.faces()``.
+
+    Notes
+    -----
+    Polygonal faces are decomposed in a fan of triangles around the face centroid,
+    as in :func:`compas.geometry.normal_polygon`.
+
+    See Also
+    --------
+    * :meth:`compas.datastructures.Mesh.face_normal`
+
+    Examples
+    --------
+    >>> import compas
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_obj(compas.get('faces.obj'))
+    >>> normals = mesh_face_normals_numpy(mesh)
+
+    """
+    xyz, corners, following, faces, sizes = _mesh_arrays(mesh)
+    fans, _ = _face_fans(xyz, corners, following, faces, sizes)
+    normals = _sum_rows(fans, faces, len(sizes))
+    if unitized:
+        return _unitize(normals)
+    return normals
+
+
+def mesh_face_areas_numpy(mesh):
+    """Compute the areas of all faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        The areas of the faces (f), in the order of ``mesh.faces()``.
+
+    Notes
+    -----
+    Polygonal faces are decomposed in a fan of triangles around the face centroid,
+    as in :func:`compas.geometry.area_polygon`.
+
+    See Also
+    --------
+    * :meth:`compas.datastructures.Mesh.face_area`
+
+    """
+    xyz, corners, following, faces, sizes = _mesh_arrays(mesh)
+    fans, _ = _face_fans(xyz, corners, following, faces, sizes)
+    return 0.5 * bincount(faces, weights=norm(fans, axis=1), minlength=len(sizes))
+
+
+def mesh_face_centroids_numpy(mesh):
+    """Compute the centroids of all faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        The centroids of the faces (f x 3), in the order of ``mesh.faces()``.
+
+    See Also
+    --------
+    * :meth:`compas.datastructures.Mesh.face_centroid`
+
+    """
+    xyz, corners, following, faces, sizes = _mesh_arrays(mesh)
+    return _face_centroids(xyz, corners, faces, sizes)
+
+
+# ==============================================================================
+# vertices
+# ==============================================================================
+
+
+def mesh_vertex_normals_numpy(mesh):
+    """Compute the normals of all vertices of a mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        The normal vectors of the vertices (v x 3), aligned with ``mesh.key_index()``.
+
+    Notes
+    -----
+    The normal of a vertex is the normalised average of the unit normals of its faces.
+    Vertices without faces get a zero vector.
+
+    See Also
+    --------
+    * :meth:`compas.datastructures.Mesh.vertex_normal`
+
+    """
+    xyz, corners, following, faces, sizes = _mesh_arrays(mesh)
+    fans, _ = _face_fans(xyz, corners, following, faces, sizes)
+    normals = _unitize(_sum_rows(fans, faces, len(sizes)))
+    return _unitize(_sum_rows(normals[faces], corners, len(xyz)))
+
+
+def mesh_vertex_areas_numpy(mesh):
+    """Compute the tributary areas of all vertices of a mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        The areas of the vertices (v), aligned with ``mesh.key_index()``.
+
+    Notes
+    -----
+    The area of a vertex is computed as in :meth:`compas.datastructures.Mesh.vertex_area`,
+    i.e. from the triangles formed by the vertex, the midpoints of its edges and the
+    centroids of its faces.
+
+    See Also
+    --------
+    * :meth:`compas.datastructures.Mesh.vertex_area`
+
+    """
+    xyz, corners, following, faces, sizes = _mesh_arrays(mesh)
+    c = _face_centroids(xyz, corners, faces, sizes)
+    u = xyz[corners]
+    v = xyz[following]
+    t = norm(cross(v - u, c[faces] - u), axis=1)
+    n = len(xyz)
+    return 0.25 * (bincount(corners, weights=t, minlength=n) + bincount(following, weights=t, minlength=n))
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import compas
+    from compas.datastructures import Mesh
+
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+
+    print(mesh_face_normals_numpy(mesh))
+    print(mesh_face_areas_numpy(mesh))
+    print(mesh_vertex_normals_numpy(mesh))
+    print(mesh_vertex_areas_numpy(mesh))
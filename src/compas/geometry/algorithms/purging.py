@@ -16,7 +16,7 @@ __all__ = [
 ]
 
 
-def mesh_cull_duplicate_vertices(mesh, precision='3f'):
+def mesh_cull_duplicate_vertices(mesh, precision='3f', tolerance=None):
     """Cull all duplicate vertices of a mesh and sanitize affected faces.
 
     Parameters
@@ -28,45 +28,69 @@ def mesh_cull_duplicate_vertices(mesh, precision='3f'):
         individual numbers in the string (truncation after the decimal point).
         Supported values are any float precision, or decimal integer (``'d'``).
         Default is ``'3f'``.
+    tolerance (float): Optional.
+        If provided, vertices closer to each other than this distance are considered duplicates,
+        as determined by :func:`compas.geometry.weld_points_numpy`,
+        and ``precision`` is ignored.
     """
 
-    geo_keys = {}
-    keys_geo = {}
     keys_pointer = {}
-    for key in mesh.vertices():
-        geo_key = geometric_key(mesh.vertex_coordinates(key), precision)
-        if geo_key in geo_keys:
-            keys_pointer[key] = geo_keys[geo_key]
-        else:
-            geo_keys[geo_key] = key
-            keys_geo[key] = geo_key
-
-    keys_remain = geo_keys.values()
-    keys_del = [key for key in mesh.vertices() if key not in keys_remain]
-
-    # delete vertices
-    for key in keys_del:
-        del mesh.vertex[key]
-
-    # sanitize affected faces
-    new_faces = {}
-    for fkey in mesh.faces():
-        face = []
-        seen = set()
-        for key in mesh.face_vertices(fkey):
-            if key in keys_pointer:
-                pointer = keys_pointer[key]
-                if pointer not in seen:
-                    face.append(pointer)
-                    seen.add(pointer)
+    if tolerance is not None:
+        from compas.geometry import weld_points_numpy
+
+        keys = list(mesh.vertices())
+        _, index = weld_points_numpy([mesh.vertex_coordinates(key) for key in keys], tolerance)
+        first = {}
+        for key, i in zip(keys, index.tolist()):
+            if i in first:
+                keys_pointer[key] = first[i]
             else:
-                face.append(key)
-        if seen:
-            new_faces[fkey] = face
-
-    for fkey in new_faces:
-        del mesh.face[fkey]
-        mesh.add_face(new_faces[fkey], fkey)
+                first[i] = key
+        keys_del = list(keys_pointer)
+    else:
+        geo_keys = {}
+        keys_geo = {}
+        for key in mesh.vertices():
+            geo_key = geometric_key(mesh.vertex_coordinates(key), precision)
+            if geo_key in geo_keys:
+                keys_pointer[key] = geo_keys[geo_key]
+            else:
+                geo_keys[geo_key] = key
+                keys_geo[key] = geo_key
+
+        keys_remain = geo_keys.values()
+        keys_del = [key for key in mesh.vertices() if key not in keys_remain]
+
+    mesh._invalidate_topology()
+    scope = mesh._begin_change(mesh.vertices())
+    try:
+        # delete vertices
+        for key in keys_del:
+            del mesh.vertex[key]
+
+        # sanitize affected faces
+        new_faces = {}
+        for fkey in mesh.faces():
+            face = []
+            seen = set()
+            for key in mesh.face_vertices(fkey):
+                if key in keys_pointer:
+                    pointer = keys_pointer[key]
+                    if pointer not in seen:
+                        face.append(pointer)
+                        seen.add(pointer)
+                else:
+                    face.append(key)
+            if seen:
+                new_faces[fkey] = face
+
+        for fkey in new_faces:
+            del mesh.face[fkey]
+            mesh.add_face(new_faces[fkey], fkey)
+
+        mesh._update_edges(list(mesh.edge))
+    finally:
+        mesh._end_change(scope)
 
 
 # ==============================================================================
@@ -0,0 +1,235 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+
+try:
+    from numpy import arange
+    from numpy import argsort
+    from numpy import ascontiguousarray
+    from numpy import asarray
+    from numpy import concatenate
+    from numpy import cumsum
+    from numpy import empty
+    from numpy import floor
+    from numpy import int64
+    from numpy import lexsort
+    from numpy import maximum
+    from numpy import minimum
+    from numpy import nonzero
+    from numpy import ones
+    from numpy import repeat
+    from numpy import searchsorted
+    from numpy import sort
+    from numpy import uint64
+    from numpy import unique
+    from numpy import zeros
+
+except ImportError:
+    if 'ironpython' not in sys.version.lower():
+        raise
+
+
+__author__    = ['Tom Van Mele', ]
+__copyright__ = 'Copyright 2016 - Block Research Group, ETH Zurich'
+__license__   = 'MIT License'
+__email__     = 'vanmelet@ethz.ch'
+
+
+__all__ = [
+    'weld_points_numpy',
+]
+
+
+# multipliers of the (linear) hash of the grid cells
+# collisions only produce additional candidate pairs, which are rejected by the distance check
+
+HASH = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9)
+
+# the cell itself and half of its 26 neighbours
+# such that every pair of neighbouring cells is visited once
+
+OFFSETS = [(0, 0, 0)] + [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1) if (i, j, k) > (0, 0, 0)]
+
+
+# ==============================================================================
+# helpers
+# ==============================================================================
+
+
+def _unique_rows(points):
+    """Identify exact duplicates, keeping the points in order of first occurrence."""
+    # sort by a hash of the bits of the coordinates
+    # and fall back to a lexicographic sort if different points have the same hash
+    bits = ascontiguousarray(points + 0.0).view(uint64)
+    keys = bits[:, 0] * uint64(HASH[0]) + bits[:, 1] * uint64(HASH[1]) + bits[:, 2] * uint64(HASH[2])
+    order = argsort(keys)
+    keys = keys[order]
+    rows = bits[order]
+    new = ones(len(rows), dtype=bool)
+    new[1:] = keys[1:] != keys[:-1]
+    if ((rows[1:] != rows[:-1]).any(axis=1) & ~new[1:]).any():
+        order = lexsort((points[:, 2], points[:, 1], points[:, 0]))
+        rows = points[order]
+        new[1:] = (rows[1:] != rows[:-1]).any(axis=1)
+    group = empty(len(rows), dtype=int64)
+    group[order] = cumsum(new) - 1
+    first = minimum.reduceat(order, nonzero(new)[0])
+    rank = empty(len(first), dtype=int64)
+    rank[argsort(first, kind='mergesort')] = arange(len(first))
+    return points[sort(first)], rank[group]
+
+
+def _cell_pairs(start, count, other, other_count, same):
+    """Enumerate all pairs of points of two lists of cells of the sorted points."""
+    sizes = count * other_count
+    total = int(sizes.sum())
+    if not total:
+        return empty(0, dtype=int64), empty(0, dtype=int64)
+    cell = repeat(arange(len(sizes)), sizes)
+    t = arange(total) - repeat(cumsum(sizes) - sizes, sizes)
+    i = start[cell] + t // other_count[cell]
+    j = other[cell] + t % other_count[cell]
+    if same:
+        keep = i < j
+        i = i[keep]
+        j = j[keep]
+    return i, j
+
+
+def _close_pairs(points, tolerance):
+    """Find all pairs of points with a distance smaller than or equal to the tolerance.
+
+    Returns
+    -------
+    tuple
+        Two arrays of point indices ``i`` and ``j``, with ``i < j``,
+        sorted by ``j`` and then by ``i``.
+
+    """
+    cells = floor(points / tolerance).astype(int64).view(uint64)
+    keys = cells[:, 0] * uint64(HASH[0]) + cells[:, 1] * uint64(HASH[1]) + cells[:, 2] * uint64(HASH[2])
+
+    order = argsort(keys)
+    keys = keys[order]
+    ukeys, start, count = unique(keys, return_index=True, return_counts=True)
+
+    squared = tolerance ** 2
+    found_i = []
+    found_j = []
+    for offset in OFFSETS:
+        delta = uint64(sum(d * h for d, h in zip(offset, HASH)) % (1 << 64))
+        if offset == (0, 0, 0):
+            i, j = _cell_pairs(start, count, start, count, True)
+        else:
+            target = ukeys + delta
+            index = searchsorted(ukeys, target)
+            index[index == len(ukeys)] = 0
+            hit = nonzero(ukeys[index] == target)[0]
+            i, j = _cell_pairs(start[hit], count[hit], start[index[hit]], count[index[hit]], False)
+        i = order[i]
+        j = order[j]
+        d = points[i] - points[j]
+        close = (d ** 2).sum(axis=1) <= squared
+        found_i.append(i[close])
+        found_j.append(j[close])
+
+    i = concatenate(found_i)
+    j = concatenate(found_j)
+    pairs = unique(maximum(i, j) * len(points) + minimum(i, j))
+    return pairs % len(points), pairs // len(points)
+
+
+# ==============================================================================
+# welding
+# ==============================================================================
+
+
+def weld_points_numpy(points, tolerance=1e-3):
+    """Merge points that are closer to each other than a given tolerance.
+
+    Parameters
+    ----------
+    points : array-like
+        XYZ coordinates of the points (n x 3).
+    tolerance : float, optional
+        The absolute distance under which two points are considered identical.
+        With a tolerance of zero, only exact duplicates are merged.
+        Default is ``1e-3``.
+
+    Returns
+    -------
+    tuple
+        * The coordinates of the unique points (k x 3).
+        * The index of the unique point of every input point (n).
+
+    Notes
+    -----
+    The points are processed in the order in which they are provided.
+    Every point is merged with the first earlier unique point within the tolerance,
+    or becomes a unique point itself if there is none.
+    Therefore, every point is within the tolerance of its unique point,
+    the unique points are further apart than the tolerance,
+    and the unique points are in order of first occurrence.
+
+    Candidate pairs of points are found by hashing the points into a grid with cells
+    the size of the tolerance, and checking the neighbouring cells.
+    Unlike with :func:`compas.utilities.geometric_key`, points on either side of a
+    rounding boundary are therefore matched correctly.
+    The tolerance should be small compared to the distance between distinct points,
+    since all pairs of points in neighbouring cells are checked.
+
+    Examples
+    --------
+    >>> points = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0004, 0.0, 0.0], [0.9996, 0.0, 0.0]]
+    >>> unique_points, index = weld_points_numpy(points, tolerance=1e-3)
+    >>> index
+    array([0, 1, 0, 1])
+
+    """
+    points = asarray(points, dtype=float).reshape((-1, 3))
+    if not len(points):
+        return points.copy(), zeros(0, dtype=int64)
+
+    points, index = _unique_rows(points)
+
+    if tolerance > 0 and len(points) > 1:
+        i, j = _close_pairs(points, tolerance)
+        if len(i):
+            # every point is merged with the first earlier point that is not merged itself
+            merged = zeros(len(points), dtype=bool)
+            merged[j] = True
+            if not merged[i].any():
+                # no point is both merged and merged with
+                rep = arange(len(points))
+                _, first = unique(j, return_index=True)
+                rep[j[first]] = i[first]
+            else:
+                rep = list(range(len(points)))
+                for a, b in zip(i.tolist(), j.tolist()):
+                    if rep[b] == b and rep[a] == a:
+                        rep[b] = a
+                rep = asarray(rep, dtype=int64)
+            unique_ = rep == arange(len(points))
+            new = cumsum(unique_) - 1
+            index = new[rep][index]
+            points = points[unique_]
+
+    return points, index
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    from numpy.random import rand
+
+    points = rand(10000, 3)
+    points = concatenate((points, points + 1e-5 * rand(10000, 3)))
+
+    unique_points, index = weld_points_numpy(points, tolerance=1e-3)
+
+    print(len(points), len(unique_points))
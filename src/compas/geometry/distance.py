@@ -50,6 +50,10 @@ __all__ = [
     'closest_point_on_polyline',
     'closest_point_on_polyline_xy',
     'closest_point_on_plane',
+    'closest_points_on_lines_numpy',
+    'closest_points_on_segments_numpy',
+    'closest_points_on_polyline_numpy',
+    'closest_points_on_planes_numpy',
 ]
 
 
@@ -521,7 +525,7 @@ def closest_point_in_cloud(point, cloud):
     return data[0]
 
 
-def closest_points_in_cloud_numpy(points, cloud, threshold=10**7, distances=True, num_nbrs=1):
+def closest_points_in_cloud_numpy(points, cloud, threshold=10**7, distances=True, num_nbrs=1, memory=2**27, threads=None):
     """Find the closest points in a point cloud to a set of sample points.
 
     Parameters
@@ -529,50 +533,158 @@ def closest_points_in_cloud_numpy(points, cloud, threshold=10**7, distances=True
     points : array, list
         The sample points (n,).
     cloud : array, list
-        The cloud points to compare to (n,).
-    threshold : float
+        The cloud points to compare to (m,).
+    threshold : float, optional
         Points are checked within this distance.
-    distances : bool
-        Return distance matrix.
+        Default is ``10**7``.
+    distances : bool, optional
+        Return the distances to the closest points.
+        Default is ``True``.
+    num_nbrs : int, optional
+        The number of closest points per sample point.
+        Default is ``1``.
+    memory : int, optional
+        The maximum number of bytes used for blocks of distances at any time.
+        Default is ``2**27``.
+    threads : int, optional
+        The number of threads over which the blocks of sample points are spread.
+        Default is ``None``, in which case all cores are used.
 
     Returns
     -------
-    list
-        Indices of the closest points in the cloud per point in points.
     array
-        Distances between points and closest points in cloud (n x n).
+        Indices of the closest points in the cloud per point in points,
+        sorted by distance (n) or (n x num_nbrs).
+    array
+        Distances between points and closest points in cloud (n) or (n x num_nbrs).
 
     Notes
     -----
-    Items in cloud further from items in points than threshold return zero
-    distance and will affect the indices returned if not set suitably high.
+    The distances are computed for one block of sample points and one block of
+    cloud points at a time, with the block sizes chosen such that the blocks of all
+    threads together fit in the memory budget.
+    Per sample point, the closest points found so far are kept with ``argpartition``,
+    such that the full distance matrix is never formed.
+    The blocks are computed with matrix products, which release the GIL,
+    so threads run in parallel.
+    To limit the loss of precision of these products, all coordinates are taken
+    relative to the centroid of the cloud.
+
+    Items in cloud further from items in points than threshold have index ``-1``
+    and an infinite distance.
 
     Examples
     --------
     >>> a = np.random.rand(4, 3)
     >>> b = np.random.rand(4, 3)
-    >>> indices, distances = closest_points(a, b, distances=True)
-    [1, 2, 0, 3]
-    array([[ 1.03821946,  0.66226402,  0.67964346,  0.98877891],
-           [ 0.4650432 ,  0.54484186,  0.36158995,  0.60385484],
-           [ 0.19562088,  0.73240154,  0.50235761,  0.51439644],
-           [ 0.84680233,  0.85390316,  0.72154983,  0.50432293]])
+    >>> indices, distances = closest_points_in_cloud_numpy(a, b, distances=True)
+    >>> indices
+    array([1, 2, 0, 3])
+    >>> distances
+    array([ 0.66226402,  0.36158995,  0.19562088,  0.50432293])
 
     """
-    from numpy import asarray
-    from numpy import argmin
+    from multiprocessing import cpu_count
+    from multiprocessing.pool import ThreadPool
+
+    from numpy import arange
     from numpy import argpartition
-    from scipy.spatial import distance_matrix
+    from numpy import argsort
+    from numpy import asarray
+    from numpy import concatenate
+    from numpy import einsum
+    from numpy import full
+    from numpy import inf
+    from numpy import int64
+    from numpy import maximum
+    from numpy import sqrt
+    from numpy import take_along_axis
+
+    points = asarray(points, dtype=float).reshape((-1, 3))
+    cloud = asarray(cloud, dtype=float).reshape((-1, 3))
+    n = len(points)
+    m = len(cloud)
+    k = max(1, min(num_nbrs, m))
+
+    # centre the coordinates at the centroid of the cloud
+    # such that the expanded distances don't lose precision far from the origin
+    if m:
+        origin = cloud.mean(axis=0)
+        points = points - origin
+        cloud = cloud - origin
+    threads = threads or cpu_count()
+
+    # a block and its temporaries take about three times its size
+    budget = max(1, memory // (threads * 3 * 8))
+    bq = max(1, min(n, int(budget ** 0.5)))
+    bc = max(k, min(m, budget // bq))
+
+    cc = einsum('ij,ij->i', cloud, cloud)
+    rows = arange(bq)
+    indices = full((n, k), -1, dtype=int64)
+    sqrd = full((n, k), inf)
+
+    def block(start):
+        q = points[start:start + bq]
+        qq = einsum('ij,ij->i', q, q)[:, None]
+        best_d = full((len(q), k), inf)
+        best_i = full((len(q), k), -1, dtype=int64)
+        for cstart in range(0, m, bc):
+            d = q.dot(cloud[cstart:cstart + bc].T)
+            d *= -2
+            d += qq
+            d += cc[cstart:cstart + bc]
+            maximum(d, 0, out=d)
+            if k == 1:
+                i = d.argmin(axis=1)
+                d = d[rows[:len(q)], i]
+                closer = d < best_d[:, 0]
+                best_d[closer, 0] = d[closer]
+                best_i[closer, 0] = i[closer] + cstart
+                continue
+            if d.shape[1] > k:
+                i = argpartition(d, k - 1, axis=1)[:, :k]
+                d = take_along_axis(d, i, axis=1)
+            else:
+                i = arange(d.shape[1])[None, :].repeat(len(q), axis=0)
+            d = concatenate((best_d, d), axis=1)
+            i = concatenate((best_i, i + cstart), axis=1)
+            j = argpartition(d, k - 1, axis=1)[:, :k]
+            best_d = take_along_axis(d, j, axis=1)
+            best_i = take_along_axis(i, j, axis=1)
+        sqrd[start:start + bq] = best_d
+        indices[start:start + bq] = best_i
+
+    starts = range(0, n, bq)
+    if threads > 1 and len(starts) > 1:
+        pool = ThreadPool(min(threads, len(starts)))
+        try:
+            pool.map(block, starts)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for start in starts:
+            block(start)
+
+    if m:
+        # recompute the distances of the closest points exactly
+        # and sort them
+        d = cloud[indices] - points[:, None, :]
+        sqrd = einsum('ijk,ijk->ij', d, d)
+    order = argsort(sqrd, axis=1)
+    sqrd = take_along_axis(sqrd, order, axis=1)
+    indices = take_along_axis(indices, order, axis=1)
+    d = sqrt(sqrd)
+    far = d > threshold
+    d[far] = inf
+    indices[far] = -1
 
-    points = asarray(points).reshape((-1, 3))
-    cloud = asarray(cloud).reshape((-1, 3))
-    d_matrix = distance_matrix(points, cloud, threshold=threshold)
     if num_nbrs == 1:
-        indices = argmin(d_matrix, axis=1)
-    else:
-        indices = argpartition(d_matrix, num_nbrs, axis=1)
+        indices = indices[:, 0]
+        d = d[:, 0]
     if distances:
-        return indices, d_matrix
+        return indices, d
     return indices
 
 
@@ -656,6 +768,117 @@ def closest_point_on_line_xy(point, line):
     return add_vectors_xy(a, c)
 
 
+def _closest_points_lines_numpy(p, a, b, clip=False):
+    # closest points on lines or segments, broadcasting over the leading axes
+    from numpy import einsum
+    from numpy import errstate
+    from numpy import sqrt
+
+    ab = b - a
+    with errstate(divide='ignore', invalid='ignore'):
+        t = einsum('...i,...i->...', p - a, ab) / einsum('...i,...i->...', ab, ab)
+    # degenerate lines collapse to their first point
+    t[t != t] = 0.0
+    if clip:
+        t.clip(0.0, 1.0, out=t)
+    c = a + ab * t[..., None]
+    d = p - c
+    return sqrt(einsum('...i,...i->...', d, d)), c, t
+
+
+def _closest_points_planes_numpy(p, a, n):
+    # closest points on planes with unit normals
+    from numpy import einsum
+
+    h = einsum('...i,...i->...', p - a, n)
+    return abs(h), p - n * h[..., None], h
+
+
+def _closest_points_blocks_numpy(kernel, points, primitives, pairwise, memory):
+    # apply a kernel to the rows, or to all pairs, of points and primitives
+    # one block of points at a time
+    from numpy import asarray
+    from numpy import empty
+
+    points = asarray(points, dtype=float)
+    primitives = asarray(primitives, dtype=float)
+    n, dim = points.shape
+    m = len(primitives)
+    if primitives.shape[1:] != (2, dim):
+        raise ValueError('The primitives should be pairs of points with the dimension of the points: {}'.format(primitives.shape))
+    if not pairwise and n != m:
+        raise ValueError('Row-aligned input requires as many points as primitives: {} != {}'.format(n, m))
+
+    shape = (n, m) if pairwise else (n, )
+    distances = empty(shape)
+    closest = empty(shape + (dim, ))
+    params = empty(shape)
+
+    # a block and its temporaries take about eight times the size of its closest points
+    rows = max(1, memory // (8 * 8 * dim * (max(1, m) if pairwise else 1)))
+    for start in range(0, n, rows):
+        stop = min(n, start + rows)
+        if pairwise:
+            p = points[start:stop, None, :]
+            a = primitives[None, :, 0]
+            b = primitives[None, :, 1]
+        else:
+            p = points[start:stop]
+            a = primitives[start:stop, 0]
+            b = primitives[start:stop, 1]
+        distances[start:stop], closest[start:stop], params[start:stop] = kernel(p, a, b)
+    return distances, closest, params
+
+
+def closest_points_on_lines_numpy(points, lines, pairwise=False, memory=2**27):
+    """Compute the closest points on lines to a set of points.
+
+    Parameters
+    ----------
+    points : array, list
+        The XYZ coordinates of the points (n x 3).
+    lines : array, list
+        Pairs of points defining the lines (m x 2 x 3).
+    pairwise : bool, optional
+        Compute the closest points of every point on every line.
+        Default is ``False``, in which case every point is paired with the line
+        in the same row, and ``n`` should be equal to ``m``.
+    memory : int, optional
+        The maximum number of bytes used for the temporary arrays of a block of points.
+        Default is ``2**27``.
+
+    Returns
+    -------
+    array
+        The distances between the points and the lines (n) or (n x m).
+    array
+        The XYZ coordinates of the closest points (n x 3) or (n x m x 3).
+    array
+        The parameters of the closest points on the lines (n) or (n x m),
+        such that ``closest = a + t * (b - a)``.
+
+    Notes
+    -----
+    This is the array counterpart of :func:`closest_point_on_line` and :func:`distance_point_line`.
+    For the XY-plane counterparts, use the XY coordinates only (n x 2 and m x 2 x 2).
+
+    The points are processed in blocks, such that the temporaries of the pairwise
+    computation fit in the memory budget. The pairwise result itself is not reduced.
+
+    Examples
+    --------
+    >>> points = [[0.0, 1.0, 0.0], [2.0, 2.0, 0.0]]
+    >>> lines = [[[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]], [[0.0, 0.0, 0.0], [1.0, 1.0, 0.0]]]
+    >>> distances, closest, params = closest_points_on_lines_numpy(points, lines)
+    >>> distances
+    array([1., 0.])
+    >>> params
+    array([0., 2.])
+
+    """
+    return _closest_points_blocks_numpy(_closest_points_lines_numpy, points, lines, pairwise, memory)
+
+
 def closest_point_on_segment(point, segment):
     """Computes closest point on line segment (p1, p2) to testpoint.
 
@@ -716,6 +939,53 @@ def closest_point_on_segment_xy(point, segment):
     return p
 
 
+def closest_points_on_segments_numpy(points, segments, pairwise=False, memory=2**27):
+    """Compute the closest points on line segments to a set of points.
+
+    Parameters
+    ----------
+    points : array, list
+        The XYZ coordinates of the points (n x 3).
+    segments : array, list
+        Pairs of points defining the segments (m x 2 x 3).
+    pairwise : bool, optional
+        Compute the closest points of every point on every segment.
+        Default is ``False``, in which case every point is paired with the segment
+        in the same row, and ``n`` should be equal to ``m``.
+    memory : int, optional
+        The maximum number of bytes used for the temporary arrays of a block of points.
+        Default is ``2**27``.
+
+    Returns
+    -------
+    array
+        The distances between the points and the segments (n) or (n x m).
+    array
+        The XYZ coordinates of the closest points (n x 3) or (n x m x 3).
+    array
+        The parameters of the closest points on the segments (n) or (n x m),
+        between ``0`` and ``1``, such that ``closest = a + t * (b - a)``.
+
+    Notes
+    -----
+    This is the array counterpart of :func:`closest_point_on_segment`.
+    For the XY-plane counterpart, use the XY coordinates only (n x 2 and m x 2 x 2).
+
+    Examples
+    --------
+    >>> points = numpy.random.rand(1000, 3)
+    >>> segments = numpy.random.rand(200, 2, 3)
+    >>> distances, closest, params = closest_points_on_segments_numpy(points, segments, pairwise=True)
+    >>> distances.shape
+    (1000, 200)
+
+    """
+    def kernel(p, a, b):
+        return _closest_points_lines_numpy(p, a, b, clip=True)
+
+    return _closest_points_blocks_numpy(kernel, points, segments, pairwise, memory)
+
+
 def closest_point_on_polyline(point, polyline):
     """Find the closest point on a polyline to a given point.
 
@@ -770,6 +1040,107 @@ def closest_point_on_polyline_xy(point, polyline):
     return closest_point_in_cloud_xy(point, cloud)[1]
 
 
+def closest_points_on_polyline_numpy(points, polyline, memory=2**27):
+    """Compute the closest points on a polyline to a set of points.
+
+    Parameters
+    ----------
+    points : array, list
+        The XYZ coordinates of the points (n x 3).
+    polyline : array, list
+        The XYZ coordinates of the vertices of the polyline (m x 3).
+    memory : int, optional
+        The maximum number of bytes used for the temporary arrays of a block of points.
+        Default is ``2**27``.
+
+    Returns
+    -------
+    array
+        The distances between the points and the polyline (n).
+    array
+        The XYZ coordinates of the closest points (n x 3).
+    array
+        The parameters of the closest points on the polyline (n).
+        The integer part is the index of the segment,
+        the fractional part the parameter on that segment.
+
+    Raises
+    ------
+    ValueError
+        If the polyline has less than two vertices.
+
+    Notes
+    -----
+    This is the array counterpart of :func:`closest_point_on_polyline`.
+    For the XY-plane counterpart, use the XY coordinates only (n x 2 and m x 2).
+
+    The distances to all segments are computed for one block of points at a time,
+    with matrix products relative to the centroid of the polyline,
+    and only the closest segment per point is kept.
+    The closest points on those segments are then computed exactly.
+
+    Examples
+    --------
+    >>> polyline = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0]]
+    >>> distances, closest, params = closest_points_on_polyline_numpy([[2.0, 0.5, 0.0]], polyline)
+    >>> params
+    array([1.5])
+
+    """
+    from numpy import arange
+    from numpy import asarray
+    from numpy import concatenate
+    from numpy import einsum
+    from numpy import errstate
+    from numpy import maximum
+
+    points = asarray(points, dtype=float)
+    polyline = asarray(polyline, dtype=float)
+    if len(polyline) < 2:
+        raise ValueError('A polyline should have at least two vertices: {}'.format(len(polyline)))
+
+    # centre the coordinates at the centroid of the polyline
+    # such that the expanded distances don't lose precision far from the origin
+    origin = polyline.mean(axis=0)
+    a = polyline[:-1] - origin
+    ab = polyline[1:] - polyline[:-1]
+    m = len(a)
+
+    aa = einsum('ij,ij->i', a, a)
+    abab = einsum('ij,ij->i', ab, ab)
+    aab = einsum('ij,ij->i', a, ab)
+
+    segments = []
+    rows = max(1, memory // (8 * 4 * m))
+    for start in range(0, len(points), rows):
+        p = points[start:start + rows] - origin
+        # the parameters and squared distances of the projections on all segments
+        # from matrix products, without (rows x m x dim) temporaries
+        d = p.dot(a.T)
+        d *= -2
+        d += einsum('ij,ij->i', p, p)[:, None]
+        d += aa
+        apab = p.dot(ab.T)
+        apab -= aab
+        with errstate(divide='ignore', invalid='ignore'):
+            t = apab / abab
+        t[t != t] = 0.0
+        t.clip(0.0, 1.0, out=t)
+        apab *= t
+        apab *= 2
+        d -= apab
+        t *= t
+        t *= abab
+        d += t
+        maximum(d, 0, out=d)
+        segments.append(d.argmin(axis=1))
+
+    # the closest points on the closest segments, computed exactly
+    i = concatenate(segments) if segments else arange(0)
+    distances, closest, params = _closest_points_lines_numpy(points, polyline[:-1][i], polyline[1:][i], clip=True)
+    return distances, closest, params + i
+
+
 def closest_point_on_polygon_xy(point, polygon):
     """Compute closest point on a polygon to a given point lying in the XY-plane.
 
@@ -839,6 +1210,56 @@ def closest_point_on_plane(point, plane):
             z1 - k * c]
 
 
+def closest_points_on_planes_numpy(points, planes, pairwise=False, memory=2**27):
+    """Compute the closest points on planes to a set of points.
+
+    Parameters
+    ----------
+    points : array, list
+        The XYZ coordinates of the points (n x 3).
+    planes : array, list
+        The base points and normals defining the planes (m x 2 x 3).
+    pairwise : bool, optional
+        Compute the closest points of every point on every plane.
+        Default is ``False``, in which case every point is paired with the plane
+        in the same row, and ``n`` should be equal to ``m``.
+    memory : int, optional
+        The maximum number of bytes used for the temporary arrays of a block of points.
+        Default is ``2**27``.
+
+    Returns
+    -------
+    array
+        The distances between the points and the planes (n) or (n x m).
+    array
+        The XYZ coordinates of the closest points (n x 3) or (n x m x 3).
+    array
+        The signed distances of the points along the normals of the planes (n) or (n x m),
+        such that ``point = closest + h * normal / length(normal)``.
+
+    Notes
+    -----
+    This is the array counterpart of :func:`closest_point_on_plane` and :func:`distance_point_plane`.
+
+    Examples
+    --------
+    >>> planes = [[[0.0, 0.0, 0.0], [0.0, 0.0, 2.0]]]
+    >>> distances, closest, heights = closest_points_on_planes_numpy([[1.0, 2.0, -3.0]], planes)
+    >>> closest
+    array([[1., 2., 0.]])
+    >>> heights
+    array([-3.])
+
+    """
+    from numpy import asarray
+    from numpy import sqrt
+
+    planes = asarray(planes, dtype=float).copy()
+    if len(planes):
+        planes[:, 1] /= sqrt((planes[:, 1] ** 2).sum(axis=1))[:, None]
+    return _closest_points_blocks_numpy(_closest_points_planes_numpy, points, planes, pairwise, memory)
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
@@ -2,9 +2,10 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-import collections
+import gc
 
-from compas.geometry import distance_point_point_sqrd
+from heapq import heappush
+from heapq import heapreplace
 
 
 __author__     = ['Matthias Rippmann <rippmann@arch.ethz.ch>',
@@ -19,9 +20,6 @@ __all__ = [
 ]
 
 
-Node = collections.namedtuple("Node", 'point axis label left right')
-
-
 class KDTree(object):
     """A tree for nearest neighbor search in a k-dimensional space.
 
@@ -31,15 +29,39 @@ class KDTree(object):
         A list of objects to populate the tree with.
         If objects are provided, the tree is built automatically.
         Defaults to ``None``.
+    leafsize : int, optional
+        The maximum number of points in a leaf of the tree.
+        Default is ``8``.
 
     Attributes
     ----------
-    root : Node
-        The root node of the built tree.
-        This is the median with respect to the different dimensions of the tree.
+    points : list
+        The XYZ coordinates of the points, in the order of the tree.
+    labels : list
+        The index of every point of the tree in the list of objects.
+    nodes : list
+        The nodes of the tree, as tuples of the range of points of the node,
+        the split axis, the split value, the indices of the left and right child nodes,
+        and the minimum and maximum coordinates of the points of the node.
+        The root of the tree is the first node.
+        The children of a leaf are ``-1``.
 
     Notes
     -----
+    The tree is stored in flat lists instead of linked node objects.
+    Every node is a contiguous range of the reordered points.
+    Nodes are split at the median of the coordinate along which their cell
+    has the largest extent. If NumPy is available, the median is found by
+    partitioning the range of points with ``argpartition`` instead of sorting it,
+    such that the tree is built in ``O(n log n)``.
+    Otherwise, the range is sorted.
+    The bounding boxes of the nodes are computed bottom-up, from the boxes of their children.
+
+    Nearest neighbours are found in a single traversal of the tree,
+    in which the best candidates are kept on a bounded heap,
+    and nodes are skipped if their bounding box is farther than the current
+    k-th nearest neighbour.
+
     For more info, see [1]_ and [2]_.
 
     References
@@ -65,14 +87,7 @@ class KDTree(object):
 
         tree = KDTree(cloud)
 
-        n       = 50
-        nnbrs   = []
-        exclude = set()
-
-        for i in range(n):
-            nnbr = tree.nearest_neighbour(point, exclude)
-            nnbrs.append(nnbr)
-            exclude.add(nnbr[1])
+        nnbrs = tree.nearest_neighbours(point, 50)
 
         for nnbr in nnbrs:
             print(nnbr)
@@ -111,42 +126,189 @@ class KDTree(object):
 
     """
 
-    def __init__(self, objects=None):
+    def __init__(self, objects=None, leafsize=8):
         """Initialise a KDTree object."""
-        self.root = None
-        if objects:
-            self.root = self.build(list([(objects[i], i) for i in range(len(objects))]))
+        self.leafsize = max(1, leafsize)
+        self.points = []
+        self.labels = []
+        self.nodes = []
+        if objects is not None and len(objects):
+            self.build(objects)
+
+    def __len__(self):
+        return len(self.points)
 
-    def build(self, objects, axis=0):
-        """Populate a kd-tree with given objects.
+    def build(self, objects):
+        """Populate the tree with given objects.
 
         Parameters
         ----------
         objects : list
-            The tree objects.
-        axis : int, optional
-            The axis along which to build.
-
-        Returns
-        -------
-        Node
-            The root node.
+            The XYZ coordinates of the points.
+            Points with only XY coordinates are placed at ``z = 0``.
 
         """
-        if not objects:
-            return None
-
-        objects.sort(key=lambda o: o[0][axis])
-        median_idx = len(objects) // 2
-        median_point, median_label = objects[median_idx]
-        next_axis = (axis + 1) % 3
+        # the tree consists of many small lists and tuples without reference cycles
+        # the garbage collector is suspended while they are created
+        # because it would otherwise traverse all of them repeatedly
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if hasattr(objects, 'tolist'):
+                objects = objects.tolist()
+            xyz = [[float(point[0]), float(point[1]), float(point[2]) if len(point) > 2 else 0.0] for point in objects]
+            self.labels = []
+            self.points = []
+            self.nodes = []
+            if not xyz:
+                return
+            try:
+                self._build_numpy(xyz)
+            except ImportError:
+                self._build_sorted(xyz)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _split(self, n, bmin, bmax, split):
+        # split the nodes top-down in their cells,
+        # which are the boxes of their parents cut at the split value
+        # children come after their parents in the list of nodes
+        nodes = []
+        stack = [(0, n, None, None, bmin, bmax, 0)]
+        while stack:
+            lo, hi, parent, side, cmin, cmax, depth = stack.pop()
+            node = len(nodes)
+            if parent is not None:
+                nodes[parent][side] = node
+            if hi - lo <= self.leafsize:
+                nodes.append([lo, hi, -1, 0.0, -1, -1, depth])
+                continue
+            axis = max(range(3), key=lambda axis: cmax[axis] - cmin[axis])
+            mid = (hi - lo) // 2
+            value = split(lo, hi, axis, mid)
+            nodes.append([lo, hi, axis, value, -1, -1, depth])
+            left_max = cmax[:]
+            left_max[axis] = value
+            right_min = cmin[:]
+            right_min[axis] = value
+            stack.append((lo + mid, hi, node, 5, right_min, cmax, depth + 1))
+            stack.append((lo, lo + mid, node, 4, cmin, left_max, depth + 1))
+        return nodes
+
+    def _build_numpy(self, xyz):
+        # the median is found with argpartition,
+        # and the boxes are computed in bulk, level by level, from the leaves up
+        from numpy import argpartition
+        from numpy import array
+        from numpy import arange
+        from numpy import maximum
+        from numpy import minimum
+
+        columns = array(xyz, dtype=float).T.copy()
+        order = arange(len(xyz))
+
+        def split(lo, hi, axis, mid):
+            ids = order[lo:hi]
+            ids[:] = ids[argpartition(columns[axis][ids], mid)]
+            return float(columns[axis][ids[mid]])
+
+        nodes = self._split(len(xyz), columns.min(axis=1).tolist(), columns.max(axis=1).tolist(), split)
+        lo, hi, axis, value, left, right, depth = [array(column) for column in zip(*nodes)]
+        points = columns.T[order]
+
+        bmin = points[lo]
+        bmax = points[lo]
+        leaves = (left == -1).nonzero()[0]
+        bmin[leaves] = minimum.reduceat(points, lo[leaves], axis=0)
+        bmax[leaves] = maximum.reduceat(points, lo[leaves], axis=0)
+        inner = left != -1
+        for level in range(depth.max() - 1, -1, -1):
+            index = (inner & (depth == level)).nonzero()[0]
+            bmin[index] = minimum(bmin[left[index]], bmin[right[index]])
+            bmax[index] = maximum(bmax[left[index]], bmax[right[index]])
+
+        self.labels = order.tolist()
+        self.points = points.tolist()
+        self.nodes = list(zip(lo.tolist(), hi.tolist(), axis.tolist(), value.tolist(), left.tolist(), right.tolist(), bmin.tolist(), bmax.tolist()))
+
+    def _build_sorted(self, xyz):
+        # the median is found by sorting the range of points,
+        # and the boxes are computed from the leaves up
+        coords = list(zip(*xyz))
+        order = list(range(len(xyz)))
+
+        def split(lo, hi, axis, mid):
+            values = coords[axis]
+            order[lo:hi] = sorted(order[lo:hi], key=values.__getitem__)
+            return values[order[lo + mid]]
+
+        nodes = self._split(len(xyz), [min(c) for c in coords], [max(c) for c in coords], split)
+        points = [xyz[i] for i in order]
+
+        boxes = [None] * len(nodes)
+        for index in range(len(nodes) - 1, -1, -1):
+            lo, hi, axis, value, left, right, depth = nodes[index]
+            if left == -1:
+                x, y, z = zip(*points[lo:hi])
+                boxes[index] = [min(x), min(y), min(z)], [max(x), max(y), max(z)]
+            else:
+                (lmin, lmax), (rmin, rmax) = boxes[left], boxes[right]
+                boxes[index] = [min(a, b) for a, b in zip(lmin, rmin)], [max(a, b) for a, b in zip(lmax, rmax)]
+
+        self.labels = order
+        self.points = points
+        self.nodes = [tuple(node[:6]) + boxes[index] for index, node in enumerate(nodes)]
+
+    # --------------------------------------------------------------------------
+    # nearest neighbours
+    # --------------------------------------------------------------------------
+
+    def _knn(self, point, k, exclude=None):
+        # a single traversal with a bounded max-heap of (negative) squared distances
+        if not self.nodes or k < 1:
+            return []
+        x, y, z = point[0], point[1], point[2] if len(point) > 2 else 0.0
+        nodes = self.nodes
+        points = self.points
+        labels = self.labels
+        heap = []
+        worst = [float('inf')]
+
+        def box(node):
+            bmin, bmax = node[6], node[7]
+            dx = bmin[0] - x if x < bmin[0] else (x - bmax[0] if x > bmax[0] else 0.0)
+            dy = bmin[1] - y if y < bmin[1] else (y - bmax[1] if y > bmax[1] else 0.0)
+            dz = bmin[2] - z if z < bmin[2] else (z - bmax[2] if z > bmax[2] else 0.0)
+            return dx * dx + dy * dy + dz * dz
+
+        def search(index):
+            node = nodes[index]
+            if node[4] == -1:
+                for i in range(node[0], node[1]):
+                    if exclude and labels[i] in exclude:
+                        continue
+                    p = points[i]
+                    d2 = (p[0] - x) ** 2 + (p[1] - y) ** 2 + (p[2] - z) ** 2
+                    if len(heap) < k:
+                        heappush(heap, (-d2, i))
+                        if len(heap) == k:
+                            worst[0] = -heap[0][0]
+                    elif d2 < worst[0]:
+                        heapreplace(heap, (-d2, i))
+                        worst[0] = -heap[0][0]
+                return
+            if (x, y, z)[node[2]] <= node[3]:
+                close, far = node[4], node[5]
+            else:
+                close, far = node[5], node[4]
+            if box(nodes[close]) < worst[0]:
+                search(close)
+            if box(nodes[far]) < worst[0]:
+                search(far)
 
-        return Node(
-            median_point,
-            axis,
-            median_label,
-            self.build(objects[:median_idx], next_axis),
-            self.build(objects[median_idx + 1:], next_axis))
+        search(0)
+        return sorted([(-d2, i) for d2, i in heap])
 
     def nearest_neighbour(self, point, exclude=None):
         """Find the nearest neighbour to a given point,
@@ -168,30 +330,11 @@ class KDTree(object):
             Distance to the base point.
 
         """
-        def search(node):
-            if node is None:
-                return
-
-            d2 = distance_point_point_sqrd(point, node.point)
-            if d2 < best[2]:
-                if node.label not in exclude:
-                    best[:] = node.point, node.label, d2
-
-            d = point[node.axis] - node.point[node.axis]
-            if d <= 0:
-                close, far = node.left, node.right
-            else:
-                close, far = node.right, node.left
-
-            search(close)
-            if d ** 2 < best[2]:
-                search(far)
-
-        exclude = exclude or set()
-        best = [None, None, float('inf')]
-        search(self.root)
-        best[2] **= 0.5
-        return best
+        nnbrs = self._knn(point, 1, exclude)
+        if not nnbrs:
+            return [None, None, float('inf')]
+        d2, i = nnbrs[0]
+        return [self.points[i], self.labels[i], d2 ** 0.5]
 
     def nearest_neighbours(self, point, number, distance_sort=False):
         """Find the N nearest neighbours to a given point.
@@ -211,16 +354,274 @@ class KDTree(object):
         list
             A list of N nearest neighbours.
 
+        Notes
+        -----
+        The neighbours are found in a single search and are always sorted by distance.
+        If the tree has less than N points, all points are returned.
+
+        """
+        return [[self.points[i], self.labels[i], d2 ** 0.5] for d2, i in self._knn(point, number)]
+
+    def query_batch(self, points, k=1):
+        """Find the k nearest neighbours of many points.
+
+        Parameters
+        ----------
+        points : list
+            XYZ coordinates of the query points.
+        k : int, optional
+            The number of nearest neighbours per point.
+            Default is ``1``.
+
+        Returns
+        -------
+        tuple
+            * The distances to the nearest neighbours (m x k).
+            * The labels of the nearest neighbours (m x k).
+
+            The neighbours of every point are sorted by distance.
+            If the tree has less than k points, missing neighbours have
+            an infinite distance and label ``-1``.
+
+        Examples
+        --------
+        >>> tree = KDTree(cloud)
+        >>> distances, indices = tree.query_batch(cloud, k=10)
+
+        """
+        from numpy import full
+        from numpy import inf
+        from numpy import int64
+        from numpy import sqrt
+
+        if hasattr(points, 'tolist'):
+            points = points.tolist()
+        distances = full((len(points), k), inf)
+        indices = full((len(points), k), -1, dtype=int64)
+        labels = self.labels
+        for row, point in enumerate(points):
+            nnbrs = self._knn(point, k)
+            distances[row, :len(nnbrs)] = [d2 for d2, _ in nnbrs]
+            indices[row, :len(nnbrs)] = [labels[i] for _, i in nnbrs]
+        return sqrt(distances), indices
+
+    # --------------------------------------------------------------------------
+    # range queries
+    # --------------------------------------------------------------------------
+
+    def _radius(self, point, radius):
+        # the tree positions of the points within the radius
+        # subtrees entirely inside the sphere are added without checking their points
+        found = []
+        if not self.nodes:
+            return found
+        x, y, z = point[0], point[1], point[2] if len(point) > 2 else 0.0
+        r2 = radius * radius
+        nodes = self.nodes
+        points = self.points
+        stack = [0]
+        while stack:
+            node = nodes[stack.pop()]
+            bmin, bmax = node[6], node[7]
+            near = 0.0
+            far = 0.0
+            for c, lo, hi in ((x, bmin[0], bmax[0]), (y, bmin[1], bmax[1]), (z, bmin[2], bmax[2])):
+                if c < lo:
+                    near += (lo - c) ** 2
+                elif c > hi:
+                    near += (c - hi) ** 2
+                far += max(c - lo, hi - c) ** 2
+            if near > r2:
+                continue
+            if far <= r2:
+                found.extend(range(node[0], node[1]))
+            elif node[4] == -1:
+                for i in range(node[0], node[1]):
+                    p = points[i]
+                    if (p[0] - x) ** 2 + (p[1] - y) ** 2 + (p[2] - z) ** 2 <= r2:
+                        found.append(i)
+            else:
+                stack.append(node[5])
+                stack.append(node[4])
+        return found
+
+    def query_radius(self, point, radius, distance_sort=False):
+        """Find all points within a given distance of a point.
+
+        Parameters
+        ----------
+        point : list
+            XYZ coordinates of the base point.
+        radius : float
+            The search radius.
+        distance_sort : bool, optional
+            Sort the points by distance to the base point.
+            Default is ``False``.
+
+        Returns
+        -------
+        list
+            The labels of the points.
+
+        Notes
+        -----
+        Nodes of the tree outside the sphere are skipped,
+        and nodes entirely inside the sphere are added without checking their points,
+        such that the cost depends on the number of points found
+        rather than the size of the tree.
+
         """
-        nnbrs = []
-        exclude = set()
-        for i in range(number):
-            nnbr = self.nearest_neighbour(point, exclude)
-            nnbrs.append(nnbr)
-            exclude.add(nnbr[1])
+        found = self._radius(point, radius)
         if distance_sort:
-            return sorted(nnbrs, key=lambda nnbr: nnbr[2])
-        return nnbrs
+            x, y, z = point[0], point[1], point[2] if len(point) > 2 else 0.0
+            points = self.points
+            found.sort(key=lambda i: (points[i][0] - x) ** 2 + (points[i][1] - y) ** 2 + (points[i][2] - z) ** 2)
+        labels = self.labels
+        return [labels[i] for i in found]
+
+    def query_radius_batch(self, points, radius):
+        """Find all points within a given distance of many points.
+
+        Parameters
+        ----------
+        points : list
+            XYZ coordinates of the base points.
+        radius : float
+            The search radius.
+
+        Returns
+        -------
+        tuple
+            * The offsets of the neighbours of every base point (m + 1).
+            * The labels of the neighbours of all base points.
+
+            The neighbours of point ``i`` are ``indices[offsets[i]:offsets[i + 1]]``.
+
+        Examples
+        --------
+        >>> offsets, indices = tree.query_radius_batch(cloud, 0.1)
+        >>> counts = offsets[1:] - offsets[:-1]
+
+        """
+        from numpy import array
+        from numpy import cumsum
+        from numpy import int64
+        from numpy import zeros
+
+        if hasattr(points, 'tolist'):
+            points = points.tolist()
+        labels = self.labels
+        offsets = zeros(len(points) + 1, dtype=int64)
+        found = []
+        for row, point in enumerate(points):
+            nbrs = self._radius(point, radius)
+            offsets[row + 1] = len(nbrs)
+            found += [labels[i] for i in nbrs]
+        return cumsum(offsets), array(found, dtype=int64)
+
+    def query_box(self, bmin, bmax):
+        """Find all points inside an axis-aligned box.
+
+        Parameters
+        ----------
+        bmin : list
+            The minimum XYZ coordinates of the box.
+        bmax : list
+            The maximum XYZ coordinates of the box.
+
+        Returns
+        -------
+        list
+            The labels of the points.
+
+        Notes
+        -----
+        Nodes outside the box are skipped,
+        and nodes entirely inside the box are added without checking their points.
+
+        """
+        found = []
+        if not self.nodes:
+            return found
+        nodes = self.nodes
+        points = self.points
+        labels = self.labels
+        stack = [0]
+        while stack:
+            node = nodes[stack.pop()]
+            nmin, nmax = node[6], node[7]
+            if any(nmax[axis] < bmin[axis] or nmin[axis] > bmax[axis] for axis in range(3)):
+                continue
+            if all(bmin[axis] <= nmin[axis] and nmax[axis] <= bmax[axis] for axis in range(3)):
+                found.extend(labels[node[0]:node[1]])
+            elif node[4] == -1:
+                for i in range(node[0], node[1]):
+                    p = points[i]
+                    if all(bmin[axis] <= p[axis] <= bmax[axis] for axis in range(3)):
+                        found.append(labels[i])
+            else:
+                stack.append(node[5])
+                stack.append(node[4])
+        return found
+
+    def pairs_within(self, radius):
+        """Find all pairs of points of the tree within a given distance of each other.
+
+        Parameters
+        ----------
+        radius : float
+            The maximum distance between the points of a pair.
+
+        Returns
+        -------
+        list
+            The pairs of labels ``(i, j)``, with ``i < j``.
+
+        Notes
+        -----
+        The tree is traversed against itself.
+        Pairs of nodes of which the bounding boxes are farther apart than the radius are skipped.
+
+        """
+        if not self.nodes:
+            return []
+        r2 = radius * radius
+        nodes = self.nodes
+        points = self.points
+        labels = self.labels
+        pairs = []
+
+        def gap(a, b):
+            d2 = 0.0
+            for axis in range(3):
+                d = max(a[6][axis] - b[7][axis], b[6][axis] - a[7][axis], 0.0)
+                d2 += d * d
+            return d2
+
+        stack = [(0, 0)]
+        while stack:
+            i, j = stack.pop()
+            a, b = nodes[i], nodes[j]
+            if i != j and gap(a, b) > r2:
+                continue
+            if a[4] == -1 and b[4] == -1:
+                for u in range(a[0], a[1]):
+                    p = points[u]
+                    for v in range(u + 1 if i == j else b[0], b[1]):
+                        q = points[v]
+                        if (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2 <= r2:
+                            pairs.append((labels[u], labels[v]))
+            elif i == j:
+                stack.append((a[4], a[4]))
+                stack.append((a[5], a[5]))
+                stack.append((a[4], a[5]))
+            elif a[4] != -1 and (b[4] == -1 or a[1] - a[0] >= b[1] - b[0]):
+                stack.append((a[4], j))
+                stack.append((a[5], j))
+            else:
+                stack.append((i, b[4]))
+                stack.append((i, b[5]))
+        return [(u, v) if u < v else (v, u) for u, v in pairs]
 
 
 # ==============================================================================
@@ -239,14 +640,7 @@ if __name__ == '__main__':
 
     tree = KDTree(cloud)
 
-    n       = 50
-    nnbrs   = []
-    exclude = set()
-
-    for i in range(n):
-        nnbr = tree.nearest_neighbour(point, exclude)
-        nnbrs.append(nnbr)
-        exclude.add(nnbr[1])
+    nnbrs = tree.nearest_neighbours(point, 50)
 
     for nnbr in nnbrs:
         print(nnbr)
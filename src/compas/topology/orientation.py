@@ -250,16 +250,21 @@ def mesh_unify_cycles(mesh, root=None):
 
     adj = mesh_face_adjacency(mesh)
 
-    visited = breadth_first_traverse(adj, root, unify)
+    mesh._invalidate_topology()
+    scope = mesh._begin_change(mesh.vertices())
+    try:
+        visited = breadth_first_traverse(adj, root, unify)
 
-    assert len(list(visited)) == mesh.number_of_faces(), 'Not all faces were visited'
+        assert len(list(visited)) == mesh.number_of_faces(), 'Not all faces were visited'
 
-    mesh.halfedge = {key: {} for key in mesh.vertices()}
-    for fkey in mesh.faces():
-        for u, v in mesh.face_halfedges(fkey):
-            mesh.halfedge[u][v] = fkey
-            if u not in mesh.halfedge[v]:
-                mesh.halfedge[v][u] = None
+        mesh.halfedge = {key: {} for key in mesh.vertices()}
+        for fkey in mesh.faces():
+            for u, v in mesh.face_halfedges(fkey):
+                mesh.halfedge[u][v] = fkey
+                if u not in mesh.halfedge[v]:
+                    mesh.halfedge[v][u] = None
+    finally:
+        mesh._end_change(scope)
 
 
 def mesh_flip_cycles(mesh):
@@ -276,13 +281,18 @@ def mesh_flip_cycles(mesh):
     just reverses whatever direction it finds.
 
     """
-    mesh.halfedge = {key: {} for key in mesh.vertices()}
-    for fkey in mesh.faces():
-        mesh.face[fkey][:] = mesh.face[fkey][::-1]
-        for u, v in mesh.face_halfedges(fkey):
-            mesh.halfedge[u][v] = fkey
-            if u not in mesh.halfedge[v]:
-                mesh.halfedge[v][u] = None
+    mesh._invalidate_topology()
+    scope = mesh._begin_change(mesh.vertices())
+    try:
+        mesh.halfedge = {key: {} for key in mesh.vertices()}
+        for fkey in mesh.faces():
+            mesh.face[fkey][:] = mesh.face[fkey][::-1]
+            for u, v in mesh.face_halfedges(fkey):
+                mesh.halfedge[u][v] = fkey
+                if u not in mesh.halfedge[v]:
+                    mesh.halfedge[v][u] = None
+    finally:
+        mesh._end_change(scope)
 
 
 # ==============================================================================
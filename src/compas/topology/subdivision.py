@@ -124,6 +124,7 @@ def mesh_subdivide_quad(mesh, k=1):
                 subd.add_face([a, key, d, c])
 
             del subd.face[fkey]
+            subd._invalidate_topology()
 
         mesh = subd
 
@@ -182,6 +183,7 @@ def mesh_subdivide_corner(mesh, k=1):
 
             subd.add_face(center)
             del subd.face[fkey]
+            subd._invalidate_topology()
 
         mesh = subd
 
@@ -336,6 +338,7 @@ def mesh_subdivide_catmullclark(mesh, k=1, fixed=None):
                 subd.add_face([a, key, d, c])
 
             del subd.face[fkey]
+            subd._invalidate_topology()
 
         # these are the coordinates before updating
 
@@ -417,7 +420,8 @@ def mesh_subdivide_doosabin(mesh, k=1, fixed=None):
         old_xyz      = {key: mesh.vertex_coordinates(key) for key in mesh.vertices()}
         fkey_old_new = {fkey: {} for fkey in mesh.faces()}
 
-        subd = cls()
+        points = []
+        faces = []
 
         for fkey in mesh.faces():
             vertices = mesh.face_vertices(fkey)
@@ -439,13 +443,13 @@ def mesh_subdivide_doosabin(mesh, k=1, fixed=None):
                     c[1] += alpha * xyz[1]
                     c[2] += alpha * xyz[2]
 
-                new = subd.add_vertex(x=c[0], y=c[1], z=c[2])
-                fkey_old_new[fkey][old] = new
+                fkey_old_new[fkey][old] = len(points)
+                points.append(c)
 
         for fkey in mesh.faces():
             vertices = mesh.face_vertices(fkey)
             old_new = fkey_old_new[fkey]
-            subd.add_face([old_new[key] for key in vertices])
+            faces.append([old_new[key] for key in vertices])
 
         for key in mesh.vertices():
             if mesh.is_vertex_on_boundary(key):
@@ -458,7 +462,7 @@ def mesh_subdivide_doosabin(mesh, k=1, fixed=None):
                 if fkey is not None:
                     face.append(fkey_old_new[fkey][key])
 
-            subd.add_face(face[::-1])
+            faces.append(face[::-1])
 
         edges = set()
 
@@ -480,9 +484,9 @@ def mesh_subdivide_doosabin(mesh, k=1, fixed=None):
                 face.append(fkey_old_new[vu_fkey][u])
                 face.append(fkey_old_new[vu_fkey][v])
                 face.append(fkey_old_new[uv_fkey][v])
-                subd.add_face(face)
+                faces.append(face)
 
-        mesh = subd
+        mesh = cls.from_vertices_and_faces(points, faces)
 
     return mesh
 
@@ -582,6 +586,7 @@ def trimesh_subdivide_loop(mesh, k=1, fixed=None):
             subd.add_face([vw, w, wu])
             subd.add_face([uv, vw, wu])
             del subd.face[fkey]
+            subd._invalidate_topology()
 
     return subd
 
@@ -5,6 +5,7 @@ from __future__ import division
 import os
 import sys
 import json
+import base64
 
 try:
     from subprocess import Popen
@@ -92,7 +93,7 @@ else:
     odict['profile']    = stream.getvalue()
 
 with open(opath, 'w+') as fp:
-    json.dump(odict, fp, cls=DataEncoder)
+    json.dump(odict, fp, cls=DataEncoder, compact=idict.get('compact', False))
 
 """
 
@@ -106,18 +107,100 @@ with open(opath, 'w+') as fp:
 #     return ds
 
 
+def _encode_array(a):
+    # the dtype, shape and base64 encoded buffer of an array
+    dtype = a.dtype.newbyteorder('<') if a.dtype.byteorder == '>' else a.dtype
+    data = a.astype(dtype, copy=False).tobytes()
+    return {'descr': dtype.str, 'shape': list(a.shape), 'data': base64.b64encode(data).decode('ascii')}
+
+
+def _decode_array(value):
+    # an array from its dtype, shape and buffer
+    # or nested lists of numbers if NumPy is not available
+    data = base64.b64decode(value['data'])
+    try:
+        from numpy import frombuffer
+    except ImportError:
+        return _decode_array_wo_numpy(value['descr'], value['shape'], data)
+    return frombuffer(bytearray(data), dtype=value['descr']).reshape(value['shape'])
+
+
+def _decode_array_wo_numpy(descr, shape, data):
+    from array import array
+
+    kind, size = descr[1], int(descr[2:])
+    if kind == 'f':
+        typecode = {4: 'f', 8: 'd'}[size]
+    elif kind in 'iu':
+        typecode = [code for code in 'bhilq' if array(code).itemsize == size][0]
+        if kind == 'u':
+            typecode = typecode.upper()
+    elif kind == 'b':
+        typecode = 'B'
+    else:
+        raise ValueError('Arrays of type {} can not be decoded without NumPy.'.format(descr))
+    values = array(typecode)
+    if hasattr(values, 'frombytes'):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+    if sys.byteorder == 'big' and size > 1:
+        values.byteswap()
+    values = values.tolist()
+    if kind == 'b':
+        values = [bool(value) for value in values]
+    for n in reversed(shape[1:]):
+        values = [values[i:i + n] for i in range(0, len(values), n)]
+    return values
+
+
 class DataEncoder(json.JSONEncoder):
-    """Dump"""
+    """Encode data structures and arrays to JSON.
+
+    Parameters
+    ----------
+    compact : bool, optional
+        Encode arrays, and the elements and attributes of data structures,
+        as typed, base64-encoded buffers instead of nested lists and dicts.
+        Default is ``True``.
+
+    Notes
+    -----
+    With ``compact=True``, an array is encoded as its dtype, its shape and its
+    raw data, which :class:`DataDecoder` turns back into an array without
+    parsing the individual numbers.
+    Data structures are encoded in the same way as by their ``to_binary`` method
+    (see :class:`compas.datastructures._mixins.FromToBinary`), if NumPy is available.
+    Otherwise they are encoded with their ``to_data`` method.
+
+    Examples
+    --------
+    >>> import json
+    >>> import numpy as np
+    >>> s = json.dumps({'xyz': np.random.rand(10, 3)}, cls=DataEncoder)
+    >>> json.loads(s, cls=DataDecoder)['xyz'].shape
+    (10, 3)
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.compact = kwargs.pop('compact', True)
+        super(DataEncoder, self).__init__(*args, **kwargs)
 
     def default(self, o):
         from compas.datastructures import Datastructure
 
         if isinstance(o, Datastructure):
-            print(type(o))
-            return {
-                'dtype': '{}/{}'.format(o.__class__.__module__, o.__class__.__name__),
-                'value': o.to_data()
-            }
+            dtype = '{}/{}'.format(o.__class__.__module__, o.__class__.__name__)
+            if self.compact and hasattr(o, '_to_binary_data'):
+                try:
+                    header, arrays = o._to_binary_data()
+                except ImportError:
+                    pass
+                else:
+                    arrays = {name: _encode_array(a) for name, a in arrays.items()}
+                    return {'dtype': dtype, 'binary': {'header': header, 'arrays': arrays}}
+            return {'dtype': dtype, 'value': o.to_data()}
 
         try:
             import numpy as np
@@ -125,13 +208,25 @@ class DataEncoder(json.JSONEncoder):
             return super(DataEncoder, self).default(o)
 
         if isinstance(o, np.ndarray):
+            if self.compact and o.dtype.kind in 'biuf':
+                return {'dtype': 'numpy/ndarray', 'value': _encode_array(o)}
             return o.tolist()
 
+        if isinstance(o, np.generic):
+            return o.item()
+
         return super(DataEncoder, self).default(o)
 
 
 class DataDecoder(json.JSONDecoder):
-    """Load"""
+    """Decode data structures and arrays encoded by :class:`DataEncoder`.
+
+    Notes
+    -----
+    Arrays are restored from their raw data.
+    If NumPy is not available, they are returned as nested lists.
+
+    """
 
     def __init__(self, *args, **kwargs):
         super(DataDecoder, self).__init__(object_hook=self.object_hook, *args, **kwargs)
@@ -142,11 +237,18 @@ class DataDecoder(json.JSONDecoder):
 
         dtype = o['dtype']
 
+        if dtype == 'numpy/ndarray':
+            return _decode_array(o['value'])
+
         # if this doesn't work
         # raise an Error explaining the required encoding
         module, attr = dtype.split('/')
         cls = getattr(__import__(module, fromlist=[attr]), attr)
 
+        if 'binary' in o:
+            arrays = {name: _decode_array(value) for name, value in o['binary']['arrays'].items()}
+            return cls._from_binary_data(o['binary']['header'], arrays)
+
         return cls.from_data(o['value'])
 
 
@@ -341,10 +443,17 @@ class XFunc(object):
     def _xecute(self, *args, **kwargs):
         """Execute a function with optional positional and named arguments.
         """
-        idict = {'args': args, 'kwargs': kwargs}
+        try:
+            import numpy
+        except ImportError:
+            compact = False
+        else:
+            compact = True
+
+        idict = {'args': args, 'kwargs': kwargs, 'compact': compact}
 
         with open(self.ipath, 'w+') as fh:
-            json.dump(idict, fh, cls=DataEncoder)
+            json.dump(idict, fh, cls=DataEncoder, compact=compact)
 
         with open(self.opath, 'w+') as fh:
             fh.write('')